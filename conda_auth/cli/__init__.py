@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import argparse
+from collections.abc import Mapping
 from getpass import getpass
 from typing import Literal
 
@@ -14,24 +15,33 @@ from ..constants import AUTH_ALLOW_PLAINTEXT_HTTP_PARAM
 from ..exceptions import CondaAuthError
 from ..handlers import (
     HTTP_BASIC_AUTH_NAME,
+    OAUTH_NAME,
     TOKEN_NAME,
     AuthManager,
     basic_auth_manager,
+    oauth_manager,
     token_auth_manager,
 )
 from ..handlers.base import allows_plaintext_http, validate_secure_channel
+from ..matching import channel_matches
+from ..parser import PROMPT_VALUE, build_parser, configure_parser
+from ..storage import EnvironmentStorage, storage
 from .config import (
+    ChannelSettingsEditor,
+    get_channel_settings_editor,
     get_updated_channel_settings,
     remove_channel_settings,
+    remove_matching_channel_settings,
     update_channel_settings,
 )
-from .parser import PROMPT_VALUE, build_parser, configure_parser
+from .manifest import LoginEntry, get_login_entries, read_login_manifest
 from .status import output_status
 from .status import status as get_status
 
 AUTH_MANAGER_MAPPING = {
     HTTP_BASIC_AUTH_NAME: basic_auth_manager,
     TOKEN_NAME: token_auth_manager,
+    OAUTH_NAME: oauth_manager,
 }
 
 SUCCESSFUL_LOGIN_MESSAGE = "Successfully stored credentials"
@@ -39,15 +49,20 @@ SUCCESSFUL_LOGIN_MESSAGE = "Successfully stored credentials"
 SUCCESSFUL_LOGOUT_MESSAGE = "Successfully removed credentials"
 
 __all__ = (
+    "ChannelSettingsEditor",
     "SUCCESSFUL_LOGIN_MESSAGE",
     "SUCCESSFUL_LOGOUT_MESSAGE",
     "auth",
     "build_parser",
     "configure_parser",
+    "get_channel_settings_editor",
     "get_updated_channel_settings",
     "login",
+    "login_from_manifest",
     "logout",
+    "logout_matching",
     "remove_channel_settings",
+    "remove_matching_channel_settings",
     "update_channel_settings",
 )
 
@@ -156,6 +171,75 @@ def login(channel: Channel, **kwargs):
         raise
 
 
+def login_from_manifest(entries: list[LoginEntry]) -> None:
+    """
+    Log in to several channels at once, keeping nothing unless all of them succeed.
+
+    The settings of every channel are written in one update of the user condarc and the
+    credentials in one batch. If storing the credentials fails, the previous channel
+    settings and credentials are restored.
+    """
+    records = [
+        AUTH_MANAGER_MAPPING[entry.auth_type].create_credential_record(
+            entry.channel, entry.username, entry.secret
+        )
+        for entry in entries
+    ]
+    # Credentials provided by the environment are never written, so only stored ones
+    # are read for the rollback
+    backend = storage.backend
+    if isinstance(backend, EnvironmentStorage) and backend.backend is not None:
+        backend = backend.backend
+    previous_records = backend.get_credentials(record.target for record in records)
+
+    try:
+        with ConfigurationFile.from_user_condarc() as config:
+            previous_settings = config.content.get("channel_settings")
+            editor = get_channel_settings_editor(config)
+            for entry in entries:
+                editor.upsert(
+                    entry.channel.canonical_name,
+                    entry.auth_type,
+                    auth_target=entry.channel.canonical_name,
+                    allow_plaintext_http=entry.allow_plaintext_http,
+                )
+            config.content["channel_settings"] = editor.apply()
+    except (CondaError, OSError, yaml.YAMLError) as exc:
+        raise CondaAuthError(str(exc))
+
+    try:
+        storage.set_credentials(records)
+    except Exception as credential_error:
+        rollback_errors = []
+        try:
+            storage.set_credentials(
+                record for record in previous_records.values() if record is not None
+            )
+            storage.delete_credentials(
+                target for target, record in previous_records.items() if record is None
+            )
+        except Exception as rollback_error:
+            rollback_errors.append(f"Failed to roll back credentials: {rollback_error}")
+
+        try:
+            with ConfigurationFile.from_user_condarc() as config:
+                if previous_settings is None:
+                    config.content.pop("channel_settings", None)
+                else:
+                    config.content["channel_settings"] = previous_settings
+        except (CondaError, OSError, yaml.YAMLError) as rollback_error:
+            rollback_errors.append(f"Failed to roll back channel settings: {rollback_error}")
+
+        if rollback_errors:
+            raise CondaAuthError(
+                ". ".join((str(credential_error), *rollback_errors))
+            ) from credential_error
+        raise
+    finally:
+        for entry in entries:
+            AUTH_MANAGER_MAPPING[entry.auth_type].cache_clear(entry.channel.canonical_name)
+
+
 def logout(channel: Channel):
     """
     Log out of a channel by removing any credentials or tokens associated with it.
@@ -188,6 +272,46 @@ def logout(channel: Channel):
     auth_manager.cache_clear(channel.canonical_name)
 
 
+def logout_matching(pattern: str | None = None) -> int:
+    """
+    Log out of every channel in the user condarc, or of those matching ``pattern``.
+
+    The settings of all channels are removed in one update of the user condarc and their
+    credentials in one storage batch per auth type. Returns the number of channels.
+    """
+
+    def matches(settings: Mapping[str, object]) -> bool:
+        configured_channel = settings.get("channel")
+        if settings.get("auth") not in AUTH_MANAGER_MAPPING:
+            return False
+        if not isinstance(configured_channel, str):
+            return False
+        return pattern is None or channel_matches(pattern, Channel(configured_channel))
+
+    try:
+        with ConfigurationFile.from_user_condarc() as config:
+            removed_settings = remove_matching_channel_settings(config, matches)
+    except (CondaError, OSError, yaml.YAMLError) as exc:
+        raise CondaAuthError(str(exc))
+
+    if not removed_settings:
+        raise CondaAuthError("Unable to find logged in channels in the user condarc.")
+
+    channels_by_manager: dict[str, list[tuple[Channel, Mapping[str, object]]]] = {}
+    for settings in removed_settings:
+        channels_by_manager.setdefault(str(settings["auth"]), []).append(
+            (Channel(str(settings["channel"])), settings)
+        )
+
+    for auth_type, channels in channels_by_manager.items():
+        auth_manager = AUTH_MANAGER_MAPPING[auth_type]
+        auth_manager.delete_credential_records(channels)
+        for channel, _ in channels:
+            auth_manager.cache_clear(channel.canonical_name)
+
+    return len(removed_settings)
+
+
 def auth(args: argparse.Namespace) -> None:
     """
     Commands for handling authentication within conda.
@@ -197,6 +321,24 @@ def auth(args: argparse.Namespace) -> None:
         return
 
     if args.command == "login":
+        if args.from_file is not None:
+            if (
+                args.channel is not None
+                or args.basic
+                or args.token is not None
+                or args.username is not None
+                or args.password is not None
+                or args.allow_plaintext_http
+            ):
+                raise CondaAuthError("Option 'from-file' cannot be used with other login options")
+
+            login_from_manifest(get_login_entries(read_login_manifest(args.from_file)))
+            output_success(args, SUCCESSFUL_LOGIN_MESSAGE)
+            return
+
+        if args.channel is None:
+            raise CondaAuthError("Missing argument 'channel'.")
+
         token = args.token
 
         if not args.basic and token is None:
@@ -242,7 +384,14 @@ def auth(args: argparse.Namespace) -> None:
         )
         output_success(args, SUCCESSFUL_LOGIN_MESSAGE)
     elif args.command == "logout":
-        logout(Channel(args.channel))
+        if args.all or args.match is not None:
+            if args.channel is not None:
+                raise CondaAuthError("Option 'all' / 'match' cannot be used with 'channel'")
+            logout_matching(args.match)
+        elif args.channel is None:
+            raise CondaAuthError("Missing argument 'channel'.")
+        else:
+            logout(Channel(args.channel))
         output_success(args, SUCCESSFUL_LOGOUT_MESSAGE)
     elif args.command == "status":
         output_status(args, get_status(args.channel))
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
 
 from conda.cli.condarc import ConfigurationFile
 
@@ -19,6 +19,145 @@ AUTH_CHANNEL_SETTING_KEYS = frozenset(
 )
 
 
+class ChannelSettingsEditor:
+    """
+    Applies many auth settings changes to a ``channel_settings`` list in a single pass.
+
+    ``upsert`` replaces the auth settings of the last entry for a channel, or adds an entry.
+    ``remove`` and ``remove_matching`` strip the auth settings from every entry for a
+    channel, dropping entries that are left with nothing but their channel. The last change
+    recorded for a channel wins, and upserted entries are never removed by
+    ``remove_matching``. Nothing is changed until ``apply`` is called.
+    """
+
+    def __init__(self, channel_settings: list) -> None:
+        self.channel_settings = channel_settings
+        self.removed: list[Mapping[str, object]] = []
+        """Entries whose auth settings were removed by ``apply``, as they were before."""
+        self._upserts: dict[str, dict[str, object]] = {}
+        self._removals: set[str] = set()
+        self._remove_matching: list[Callable[[Mapping[str, object]], bool]] = []
+
+    def upsert(
+        self,
+        channel: str,
+        auth_type: str,
+        username: str | None = None,
+        *,
+        auth_target: str | None = None,
+        allow_plaintext_http: bool = False,
+    ) -> None:
+        """
+        Set the auth settings for a single channel.
+        """
+        auth_settings: dict[str, object] = {
+            "auth": auth_type,
+            "auth_target": auth_target or channel,
+        }
+        if username is not None:
+            auth_settings["username"] = username
+        if allow_plaintext_http:
+            auth_settings[AUTH_ALLOW_PLAINTEXT_HTTP_PARAM] = True
+
+        self._removals.discard(channel)
+        self._upserts[channel] = auth_settings
+
+    def remove(self, channel: str) -> None:
+        """
+        Remove the auth settings for a single channel.
+        """
+        self._upserts.pop(channel, None)
+        self._removals.add(channel)
+
+    def remove_matching(self, matches: Callable[[Mapping[str, object]], bool]) -> None:
+        """
+        Remove the auth settings of every entry accepted by ``matches``.
+        """
+        self._remove_matching.append(matches)
+
+    def _find_last_entries(self) -> dict[str, int]:
+        """
+        Return the index of the last entry for every upserted channel that has one.
+        """
+        upserts = self._upserts
+        last_index: dict[str, int] = {}
+        if not upserts:
+            return last_index
+
+        for index, settings in enumerate(self.channel_settings):
+            if isinstance(settings, Mapping):
+                channel = settings.get("channel")
+                if isinstance(channel, str) and channel in upserts:
+                    last_index[channel] = index
+
+        return last_index
+
+    def _is_removed(self, settings: Mapping[str, object]) -> bool:
+        channel = settings.get("channel")
+        if isinstance(channel, str) and channel in self._removals:
+            return True
+
+        return any(matches(settings) for matches in self._remove_matching)
+
+    def apply(self) -> list:
+        """
+        Return the updated ``channel_settings`` list with every recorded change applied.
+        """
+        last_index = self._find_last_entries()
+        self.removed = []
+
+        if not self._removals and not self._remove_matching:
+            # Only upserts: copy the list and replace the entries in place
+            updated_channel_settings = list(self.channel_settings)
+            for channel, index in last_index.items():
+                updated_channel_settings[index] = (
+                    self._without_auth_settings(self.channel_settings[index])
+                    | self._upserts[channel]
+                )
+        else:
+            upserted_entries = {index: channel for channel, index in last_index.items()}
+            updated_channel_settings = []
+            for index, settings in enumerate(self.channel_settings):
+                if index in upserted_entries:
+                    updated_channel_settings.append(
+                        self._without_auth_settings(settings)
+                        | self._upserts[upserted_entries[index]]
+                    )
+                elif isinstance(settings, Mapping) and self._is_removed(settings):
+                    if any(key in settings for key in AUTH_CHANNEL_SETTING_KEYS):
+                        self.removed.append(settings)
+                    updated_settings = self._without_auth_settings(settings)
+                    if set(updated_settings) != {"channel"}:
+                        updated_channel_settings.append(updated_settings)
+                else:
+                    updated_channel_settings.append(settings)
+
+        for channel, auth_settings in self._upserts.items():
+            if channel not in last_index:
+                updated_channel_settings.append({"channel": channel, **auth_settings})
+
+        return updated_channel_settings
+
+    @staticmethod
+    def _without_auth_settings(settings: Mapping[str, object]) -> dict[str, object]:
+        updated_settings: dict[str, object] = {"channel": settings.get("channel")}
+        updated_settings.update(
+            (key, value) for key, value in settings.items() if key not in AUTH_CHANNEL_SETTING_KEYS
+        )
+        return updated_settings
+
+
+def get_channel_settings_editor(config: ConfigurationFile) -> ChannelSettingsEditor:
+    """
+    Return an editor for the ``channel_settings`` of a configuration file.
+    """
+    channel_settings = config.content.get("channel_settings", []) or []
+    if not isinstance(channel_settings, list):
+        raise CondaAuthError("Expected 'channel_settings' to be a list")
+
+    return ChannelSettingsEditor(channel_settings)
+
+
 def get_updated_channel_settings(
     channel_settings: list,
     channel: str,
@@ -31,38 +170,15 @@ def get_updated_channel_settings(
     """
     Replace the auth-owned settings for a single channel.
     """
-    updated_settings: dict[str, object] = {"channel": channel}
-    last_channel_index = next(
-        (
-            index
-            for index, settings in reversed(list(enumerate(channel_settings)))
-            if isinstance(settings, Mapping) and settings.get("channel") == channel
-        ),
-        None,
+    editor = ChannelSettingsEditor(channel_settings)
+    editor.upsert(
+        channel,
+        auth_type,
+        username,
+        auth_target=auth_target,
+        allow_plaintext_http=allow_plaintext_http,
     )
-    if last_channel_index is not None:
-        updated_settings.update(
-            {
-                key: value
-                for key, value in channel_settings[last_channel_index].items()
-                if key not in AUTH_CHANNEL_SETTING_KEYS
-            }
-        )
-
-    updated_settings["auth"] = auth_type
-    updated_settings["auth_target"] = auth_target or channel
-    if username is not None:
-        updated_settings["username"] = username
-    if allow_plaintext_http:
-        updated_settings[AUTH_ALLOW_PLAINTEXT_HTTP_PARAM] = True
-
-    if last_channel_index is None:
-        return [*channel_settings, updated_settings]
-
-    return [
-        updated_settings if index == last_channel_index else settings
-        for index, settings in enumerate(channel_settings)
-    ]
+    return editor.apply()
 
 
 def update_channel_settings(
@@ -77,43 +193,37 @@ def update_channel_settings(
     """
     Update the user's channel auth settings via conda's configuration file API.
     """
-    channel_settings = config.content.get("channel_settings", []) or []
-    if not isinstance(channel_settings, list):
-        raise CondaAuthError("Expected 'channel_settings' to be a list")
-
-    config.content["channel_settings"] = get_updated_channel_settings(
-        channel_settings,
+    editor = get_channel_settings_editor(config)
+    editor.upsert(
         channel,
         auth_type,
         username,
         auth_target=auth_target,
         allow_plaintext_http=allow_plaintext_http,
     )
+    config.content["channel_settings"] = editor.apply()
 
 
-def remove_channel_settings(config: ConfigurationFile, channel: str) -> bool:
-    """
-    Remove the user's channel auth settings via conda's configuration file API.
+def remove_matching_channel_settings(
+    config: ConfigurationFile,
+    matches: Callable[[Mapping[str, object]], bool],
+) -> list[Mapping[str, object]]:
     """
-    channel_settings = config.content.get("channel_settings", []) or []
-    if not isinstance(channel_settings, list):
-        raise CondaAuthError("Expected 'channel_settings' to be a list")
+    Remove the auth settings of every channel entry accepted by ``matches`` in a single pass.
 
-    removed_auth_settings = False
-    updated_channel_settings = []
-    for settings in channel_settings:
-        if not isinstance(settings, Mapping) or settings.get("channel") != channel:
-            updated_channel_settings.append(settings)
-            continue
+    Returns the removed entries that had auth settings, as they were before the removal.
+    """
+    editor = get_channel_settings_editor(config)
+    editor.remove_matching(matches)
+    config.content["channel_settings"] = editor.apply()
+    return editor.removed
 
-        removed_auth_settings = removed_auth_settings or any(
-            key in settings for key in AUTH_CHANNEL_SETTING_KEYS
-        )
-        updated_settings = {
-            key: value for key, value in settings.items() if key not in AUTH_CHANNEL_SETTING_KEYS
-        }
-        if updated_settings != {"channel": channel}:
-            updated_channel_settings.append(updated_settings)
 
-    config.content["channel_settings"] = updated_channel_settings
-    return removed_auth_settings
+def remove_channel_settings(config: ConfigurationFile, channel: str) -> bool:
+    """
+    Remove the user's channel auth settings via conda's configuration file API.
+    """
+    editor = get_channel_settings_editor(config)
+    editor.remove(channel)
+    config.content["channel_settings"] = editor.apply()
+    return bool(editor.removed)
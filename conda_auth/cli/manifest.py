@@ -0,0 +1,137 @@
+"""
+Reading of the manifest files used by ``conda auth login --from-file``
+"""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Mapping
+from typing import NamedTuple
+
+from conda.common.serialize import json, yaml
+from conda.models.channel import Channel
+
+from ..exceptions import CondaAuthError
+from ..handlers import HTTP_BASIC_AUTH_NAME, TOKEN_NAME
+from ..handlers.base import validate_secure_channel
+from ..handlers.token import USERNAME as TOKEN_USERNAME
+
+MANIFEST_STDIN = "-"
+"""
+Manifest path that reads a JSON manifest from standard input
+"""
+
+LOGIN_ENTRY_KEYS = frozenset(("channel", "username", "password", "token", "allow_plaintext_http"))
+
+
+class LoginEntry(NamedTuple):
+    channel: Channel
+    auth_type: str
+    username: str
+    secret: str
+    allow_plaintext_http: bool
+
+
+def read_login_manifest(path: str) -> object:
+    """
+    Load a login manifest from a YAML or JSON file, or as JSON from standard input.
+    """
+    if path == MANIFEST_STDIN:
+        try:
+            return json.loads(sys.stdin.read())
+        except ValueError as exc:
+            raise CondaAuthError(f"Unable to read login manifest from standard input: {exc}")
+
+    try:
+        return yaml.read(path=path)
+    except (OSError, yaml.YAMLError) as exc:
+        raise CondaAuthError(f"Unable to read login manifest {path!r}: {exc}")
+
+
+def get_login_entry(entry: object) -> LoginEntry:
+    """
+    Validate a single manifest entry and return what is needed to log in to its channel.
+    """
+    if not isinstance(entry, Mapping):
+        raise CondaAuthError("expected a mapping")
+
+    fields: dict[object, object] = dict(entry.items())
+    if unknown_keys := set(fields) - LOGIN_ENTRY_KEYS:
+        raise CondaAuthError(f"unknown keys {sorted(map(str, unknown_keys))}")
+
+    values: dict[str, str] = {}
+    for key in LOGIN_ENTRY_KEYS - {"allow_plaintext_http"}:
+        if key in fields:
+            value = fields[key]
+            if not isinstance(value, str):
+                raise CondaAuthError(f"'{key}' must be a string")
+            values[key] = value
+
+    channel_name = values.get("channel")
+    if not channel_name:
+        raise CondaAuthError("missing 'channel'")
+
+    allow_plaintext_http = fields.get("allow_plaintext_http", False)
+    if not isinstance(allow_plaintext_http, bool):
+        raise CondaAuthError("'allow_plaintext_http' must be true or false")
+
+    channel = Channel(channel_name)
+    validate_secure_channel(channel, allow_plaintext_http=allow_plaintext_http)
+
+    token = values.get("token")
+    username = values.get("username")
+    password = values.get("password")
+    if token is not None:
+        if username is not None or password is not None:
+            raise CondaAuthError("'token' cannot be used with 'username' or 'password'")
+        return LoginEntry(channel, TOKEN_NAME, TOKEN_USERNAME, token, allow_plaintext_http)
+
+    if username is None or password is None:
+        raise CondaAuthError("expected 'token' or 'username' and 'password'")
+
+    return LoginEntry(channel, HTTP_BASIC_AUTH_NAME, username, password, allow_plaintext_http)
+
+
+def get_login_entries(manifest: object) -> list[LoginEntry]:
+    """
+    Validate every entry of a login manifest, reporting all invalid entries at once.
+
+    A manifest is a mapping with a ``channels`` list, for example::
+
+        channels:
+          - channel: https://repo.example.com/private
+            token: <token>
+          - channel: https://other.example.com/conda
+            username: <username>
+            password: <password>
+    """
+    channels = None
+    if isinstance(manifest, Mapping):
+        fields: dict[object, object] = dict(manifest.items())
+        channels = fields.get("channels")
+    if not isinstance(channels, list) or not channels:
+        raise CondaAuthError("Expected login manifest to contain a list of 'channels'")
+
+    entries = []
+    errors = []
+    seen = set()
+    for index, entry in enumerate(channels):
+        try:
+            login_entry = get_login_entry(entry)
+        except CondaAuthError as exc:
+            errors.append(f"entry {index}: {exc}")
+            continue
+
+        if login_entry.channel.canonical_name in seen:
+            errors.append(
+                f"entry {index}: duplicate channel {login_entry.channel.canonical_name!r}"
+            )
+            continue
+
+        seen.add(login_entry.channel.canonical_name)
+        entries.append(login_entry)
+
+    if errors:
+        raise CondaAuthError("Invalid login manifest:\n  " + "\n  ".join(errors))
+
+    return entries
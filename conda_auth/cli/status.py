@@ -1,27 +1,29 @@
 from __future__ import annotations
 
 import argparse
-from collections.abc import Mapping
-from fnmatch import fnmatch
 
 from conda.base.context import context
 from conda.common.serialize import json
-from conda.common.url import urlparse as conda_urlparse
 from conda.models.channel import Channel
 
+from ..matching import channel_matches, get_auth_target, get_channel_settings_index
 from ..storage import storage
 
+__all__ = (
+    "channel_matches",
+    "get_status_entries",
+    "get_status_targets",
+    "output_status",
+    "status",
+)
+
 
 def get_status_entries(target: str | None = None) -> list[dict[str, object]]:
     """
     Return redacted credential status entries.
     """
-    entries = []
-    for credential_target in get_status_targets(target):
-        record = storage.get_credential(credential_target)
-        if record is not None:
-            entries.append(record.to_status_entry())
-    return entries
+    records = storage.get_credentials(get_status_targets(target))
+    return [record.to_status_entry() for record in records.values() if record is not None]
 
 
 def get_status_targets(target: str | None = None) -> tuple[str, ...]:
@@ -36,72 +38,21 @@ def get_status_targets(target: str | None = None) -> tuple[str, ...]:
             seen.add(candidate)
             targets.append(candidate)
 
-    requested_channel = Channel(target) if target is not None else None
-    requested_keys = set()
-    if target is not None and requested_channel is not None:
-        requested_keys.update((target, requested_channel.canonical_name))
+    index = get_channel_settings_index(context.channel_settings, include_auth_targets=True)
+    if target is None:
+        matching_settings = index.settings
+    else:
+        requested_channel = Channel(target)
         add(target)
         add(requested_channel.canonical_name)
+        matching_settings = index.find_all(requested_channel, names=(target,))
 
-    for settings in context.channel_settings:
-        if not isinstance(settings, Mapping) or not settings.get("auth"):
-            continue
-
-        configured_channel = settings.get("channel")
-        if not isinstance(configured_channel, str):
-            continue
-
-        auth_target = settings.get("auth_target")
-        if not isinstance(auth_target, str):
-            auth_target = configured_channel
-
-        if requested_channel is None:
-            add(auth_target)
-        elif status_setting_matches_target(
-            configured_channel,
-            auth_target,
-            requested_channel,
-            requested_keys,
-        ):
-            add(auth_target)
+    for settings in matching_settings:
+        add(get_auth_target(settings))
 
     return tuple(targets)
 
 
-def status_setting_matches_target(
-    configured_channel: str,
-    auth_target: str,
-    requested_channel: Channel,
-    requested_keys: set[str],
-) -> bool:
-    """
-    Return whether a configured auth setting applies to an explicit status target.
-    """
-    return (
-        configured_channel in requested_keys
-        or auth_target in requested_keys
-        or channel_matches(configured_channel, requested_channel)
-        or channel_matches(auth_target, requested_channel)
-    )
-
-
-def channel_matches(configured_channel: str, channel: Channel) -> bool:
-    """
-    Match configured channel names the same way conda selects auth handlers.
-    """
-    if configured_channel == channel.canonical_name:
-        return True
-
-    parsed_channel = conda_urlparse(channel.base_url)
-    parsed_setting = conda_urlparse(configured_channel)
-    if parsed_setting.scheme != parsed_channel.scheme:
-        return False
-
-    channel_url = parsed_channel.netloc + parsed_channel.path
-    pattern = parsed_setting.netloc + parsed_setting.path
-    return fnmatch(channel_url, pattern)
-
-
 def status(target: str | None = None) -> list[dict[str, object]]:
     """
     Return stored credential status entries.
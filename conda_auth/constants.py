@@ -4,4 +4,93 @@ A place for all of our constant variables
 
 PLUGIN_NAME = "conda-auth"
 
+HTTP_BASIC_AUTH_NAME = "http-basic"
+"""
+Name used to refer to the HTTP basic authentication handler in configuration
+"""
+
+TOKEN_NAME = "token"
+"""
+Name used to refer to the token authentication handler in configuration
+"""
+
+OAUTH_NAME = "oauth2"
+"""
+Name used to refer to the OAuth 2.0 authentication handler in configuration
+"""
+
 AUTH_ALLOW_PLAINTEXT_HTTP_PARAM = "auth_allow_plaintext_http"
+
+CREDENTIAL_CACHE_TTL_SETTING = "auth_credential_cache_ttl"
+"""
+Name of the plugin setting that enables the on-disk credential cache (in seconds)
+"""
+
+CREDENTIAL_MISS_TTL_SETTING = "auth_credential_miss_ttl"
+"""
+Name of the plugin setting for how long a target without stored credential is remembered
+(in seconds)
+"""
+
+DEFAULT_CREDENTIAL_MISS_TTL = 30
+"""
+Number of seconds a target without stored credential is remembered by default
+"""
+
+CREDENTIAL_PREFETCH_SETTING = "auth_prefetch_credentials"
+"""
+Name of the plugin setting that resolves all configured credentials before fetching repodata
+"""
+
+PREFETCH_COMMANDS = frozenset(
+    {"create", "install", "update", "remove", "search", "env_create", "env_update"}
+)
+"""
+conda commands that fetch repodata and therefore benefit from prefetched credentials
+"""
+
+CREDENTIAL_STORAGE_SETTING = "auth_credential_storage"
+"""
+Name of the plugin setting that selects where credentials are stored
+"""
+
+CREDENTIAL_STORAGE_AUTO = "auto"
+"""
+Store credentials in the keyring, or in the credential file when no keyring is available
+"""
+
+CREDENTIAL_STORAGE_KEYRING = "keyring"
+"""
+Only store credentials in the keyring
+"""
+
+CREDENTIAL_STORAGE_FILE = "file"
+"""
+Only store credentials in the credential file
+"""
+
+CREDENTIAL_STORAGE_TYPES = (
+    CREDENTIAL_STORAGE_AUTO,
+    CREDENTIAL_STORAGE_KEYRING,
+    CREDENTIAL_STORAGE_FILE,
+)
+
+CREDENTIAL_KEYRING_COMPACT_SETTING = "auth_keyring_compact_records"
+"""
+Name of the plugin setting that stores keyring records in the compact encoding
+"""
+
+CREDENTIAL_FILE_SETTING = "auth_credential_file"
+"""
+Name of the plugin setting for the location of the credential file
+"""
+
+CREDENTIAL_ENV_PREFIX_SETTING = "auth_credential_env_prefix"
+"""
+Name of the plugin setting for the prefix of environment variables holding credentials
+"""
+
+CREDENTIAL_SECRETS_DIR_SETTING = "auth_credential_secrets_dir"
+"""
+Name of the plugin setting for a directory of files holding credentials
+"""
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from operator import attrgetter
 from typing import Any
 
+NoneType = type(None)
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class CredentialRecord:
     """
     Structured credential payload stored in the configured credential backend.
+
+    Records are slotted, so a service holding thousands of them only pays for the fields.
     """
 
     target: str
@@ -57,6 +62,27 @@ class CredentialRecord:
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> CredentialRecord:
+        if _is_typed(data):
+            # Values already have the types of the fields, e.g. a record built in-process
+            get = data.get
+            return cls(
+                target=data["target"],
+                auth_type=data["auth_type"],
+                username=get("username"),
+                password=get("password"),
+                token=get("token"),
+                token_header=get("token_header"),
+                token_template=get("token_template"),
+                access_token=get("access_token"),
+                refresh_token=get("refresh_token"),
+                expires_at=get("expires_at"),
+                token_endpoint=get("token_endpoint"),
+                revocation_endpoint=get("revocation_endpoint"),
+                client_id=get("client_id"),
+                issuer_url=get("issuer_url"),
+                scopes=tuple(get("scopes", ())),
+            )
+
         scopes = data.get("scopes", ())
         if isinstance(scopes, list):
             scopes = tuple(str(scope) for scope in scopes)
@@ -84,42 +110,68 @@ class CredentialRecord:
         )
 
     def to_dict(self) -> dict[str, Any]:
-        return {
-            key: value
-            for key, value in {
-                "target": self.target,
-                "auth_type": self.auth_type,
-                "username": self.username,
-                "password": self.password,
-                "token": self.token,
-                "token_header": self.token_header,
-                "token_template": self.token_template,
-                "access_token": self.access_token,
-                "refresh_token": self.refresh_token,
-                "expires_at": self.expires_at,
-                "token_endpoint": self.token_endpoint,
-                "revocation_endpoint": self.revocation_endpoint,
-                "client_id": self.client_id,
-                "issuer_url": self.issuer_url,
-                "scopes": list(self.scopes),
-            }.items()
-            if value is not None and value != []
+        data = {
+            name: value
+            for name, value in zip(SERIALIZED_FIELDS, _get_serialized_fields(self))
+            if value is not None
         }
+        if self.scopes:
+            data["scopes"] = list(self.scopes)
+
+        return data
 
     def to_status_entry(self) -> dict[str, Any]:
         return {
-            key: value
-            for key, value in {
-                "target": self.target,
-                "auth_type": self.auth_type,
-                "username": self.username,
-                "issuer_url": self.issuer_url,
-                "expires_at": self.expires_at,
-            }.items()
+            name: value
+            for name, value in zip(STATUS_FIELDS, _get_status_fields(self))
             if value is not None
         }
 
 
+FIELD_TYPES: dict[str, tuple[type, ...]] = {
+    "target": (str,),
+    "auth_type": (str,),
+    "username": (str, NoneType),
+    "password": (str, NoneType),
+    "token": (str, NoneType),
+    "token_header": (str, NoneType),
+    "token_template": (str, NoneType),
+    "access_token": (str, NoneType),
+    "refresh_token": (str, NoneType),
+    "expires_at": (int, NoneType),
+    "token_endpoint": (str, NoneType),
+    "revocation_endpoint": (str, NoneType),
+    "client_id": (str, NoneType),
+    "issuer_url": (str, NoneType),
+    "scopes": (tuple, list),
+}
+"""Exact types ``from_dict`` accepts without converting each value, in field order."""
+
+SERIALIZED_FIELDS = tuple(name for name in FIELD_TYPES if name != "scopes")
+"""Fields ``to_dict`` writes as they are; ``scopes`` becomes a list."""
+
+STATUS_FIELDS = ("target", "auth_type", "username", "issuer_url", "expires_at")
+"""Fields shown by ``conda auth status``; never any secrets."""
+
+_get_serialized_fields = attrgetter(*SERIALIZED_FIELDS)
+_get_status_fields = attrgetter(*STATUS_FIELDS)
+
+
+def _is_typed(data: dict[str, Any]) -> bool:
+    """
+    Whether the values in ``data`` can be passed to ``CredentialRecord`` as they are.
+    """
+    if not ("target" in data and "auth_type" in data and data.keys() <= FIELD_TYPES.keys()):
+        return False
+
+    for name, value in data.items():
+        if type(value) not in FIELD_TYPES[name]:
+            return False
+
+    scopes = data.get("scopes")
+    return not scopes or set(map(type, scopes)) == {str}
+
+
 def _optional_str(value: object) -> str | None:
     if value is None:
         return None
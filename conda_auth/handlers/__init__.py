@@ -1,29 +1,62 @@
-from .base import AuthManager
-from .basic_auth import (
-    HTTP_BASIC_AUTH_NAME,
-    BasicAuthHandler,
-    BasicAuthManager,
-)
-from .basic_auth import (
-    manager as basic_auth_manager,
-)
-from .token import (
-    TOKEN_NAME,
-    TokenAuthHandler,
-    TokenAuthManager,
-)
-from .token import (
-    manager as token_auth_manager,
-)
+"""
+Auth handlers and managers
+
+Submodules are only imported once one of their names is used, because they import the
+storage backends and ``keyring``.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+from ..constants import HTTP_BASIC_AUTH_NAME, OAUTH_NAME, TOKEN_NAME
+
+if TYPE_CHECKING:
+    from .base import AuthManager
+    from .basic_auth import BasicAuthHandler, BasicAuthManager
+    from .basic_auth import manager as basic_auth_manager
+    from .oauth import OAuthHandler, OAuthManager
+    from .oauth import manager as oauth_manager
+    from .token import TokenAuthHandler, TokenAuthManager
+    from .token import manager as token_auth_manager
+
+_LAZY_ATTRIBUTES = {
+    "AuthManager": ("base", "AuthManager"),
+    "BasicAuthHandler": ("basic_auth", "BasicAuthHandler"),
+    "BasicAuthManager": ("basic_auth", "BasicAuthManager"),
+    "OAuthHandler": ("oauth", "OAuthHandler"),
+    "OAuthManager": ("oauth", "OAuthManager"),
+    "TokenAuthHandler": ("token", "TokenAuthHandler"),
+    "TokenAuthManager": ("token", "TokenAuthManager"),
+    "basic_auth_manager": ("basic_auth", "manager"),
+    "oauth_manager": ("oauth", "manager"),
+    "token_auth_manager": ("token", "manager"),
+}
 
 __all__ = [
     "AuthManager",
     "BasicAuthHandler",
     "BasicAuthManager",
     "HTTP_BASIC_AUTH_NAME",
+    "OAUTH_NAME",
+    "OAuthHandler",
+    "OAuthManager",
     "TOKEN_NAME",
     "TokenAuthHandler",
     "TokenAuthManager",
     "basic_auth_manager",
+    "oauth_manager",
     "token_auth_manager",
 ]
+
+
+def __getattr__(name: str) -> object:
+    try:
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(import_module(f".{module_name}", __name__), attribute)
+    globals()[name] = value
+    return value
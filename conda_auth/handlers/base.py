@@ -1,22 +1,31 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from collections.abc import Mapping
+from collections.abc import Iterable, Mapping, MutableMapping
 from dataclasses import replace
-from fnmatch import fnmatch
 from ipaddress import ip_address
+from logging import getLogger
+from typing import cast
 from urllib.parse import urlparse
 
 import conda.base.context
 from conda.auxlib.type_coercion import TypeCoercionError, boolify
 from conda.base.context import context as global_context
-from conda.common.url import urlparse as conda_urlparse
 from conda.models.channel import Channel
 
 from ..constants import AUTH_ALLOW_PLAINTEXT_HTTP_PARAM
 from ..credentials import CredentialRecord
 from ..exceptions import CondaAuthError
+from ..matching import ChannelSettingsIndex, channel_matches, get_channel_settings_index
 from ..storage import storage
+from ..storage.state import (
+    get_legacy_migration_path,
+    mark_legacy_migration_done,
+    read_legacy_migrations,
+)
+from .cache import SecretCache, SingleFlight
+
+log = getLogger(__name__)
 
 
 def is_loopback_host(host: str | None) -> bool:
@@ -108,13 +117,17 @@ class AuthManager(ABC):
     def __init__(
         self,
         context: conda.base.context.Context | None = None,
-        cache: dict | None = None,
+        cache: MutableMapping | None = None,
     ):
         """
         Optionally set a cache and context object to use
+
+        Any mutable mapping can be used as the cache; a ``SecretCache`` additionally
+        expires secrets when their credential record does.
         """
         self._context = context or global_context
-        self._cache = {} if cache is None else cache
+        self._cache = SecretCache() if cache is None else cache
+        self._in_flight: SingleFlight[tuple[str, str]] = SingleFlight()
 
     def store(self, channel: Channel, settings: Mapping[str, object]) -> str:
         """
@@ -200,13 +213,46 @@ class AuthManager(ABC):
     ) -> CredentialRecord | None:
         """
         Return the structured credential record for a channel, if present.
+
+        Pre-structured keyring entries are looked for only once per target; when one is
+        found, it is written back as a structured record and the old entry is removed.
         """
         target = self.get_credential_target(channel, settings)
         record = storage.get_credential(target)
         if record is not None:
             return record
 
-        return self.migrate_legacy_credential_record(channel, settings, target)
+        migration_key = self.get_legacy_migration_key(settings, target)
+        if migration_key is None:
+            return None
+
+        migration_path = get_legacy_migration_path()
+        if migration_key in read_legacy_migrations(migration_path):
+            return None
+
+        record = self.migrate_legacy_credential_record(channel, settings, target)
+        if record is not None:
+            try:
+                storage.set_credential(record)
+                self.delete_legacy_credential_record(channel, settings, target)
+            except Exception as exc:
+                # The legacy entry still works, so the migration is tried again next time
+                log.debug("Unable to migrate legacy credential for %s: %s", target, exc)
+                return record
+
+        mark_legacy_migration_done(migration_path, migration_key)
+        return record
+
+    def get_legacy_migration_key(
+        self,
+        settings: Mapping[str, object] | None,
+        target: str,
+    ) -> str | None:
+        """
+        Return the key recording that the pre-structured keyring entries for ``target``
+        were migrated, or ``None`` when there is nothing this manager could migrate.
+        """
+        return None
 
     def migrate_legacy_credential_record(
         self,
@@ -240,6 +286,27 @@ class AuthManager(ABC):
         storage.delete_credential(target)
         self.delete_legacy_credential_record(channel, settings, target)
 
+    def delete_credential_records(
+        self,
+        channels: Iterable[tuple[Channel, Mapping[str, object] | None]],
+    ) -> None:
+        """
+        Delete the structured credential records for several channels in one storage batch.
+
+        Pre-structured keyring entries are only deleted for targets that were not migrated
+        yet, because migrating a target already removed them.
+        """
+        channel_targets = [
+            (channel, settings, self.get_credential_target(channel, settings))
+            for channel, settings in channels
+        ]
+        storage.delete_credentials(target for _, _, target in channel_targets)
+
+        migrated = read_legacy_migrations(get_legacy_migration_path())
+        for channel, settings, target in channel_targets:
+            if self.get_legacy_migration_key(settings, target) not in migrated:
+                self.delete_legacy_credential_record(channel, settings, target)
+
     def delete_legacy_credential_record(
         self,
         channel: Channel,
@@ -259,20 +326,74 @@ class AuthManager(ABC):
     ) -> tuple[str, str]:
         """
         Fetch secrets and handle updating cache.
+
+        Concurrent cache misses for the same channel share a single lookup.
         """
         validate_secure_channel(
             channel,
             allow_plaintext_http=allows_plaintext_http(settings),
         )
 
-        if use_cache and (secrets := self._cache.get(channel.canonical_name)):
+        if not use_cache:
+            return self._fetch_and_cache_secret(channel, settings)
+
+        if secrets := self._cache.get(channel.canonical_name):
             return secrets
 
-        secrets = self._fetch_secret(channel, settings)
-        self._cache[channel.canonical_name] = secrets
+        return self._fetch_shared_secret(channel, settings)
+
+    def _fetch_shared_secret(
+        self,
+        channel: Channel,
+        settings: Mapping[str, object],
+    ) -> tuple[str, str]:
+        """
+        Fetch secrets after a cache miss, sharing the lookup with concurrent callers.
+        """
+
+        def fetch() -> tuple[str, str]:
+            # The previous lookup may have finished between the cache check and this call
+            if secrets := self._peek_cache(channel.canonical_name):
+                return secrets
+            return self._fetch_and_cache_secret(channel, settings)
+
+        return self._in_flight.do(channel.canonical_name, fetch)
+
+    def _peek_cache(self, key: str) -> tuple[str, str] | None:
+        """
+        Look ``key`` up again without counting it in the cache statistics.
+        """
+        if isinstance(self._cache, SecretCache):
+            return cast("tuple[str, str] | None", self._cache.peek(key))
+
+        return self._cache.get(key)
+
+    def _fetch_and_cache_secret(
+        self,
+        channel: Channel,
+        settings: Mapping[str, object],
+    ) -> tuple[str, str]:
+        secrets, expires_at = self._fetch_secret_with_expiry(channel, settings)
+        if isinstance(self._cache, SecretCache):
+            self._cache.put(channel.canonical_name, secrets, expires_at=expires_at)
+        else:
+            self._cache[channel.canonical_name] = secrets
 
         return secrets
 
+    def _fetch_secret_with_expiry(
+        self,
+        channel: Channel,
+        settings: Mapping[str, object],
+    ) -> tuple[tuple[str, str], int | None]:
+        """
+        Fetch secrets along with the time they expire at, if they expire.
+
+        Managers whose secrets come from a ``CredentialRecord`` override this to return its
+        ``expires_at``, so cached secrets are not used past their expiration.
+        """
+        return self._fetch_secret(channel, settings), None
+
     def get_secret(self, channel_name: str) -> tuple[str | None, str | None]:
         """
         Get the secret for a channel, using the in-process cache when possible.
@@ -291,39 +412,33 @@ class AuthManager(ABC):
         if settings is None:
             return None, None
 
-        return self.fetch_secret(channel, settings)
+        # The lookup above already counted as a cache miss
+        return self._fetch_shared_secret(channel, settings)
 
     def get_channel_settings(self, channel: Channel) -> Mapping[str, object] | None:
         """
         Find the auth settings that apply to a channel.
         """
-        matched_settings = None
-        for settings in self._context.channel_settings:
-            if settings.get("auth") != self.get_auth_type():
-                continue
-            if configured_channel := settings.get("channel"):
-                if not isinstance(configured_channel, str):
-                    continue
-                if self.channel_matches(configured_channel, channel):
-                    matched_settings = settings
+        return self.channel_settings_index.find(channel)
 
-        return matched_settings
+    @property
+    def channel_settings_index(self) -> ChannelSettingsIndex:
+        """
+        Index of the ``channel_settings`` for this manager's auth type.
+        """
+        return get_channel_settings_index(self._context.channel_settings, self.get_auth_type())
 
     def channel_matches(self, configured_channel: str, channel: Channel) -> bool:
         """
         Match configured channel names the same way conda selects auth handlers.
         """
-        if configured_channel == channel.canonical_name:
-            return True
+        return channel_matches(configured_channel, channel)
 
-        parsed_channel = conda_urlparse(channel.base_url)
-        parsed_setting = conda_urlparse(configured_channel)
-        if parsed_setting.scheme != parsed_channel.scheme:
-            return False
-
-        channel_url = parsed_channel.netloc + parsed_channel.path
-        pattern = parsed_setting.netloc + parsed_setting.path
-        return fnmatch(channel_url, pattern)
+    def is_cached(self, channel_name: str) -> bool:
+        """
+        Return whether the secret for ``channel_name`` is in the in-process cache.
+        """
+        return self._peek_cache(channel_name) is not None
 
     def cache_clear(self, channel_name: str | None = None) -> None:
         """
@@ -4,18 +4,18 @@ Basic auth implementation for the conda auth handler plugin hook
 
 from __future__ import annotations
 
+from base64 import b64encode
 from collections.abc import Mapping
 from dataclasses import replace
 
 from conda.models.channel import Channel
-from conda.plugins.types import ChannelAuthBase
-from requests.auth import HTTPBasicAuth
 
+from ..constants import HTTP_BASIC_AUTH_NAME
 from ..credentials import CredentialRecord
 from ..exceptions import CondaAuthError
-from ..storage import storage
-from ..storage.keyring import KeyringStorage
+from ..storage import find_keyring_storage, storage
 from .base import AuthManager
+from .retry import ReloadingAuthBase
 
 USERNAME_PARAM_NAME: str = "username"
 """
@@ -27,23 +27,31 @@ PASSWORD_PARAM_NAME: str = "password"
 Name of the configuration parameter where password information is stored
 """
 
-HTTP_BASIC_AUTH_NAME: str = "http-basic"
-"""
-Name used to refer to this authentication handler in configuration
-"""
-
 
 class BasicAuthManager(AuthManager):
     def _fetch_secret(self, channel: Channel, settings: Mapping[str, object]) -> tuple[str, str]:
+        secrets, _ = self._fetch_secret_with_expiry(channel, settings)
+        return secrets
+
+    def _fetch_secret_with_expiry(
+        self,
+        channel: Channel,
+        settings: Mapping[str, object],
+    ) -> tuple[tuple[str, str], int | None]:
         """
         Gets the secrets by checking the keyring and then falling back to interrupting
-        the program and asking the user for the credentials.
+        the program and asking the user for the credentials. Stored passwords expire with
+        their record.
         """
         record = self.get_credential_record(channel, settings)
         username = self.get_username(settings, record)
         password = self.get_password(username, settings, record)
 
-        return username, password
+        expires_at = None
+        if record is not None and settings.get(PASSWORD_PARAM_NAME) is None:
+            expires_at = record.expires_at
+
+        return (username, password), expires_at
 
     def remove_secret(self, channel: Channel, settings: Mapping[str, object]) -> None:
         self.delete_credential_record(channel, settings)
@@ -108,6 +116,17 @@ class BasicAuthManager(AuthManager):
             password=secret,
         )
 
+    def get_legacy_migration_key(
+        self,
+        settings: Mapping[str, object] | None,
+        target: str,
+    ) -> str | None:
+        username = None if settings is None else settings.get(USERNAME_PARAM_NAME)
+        if not isinstance(username, str) or find_keyring_storage(storage.backend) is None:
+            return None
+
+        return f"{HTTP_BASIC_AUTH_NAME}::{target}::{username}"
+
     def migrate_legacy_credential_record(
         self,
         channel: Channel,
@@ -121,8 +140,8 @@ class BasicAuthManager(AuthManager):
         if not isinstance(username, str):
             return None
 
-        backend = storage.backend
-        if not isinstance(backend, KeyringStorage):
+        backend = find_keyring_storage(storage.backend)
+        if backend is None:
             return None
 
         for legacy_target in self.legacy_credential_targets(channel, target):
@@ -150,8 +169,8 @@ class BasicAuthManager(AuthManager):
         if not isinstance(username, str):
             return
 
-        backend = storage.backend
-        if not isinstance(backend, KeyringStorage):
+        backend = find_keyring_storage(storage.backend)
+        if backend is None:
             return
 
         for legacy_target in self.legacy_credential_targets(channel, target):
@@ -164,12 +183,21 @@ class BasicAuthManager(AuthManager):
 manager = BasicAuthManager()
 
 
-class BasicAuthHandler(ChannelAuthBase):
+def get_basic_auth_header(username: str, password: str) -> str:
+    """
+    Return the ``Authorization`` header value ``requests.auth.HTTPBasicAuth`` would send.
+    """
+    credentials = b":".join((username.encode("latin1"), password.encode("latin1")))
+    return f"Basic {b64encode(credentials).decode('ascii')}"
+
+
+class BasicAuthHandler(ReloadingAuthBase):
     """
     Implementation of HTTPBasicAuth that relies on a cache location for
     retrieving login credentials on object instantiation.
 
-    Some of this has been copied over from ``requests.auth``.
+    The header value is encoded once here instead of on every request. Rejected requests
+    are retried once if the stored credentials changed in the meantime.
     """
 
     def __init__(self, channel_name: str):
@@ -180,7 +208,7 @@ class BasicAuthHandler(ChannelAuthBase):
             raise CondaAuthError(
                 f"Unable to find user credentials for requests with channel {channel_name}"
             )
-        self._auth = HTTPBasicAuth(self.username, self.password)
+        self._authorization = get_basic_auth_header(self.username, self.password)
 
     def __eq__(self, other):
         return all(
@@ -193,7 +221,27 @@ class BasicAuthHandler(ChannelAuthBase):
     def __ne__(self, other):
         return not self == other
 
+    def reload_credentials(self) -> bool:
+        manager.cache_clear(Channel(self.channel_name).canonical_name)
+        try:
+            username, password = manager.get_secret(self.channel_name)
+        except CondaAuthError:
+            return False
+
+        if username is None or password is None:
+            return False
+        if (username, password) == (self.username, self.password):
+            return False
+
+        self.username, self.password = username, password
+        self._authorization = get_basic_auth_header(username, password)
+        return True
+
+    def apply_credentials(self, r) -> None:
+        r.headers["Authorization"] = self._authorization
+
     def __call__(self, r):
         if "Authorization" in r.headers:
             return r
-        return self._auth(r)
+        r.headers["Authorization"] = self._authorization
+        return self.register_retry(r)
@@ -0,0 +1,189 @@
+"""
+In-process cache for the secrets resolved by auth managers
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, MutableMapping
+from dataclasses import dataclass, field
+from typing import Generic, NamedTuple, TypeVar, cast
+
+T = TypeVar("T")
+
+DEFAULT_SECRET_CACHE_SIZE: int = 256
+"""
+Number of channels whose secrets are kept in memory by default
+"""
+
+DEFAULT_SECRET_CACHE_TTL: int = 900
+"""
+Number of seconds a cached secret is used before it is read from storage again
+"""
+
+
+class SecretCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class SecretCache(MutableMapping):
+    """
+    Thread-safe LRU cache of channel secrets with a time-to-live for every entry.
+
+    Entries added with ``cache[key] = value`` expire after the default ``ttl``; ``put``
+    accepts an explicit ``expires_at`` for credentials that carry their own expiration.
+    When more than ``maxsize`` entries are stored, the least recently used one is evicted.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_SECRET_CACHE_SIZE,
+        ttl: float | None = DEFAULT_SECRET_CACHE_TTL,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[object, float | None]] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def put(self, key: str, value: object, *, expires_at: float | None = None) -> None:
+        """
+        Store ``value``, expiring it at ``expires_at`` or after the default ``ttl``.
+        """
+        if self.ttl is not None:
+            default_expiry = time.time() + self.ttl
+            expires_at = default_expiry if expires_at is None else min(expires_at, default_expiry)
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def peek(self, key: str, default: object = None) -> object:
+        """
+        Return the value for ``key`` without counting a hit or miss or refreshing its
+        position in the LRU order.
+        """
+        with self._lock:
+            entry = self._get_entry(key)
+            return default if entry is None else entry[0]
+
+    def info(self) -> SecretCacheInfo:
+        """
+        Return hit and miss counters in the same shape as ``functools.lru_cache``.
+        """
+        with self._lock:
+            return SecretCacheInfo(self.hits, self.misses, self.maxsize, len(self))
+
+    def _get_entry(self, key: str) -> tuple[object, float | None] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        _, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._entries[key]
+            return None
+
+        return entry
+
+    def __getitem__(self, key: str) -> object:
+        with self._lock:
+            entry = self._get_entry(key)
+            if entry is None:
+                self.misses += 1
+                raise KeyError(key)
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def __setitem__(self, key: str, value: object) -> None:
+        self.put(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            del self._entries[key]
+
+    def pop(self, key: str, *default: object) -> object:
+        with self._lock:
+            entry = self._get_entry(key)
+            if entry is None:
+                if default:
+                    return default[0]
+                raise KeyError(key)
+
+            del self._entries[key]
+            return entry[0]
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return isinstance(key, str) and self._get_entry(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter([key for key in list(self._entries) if self._get_entry(key) is not None])
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(1 for _ in self)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(maxsize={self.maxsize}, ttl={self.ttl})"
+
+
+@dataclass
+class _Call(Generic[T]):
+    done: threading.Event = field(default_factory=threading.Event)
+    result: T | None = None
+    error: BaseException | None = None
+
+
+class SingleFlight(Generic[T]):
+    """
+    Coalesce concurrent calls for the same key into a single call.
+
+    The first caller for a key runs the function; callers arriving while it runs wait for
+    it and receive the same result or exception.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call[T]] = {}
+
+    def do(self, key: str, func: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            # Set by the leader, which returns normally only after storing it
+            return cast(T, call.result)
+
+        try:
+            result = call.result = func()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return result
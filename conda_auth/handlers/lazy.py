@@ -0,0 +1,42 @@
+"""
+Auth handler classes registered with conda that import the actual handlers on first use
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+
+from conda.plugins.types import ChannelAuthBase
+
+
+class LazyAuthHandler(ChannelAuthBase):
+    """
+    Stands in for the handler class at ``handler_path`` in the auth handler plugin hook.
+
+    Constructing it imports the handler's module and returns an instance of the actual
+    handler. Conda commands that never construct a handler for a configured channel
+    therefore never import the storage backends or ``keyring``.
+    """
+
+    handler_path: str
+    """Location of the actual handler class, as ``"module:class"``."""
+
+    def __new__(cls, channel_name: str) -> ChannelAuthBase:  # type: ignore[misc]
+        return cls.get_handler_class()(channel_name)
+
+    @classmethod
+    def get_handler_class(cls) -> type[ChannelAuthBase]:
+        module_name, _, class_name = cls.handler_path.partition(":")
+        return getattr(import_module(module_name), class_name)
+
+
+class LazyBasicAuthHandler(LazyAuthHandler):
+    handler_path = "conda_auth.handlers.basic_auth:BasicAuthHandler"
+
+
+class LazyTokenAuthHandler(LazyAuthHandler):
+    handler_path = "conda_auth.handlers.token:TokenAuthHandler"
+
+
+class LazyOAuthHandler(LazyAuthHandler):
+    handler_path = "conda_auth.handlers.oauth:OAuthHandler"
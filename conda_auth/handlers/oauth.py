@@ -0,0 +1,354 @@
+"""
+OAuth 2.0 refresh token implementation for the conda auth handler plugin hook
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Mapping, MutableMapping
+from dataclasses import replace
+from json import JSONDecodeError
+from logging import getLogger
+from urllib.parse import urlparse
+
+import conda.base.context
+from conda.models.channel import Channel
+from conda.plugins.types import ChannelAuthBase
+
+from ..constants import OAUTH_NAME
+from ..credentials import CredentialRecord
+from ..exceptions import CondaAuthError
+from ..storage import storage
+from ..storage.files import FileLockError, credential_lock
+from .base import AuthManager, get_url_host, is_loopback_host
+from .cache import SecretCache, SingleFlight
+
+log = getLogger(__name__)
+
+USERNAME: str = "oauth2"
+"""
+Placeholder value for username; OAuth 2.0 access tokens are not tied to one
+"""
+
+OAUTH_REFRESH_MARGIN: float = 60
+"""
+Number of seconds before ``expires_at`` at which an access token is refreshed
+"""
+
+OAUTH_REFRESH_RETRY_DELAY: float = 10
+"""
+Number of seconds to wait before retrying a failed background refresh
+"""
+
+OAUTH_REFRESH_TIMEOUT: float = 30
+"""
+Timeout in seconds for requests to the token endpoint
+"""
+
+
+class OAuthToken:
+    """
+    The current access token for a channel.
+
+    Background refreshes update this object in place, so handlers holding it always send
+    the latest token without looking anything up per request.
+    """
+
+    def __init__(self, record: CredentialRecord) -> None:
+        self.update(record)
+
+    def update(self, record: CredentialRecord) -> None:
+        self.record = record
+        self.authorization = f"Bearer {record.access_token}"
+
+
+def validate_token_endpoint(url: str) -> None:
+    """
+    Prevent refresh tokens from being sent over unsupported transports.
+    """
+    parsed_url = urlparse(url)
+    if parsed_url.scheme == "https":
+        return
+    if parsed_url.scheme == "http" and is_loopback_host(get_url_host(url)):
+        return
+
+    raise CondaAuthError(
+        f"Refusing to refresh OAuth access token with token endpoint {url!r}. "
+        "Use HTTPS or localhost."
+    )
+
+
+def request_token_refresh(record: CredentialRecord) -> CredentialRecord:
+    """
+    Exchange the refresh token of ``record`` for a new access token at its token endpoint.
+    """
+    if record.refresh_token is None or record.token_endpoint is None:
+        raise CondaAuthError(f"OAuth credential for {record.target!r} cannot be refreshed")
+
+    validate_token_endpoint(record.token_endpoint)
+
+    from conda.gateways.connection.session import CondaSession
+
+    data = {"grant_type": "refresh_token", "refresh_token": record.refresh_token}
+    if record.client_id is not None:
+        data["client_id"] = record.client_id
+    if record.scopes:
+        data["scope"] = " ".join(record.scopes)
+
+    try:
+        response = CondaSession().post(
+            record.token_endpoint,
+            data=data,
+            headers={"Accept": "application/json"},
+            timeout=OAUTH_REFRESH_TIMEOUT,
+        )
+    except OSError as exc:
+        raise CondaAuthError(f"Unable to refresh OAuth access token for {record.target!r}: {exc}")
+
+    if response.status_code != 200:
+        raise CondaAuthError(
+            f"Unable to refresh OAuth access token for {record.target!r}: "
+            f"token endpoint returned HTTP {response.status_code}"
+        )
+
+    try:
+        payload = response.json()
+    except (JSONDecodeError, ValueError):
+        payload = None
+
+    if not isinstance(payload, dict) or not isinstance(payload.get("access_token"), str):
+        raise CondaAuthError(
+            f"Unable to refresh OAuth access token for {record.target!r}: "
+            "token endpoint returned an invalid response"
+        )
+
+    expires_in = payload.get("expires_in")
+    refresh_token = payload.get("refresh_token")
+    return replace(
+        record,
+        access_token=payload["access_token"],
+        refresh_token=refresh_token if isinstance(refresh_token, str) else record.refresh_token,
+        expires_at=(
+            int(time.time() + expires_in)
+            if isinstance(expires_in, (int, float)) and not isinstance(expires_in, bool)
+            else None
+        ),
+    )
+
+
+def is_refreshed(record: CredentialRecord, stored: CredentialRecord) -> bool:
+    """
+    Whether ``stored`` holds a new, still valid token that replaced the one in ``record``.
+    """
+    return stored.access_token != record.access_token and (
+        stored.expires_at is None or stored.expires_at > time.time()
+    )
+
+
+def refresh_credential(record: CredentialRecord) -> CredentialRecord:
+    """
+    Refresh ``record`` and store the result, coordinating with other conda processes.
+
+    Only one process refreshes a target at a time. The stored record is read before waiting
+    for the lock and again once it is held, so processes use a token another process just
+    stored instead of refreshing with a refresh token that was already rotated.
+    """
+    stored = storage.get_credential(record.target)
+    if stored is not None and is_refreshed(record, stored):
+        return stored
+
+    try:
+        with credential_lock(record.target):
+            stored = storage.get_credential(record.target) or record
+            if is_refreshed(record, stored):
+                return stored
+
+            refreshed = request_token_refresh(stored)
+            storage.set_credential(refreshed)
+            return refreshed
+    except FileLockError as exc:
+        raise CondaAuthError(f"Unable to refresh OAuth access token for {record.target!r}: {exc}")
+
+
+class OAuthManager(AuthManager):
+    """
+    Manages OAuth 2.0 access tokens and keeps them fresh.
+
+    Once a channel's token is loaded, a background timer refreshes it ``refresh_margin``
+    seconds before it expires and writes the new token back to storage.
+    """
+
+    def __init__(
+        self,
+        context: conda.base.context.Context | None = None,
+        cache: MutableMapping | None = None,
+        *,
+        refresh_margin: float = OAUTH_REFRESH_MARGIN,
+    ):
+        super().__init__(context, cache)
+        self.refresh_margin = refresh_margin
+        self._tokens: dict[str, OAuthToken] = {}
+        self._timers: dict[str, threading.Timer] = {}
+        self._lock = threading.Lock()
+        self._refreshing: SingleFlight[CredentialRecord] = SingleFlight()
+
+    def get_token(self, channel_name: str) -> OAuthToken | None:
+        """
+        Return the current access token for a channel, loading it if necessary.
+        """
+        _, access_token = self.get_secret(channel_name)
+        if access_token is None:
+            return None
+
+        return self._tokens.get(Channel(channel_name).canonical_name)
+
+    def refresh(self, channel_name: str) -> OAuthToken:
+        """
+        Refresh the access token of a loaded channel and store the new token.
+        """
+        key = Channel(channel_name).canonical_name
+        token = self._tokens.get(key)
+        if token is None:
+            raise CondaAuthError(f"No OAuth access token loaded for {channel_name!r}")
+
+        self._track(key, self._refresh_record(token.record))
+        return token
+
+    def _fetch_secret(self, channel: Channel, settings: Mapping[str, object]) -> tuple[str, str]:
+        secrets, _ = self._fetch_secret_with_expiry(channel, settings)
+        return secrets
+
+    def _fetch_secret_with_expiry(
+        self,
+        channel: Channel,
+        settings: Mapping[str, object],
+    ) -> tuple[tuple[str, str], int | None]:
+        """
+        Load the access token from storage, refreshing it first if it already expired.
+        """
+        record = self.get_credential_record(channel, settings)
+        if record is None or record.access_token is None:
+            raise CondaAuthError("OAuth access token not found")
+
+        if record.expires_at is not None and record.expires_at <= time.time():
+            record = self._refresh_record(record)
+            if record.access_token is None:
+                raise CondaAuthError("OAuth token refresh did not return an access token")
+
+        self._track(channel.canonical_name, record, cache=False)
+        return (USERNAME, record.access_token), record.expires_at
+
+    def _refresh_record(self, record: CredentialRecord) -> CredentialRecord:
+        return self._refreshing.do(record.target, lambda: refresh_credential(record))
+
+    def _track(self, key: str, record: CredentialRecord, *, cache: bool = True) -> None:
+        """
+        Publish ``record`` as the current token for ``key`` and schedule its next refresh.
+        """
+        with self._lock:
+            token = self._tokens.get(key)
+            if token is None:
+                self._tokens[key] = OAuthToken(record)
+            else:
+                token.update(record)
+
+            if cache:
+                secrets = (USERNAME, record.access_token)
+                if isinstance(self._cache, SecretCache):
+                    self._cache.put(key, secrets, expires_at=record.expires_at)
+                else:
+                    self._cache[key] = secrets
+
+            self._schedule_refresh(key, record)
+
+    def _schedule_refresh(
+        self,
+        key: str,
+        record: CredentialRecord,
+        delay: float | None = None,
+    ) -> None:
+        if timer := self._timers.pop(key, None):
+            timer.cancel()
+
+        if record.expires_at is None or record.refresh_token is None:
+            return
+
+        if delay is None:
+            # Tokens that live shorter than the margin are refreshed halfway through instead
+            # of continuously
+            remaining = record.expires_at - time.time()
+            delay = max(remaining - self.refresh_margin, remaining / 2, 0.0)
+
+        timer = threading.Timer(delay, self._refresh_in_background, args=(key,))
+        timer.daemon = True
+        timer.name = f"conda-auth-refresh-{key}"
+        self._timers[key] = timer
+        timer.start()
+
+    def _refresh_in_background(self, key: str) -> None:
+        try:
+            self.refresh(key)
+        except Exception as exc:
+            # Nothing above this timer thread would handle the error, e.g. a keyring failure
+            with self._lock:
+                token = self._tokens.get(key)
+                if token is None:
+                    return
+                record = token.record
+                if record.expires_at is not None and record.expires_at > time.time():
+                    log.debug("%s; retrying in %ss", exc, OAUTH_REFRESH_RETRY_DELAY)
+                    self._schedule_refresh(key, record, delay=OAUTH_REFRESH_RETRY_DELAY)
+                else:
+                    log.warning("%s", exc)
+
+    def cache_clear(self, channel_name: str | None = None) -> None:
+        super().cache_clear(channel_name)
+        with self._lock:
+            keys = [channel_name] if channel_name else list(self._tokens)
+            for key in keys:
+                self._tokens.pop(key, None)
+                if timer := self._timers.pop(key, None):
+                    timer.cancel()
+
+    def remove_secret(self, channel: Channel, settings: Mapping[str, object]) -> None:
+        self.delete_credential_record(channel, settings)
+
+    def get_auth_type(self) -> str:
+        return OAUTH_NAME
+
+    def get_config_parameters(self) -> tuple[str, ...]:
+        return ()
+
+    def get_auth_class(self) -> type:
+        return OAuthHandler
+
+
+manager = OAuthManager()
+
+
+class OAuthHandler(ChannelAuthBase):
+    """
+    Sends the channel's current OAuth 2.0 access token as a bearer token.
+
+    The token is refreshed in the background before it expires, so requests never wait
+    for a refresh.
+    """
+
+    def __init__(self, channel_name: str):
+        token = manager.get_token(channel_name)
+        if token is None:
+            raise CondaAuthError(
+                f"Unable to find OAuth access token for requests with channel {channel_name}"
+            )
+        self._token = token
+
+        super().__init__(channel_name)
+
+    @property
+    def token(self) -> str | None:
+        return self._token.record.access_token
+
+    def __call__(self, r):
+        r.headers["Authorization"] = self._token.authorization
+        return r
@@ -0,0 +1,95 @@
+"""
+Resolve the secrets of every configured auth channel before conda starts fetching repodata
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+from typing import NamedTuple
+
+from conda.models.channel import Channel
+
+from ..constants import PLUGIN_NAME
+from ..matching import GLOB_CHARACTERS
+from .base import AuthManager
+
+# Child of conda's logger, so the timings show up with conda's own ``-v`` output
+log = getLogger(f"conda.{__name__}")
+
+PREFETCH_MAX_WORKERS = 8
+"""
+Maximum number of credentials that are looked up at the same time
+"""
+
+
+class PrefetchRequest(NamedTuple):
+    manager: AuthManager
+    channel: Channel
+    settings: Mapping[str, object]
+
+
+def get_prefetch_requests(managers: Iterable[AuthManager]) -> list[PrefetchRequest]:
+    """
+    Return the configured channels whose secrets are not cached by their manager yet.
+
+    Channel patterns are skipped because they do not name a single channel to cache.
+    """
+    requests = []
+    for manager in managers:
+        for settings in manager.channel_settings_index.settings:
+            configured_channel = str(settings["channel"])
+            if GLOB_CHARACTERS.intersection(configured_channel):
+                continue
+
+            channel = Channel(configured_channel)
+            if manager.is_cached(channel.canonical_name):
+                continue
+
+            requests.append(PrefetchRequest(manager, channel, settings))
+
+    return requests
+
+
+def _prefetch(request: PrefetchRequest) -> bool:
+    try:
+        request.manager.fetch_secret(request.channel, request.settings)
+    except Exception as exc:
+        # Prefetching is best effort and covers channels the command may never use, so
+        # errors such as a locked keyring are left to the auth handler of a used channel
+        log.debug("Unable to prefetch credentials for %s: %s", request.channel, exc)
+        return False
+
+    return True
+
+
+def prefetch_secrets(
+    managers: Iterable[AuthManager],
+    *,
+    max_workers: int = PREFETCH_MAX_WORKERS,
+) -> int:
+    """
+    Resolve the secrets of all configured auth channels concurrently into the manager caches.
+
+    Returns the number of secrets that were resolved.
+    """
+    start = time.perf_counter()
+    requests = get_prefetch_requests(managers)
+    if not requests:
+        return 0
+
+    with ThreadPoolExecutor(
+        max_workers=min(len(requests), max_workers),
+        thread_name_prefix=PLUGIN_NAME,
+    ) as executor:
+        fetched = sum(executor.map(_prefetch, requests))
+
+    log.info(
+        "Prefetched %d of %d channel credentials in %.3fs",
+        fetched,
+        len(requests),
+        time.perf_counter() - start,
+    )
+    return fetched
@@ -0,0 +1,146 @@
+"""
+Reloading of rotated credentials when a channel rejects a request
+"""
+
+from __future__ import annotations
+
+import threading
+from abc import ABC, abstractmethod
+from logging import getLogger
+from typing import NamedTuple
+
+from conda.plugins.types import ChannelAuthBase
+from requests.cookies import extract_cookies_to_jar
+
+log = getLogger(__name__)
+
+AUTH_FAILURE_STATUS_CODES = frozenset({401, 403})
+"""
+Response status codes that make a handler reload its credentials and retry
+"""
+
+RETRIED_REQUEST_ATTRIBUTE = "_conda_auth_retried"
+"""
+Marks requests that were already retried so a request is never retried twice
+"""
+
+
+class AuthRetryInfo(NamedTuple):
+    rejected: int
+    """Number of responses with an auth failure status code."""
+    retried: int
+    """Number of requests sent again with reloaded credentials."""
+    recovered: int
+    """Number of retried requests that no longer failed authentication."""
+
+
+class AuthRetryMetrics:
+    """
+    Thread-safe counters of the auth failures seen by the handlers of this process.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.rejected = 0
+            self.retried = 0
+            self.recovered = 0
+
+    def record(self, *, retried: bool = False, recovered: bool = False) -> None:
+        with self._lock:
+            self.rejected += 1
+            self.retried += retried
+            self.recovered += recovered
+
+    def info(self) -> AuthRetryInfo:
+        with self._lock:
+            return AuthRetryInfo(self.rejected, self.retried, self.recovered)
+
+
+metrics = AuthRetryMetrics()
+
+
+class ReloadingAuthBase(ChannelAuthBase, ABC):
+    """
+    Base for handlers that reload their credentials when the channel rejects them.
+
+    When a response has a 401 or 403 status code, the handler reloads the credential from
+    storage. If the request was sent with another credential than the one the handler now
+    holds, e.g. because it was rotated with ``conda auth login`` while conda was running,
+    the request is sent once more with the current credential.
+    """
+
+    @abstractmethod
+    def reload_credentials(self) -> bool:
+        """
+        Read the credentials again and return whether they changed.
+        """
+
+    @abstractmethod
+    def apply_credentials(self, r) -> None:
+        """
+        Add the current credentials to a request, replacing any that are already present.
+        """
+
+    def _try_reload_credentials(self) -> bool:
+        # Runs inside a response hook, where an error would replace the original response
+        try:
+            return self.reload_credentials()
+        except Exception as exc:
+            log.warning("Could not reload credentials for %s: %s", self.channel_name, exc)
+            return False
+
+    def register_retry(self, r):
+        r.register_hook("response", self.handle_auth_failure)
+        return r
+
+    def handle_auth_failure(self, r, **kwargs):
+        if r.status_code not in AUTH_FAILURE_STATUS_CODES:
+            return r
+        if getattr(r.request, RETRIED_REQUEST_ATTRIBUTE, False):
+            return r
+
+        # Streamed bodies cannot be sent a second time
+        body = r.request.body
+        if body is not None and not isinstance(body, (bytes, str)):
+            metrics.record()
+            return r
+
+        # With parallel downloads, another rejected request may have reloaded the shared
+        # credentials already, so compare with what this request was actually sent with
+        self._try_reload_credentials()
+        prep = r.request.copy()
+        self.apply_credentials(prep)
+        if prep.headers == r.request.headers and prep.url == r.request.url:
+            metrics.record()
+            return r
+
+        log.info(
+            "Retrying %s with reloaded credentials after HTTP %s", r.request.url, r.status_code
+        )
+
+        # Consume content and release the original connection so the retry can reuse it
+        r.content
+        r.close()
+        setattr(prep, RETRIED_REQUEST_ATTRIBUTE, True)
+        extract_cookies_to_jar(prep._cookies, r.request, r.raw)
+        prep.prepare_cookies(prep._cookies)
+
+        retry = r.connection.send(prep, **kwargs)
+        retry.history.append(r)
+        retry.request = prep
+        metrics.record(
+            retried=True,
+            recovered=retry.status_code not in AUTH_FAILURE_STATUS_CODES,
+        )
+        return retry
+
+
+def get_auth_retry_info() -> AuthRetryInfo:
+    """
+    Return how often handlers saw auth failures and retried with reloaded credentials.
+    """
+    return metrics.info()
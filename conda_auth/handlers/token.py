@@ -4,18 +4,21 @@ Token implementation for the conda auth handler plugin hook
 
 from __future__ import annotations
 
-from collections.abc import Mapping
+import re
+from collections.abc import Mapping, MutableMapping
 from dataclasses import replace
+from string import Formatter
 from urllib.parse import urlparse
 
+import conda.base.context
 from conda.models.channel import Channel
-from conda.plugins.types import ChannelAuthBase
 
+from ..constants import TOKEN_NAME
 from ..credentials import CredentialRecord
 from ..exceptions import CondaAuthError
-from ..storage import storage
-from ..storage.keyring import KeyringStorage
+from ..storage import find_keyring_storage, storage
 from .base import AuthManager
+from .retry import ReloadingAuthBase
 
 TOKEN_PARAM_NAME: str = "token"
 """
@@ -27,32 +30,73 @@ USERNAME: str = "token"
 Placeholder value for username; This is written to the secret storage backend
 """
 
-TOKEN_NAME: str = "token"
+DEFAULT_TOKEN_HEADER: str = "Authorization"
 """
-Name used to refer to this authentication handler in configuration
+Request header that carries the token unless the credential record names another one
+"""
+
+TOKEN_HEADER_PATTERN = re.compile(r"[!#$%&'*+\-.^_`|~0-9A-Za-z]+")
+"""
+Characters allowed in an HTTP header name (RFC 9110 ``token``)
 """
 
 
 class TokenAuthManager(AuthManager):
+    def __init__(
+        self,
+        context: conda.base.context.Context | None = None,
+        cache: MutableMapping | None = None,
+    ):
+        super().__init__(context, cache)
+        self._token_formats: dict[str, tuple[str | None, str | None]] = {}
+
+    def get_token_format(self, channel_name: str) -> tuple[str | None, str | None]:
+        """
+        Return the ``token_header`` and ``token_template`` of the last record read for a
+        channel; ``None`` values mean the defaults apply.
+        """
+        return self._token_formats.get(Channel(channel_name).canonical_name, (None, None))
+
+    def cache_clear(self, channel_name: str | None = None) -> None:
+        super().cache_clear(channel_name)
+        if channel_name:
+            self._token_formats.pop(channel_name, None)
+        else:
+            self._token_formats.clear()
+
     def _fetch_secret(self, channel: Channel, settings: Mapping[str, object]) -> tuple[str, str]:
+        secrets, _ = self._fetch_secret_with_expiry(channel, settings)
+        return secrets
+
+    def _fetch_secret_with_expiry(
+        self,
+        channel: Channel,
+        settings: Mapping[str, object],
+    ) -> tuple[tuple[str, str], int | None]:
         """
         Gets the secrets by checking the keyring and then falling back to interrupting
-        the program and asking the user for secret.
+        the program and asking the user for secret. Stored tokens expire with their record.
         """
         record = self.get_credential_record(channel, settings)
+        if record is not None:
+            self._token_formats[channel.canonical_name] = (
+                record.token_header,
+                record.token_template,
+            )
 
         # First try the value we passed in.
         token = settings.get(TOKEN_PARAM_NAME)
         if token is not None and not isinstance(token, str):
             raise CondaAuthError("Token not found")
 
+        expires_at = None
         if token is None and record is not None:
-            token = record.token
+            token, expires_at = record.token, record.expires_at
 
         if token is None:
             raise CondaAuthError("Token not found")
 
-        return USERNAME, token
+        return (USERNAME, token), expires_at
 
     def remove_secret(self, channel: Channel, settings: Mapping[str, object]) -> None:
         self.delete_credential_record(channel, settings)
@@ -80,14 +124,24 @@ class TokenAuthManager(AuthManager):
             token=secret,
         )
 
+    def get_legacy_migration_key(
+        self,
+        settings: Mapping[str, object] | None,
+        target: str,
+    ) -> str | None:
+        if find_keyring_storage(storage.backend) is None:
+            return None
+
+        return f"{TOKEN_NAME}::{target}"
+
     def migrate_legacy_credential_record(
         self,
         channel: Channel,
         settings: Mapping[str, object] | None,
         target: str,
     ) -> CredentialRecord | None:
-        backend = storage.backend
-        if not isinstance(backend, KeyringStorage):
+        backend = find_keyring_storage(storage.backend)
+        if backend is None:
             return None
 
         for legacy_target in self.legacy_credential_targets(channel, target):
@@ -108,8 +162,8 @@ class TokenAuthManager(AuthManager):
         settings: Mapping[str, object] | None,
         target: str,
     ) -> None:
-        backend = storage.backend
-        if not isinstance(backend, KeyringStorage):
+        backend = find_keyring_storage(storage.backend)
+        if backend is None:
             return
 
         for legacy_target in self.legacy_credential_targets(channel, target):
@@ -136,7 +190,44 @@ def is_anaconda_dot_org(channel_name: str) -> bool:
     return False
 
 
-class TokenAuthHandler(ChannelAuthBase):
+def validate_token_header(header: str) -> str:
+    """
+    Make sure a stored ``token_header`` is a valid HTTP header name.
+    """
+    if not TOKEN_HEADER_PATTERN.fullmatch(header):
+        raise CondaAuthError(f"Invalid token header {header!r}")
+
+    return header
+
+
+def render_token_template(template: str, token: str) -> str:
+    """
+    Validate a stored ``token_template`` and return the header value it produces for ``token``.
+
+    Templates must contain the ``{token}`` field and no other fields.
+    """
+    try:
+        fields = [
+            (field_name, format_spec, conversion)
+            for _, field_name, format_spec, conversion in Formatter().parse(template)
+            if field_name is not None
+        ]
+    except ValueError as exc:
+        raise CondaAuthError(f"Invalid token template {template!r}: {exc}")
+
+    if not fields or any(field != ("token", "", None) for field in fields):
+        raise CondaAuthError(
+            f"Invalid token template {template!r}: it must contain '{{token}}' and no other fields"
+        )
+
+    value = template.format(token=token)
+    if "\r" in value or "\n" in value:
+        raise CondaAuthError(f"Invalid token template {template!r}: it must be a single line")
+
+    return value
+
+
+class TokenAuthHandler(ReloadingAuthBase):
     """
     Implements token auth that inserts a token as a header for all network request
     in conda for the channel specified on object instantiation.
@@ -148,6 +239,11 @@ class TokenAuthHandler(ChannelAuthBase):
     In all other cases, we use the "bearer" format:
 
         Authentication: Bearer <token>
+
+    Credential records with a ``token_header`` or ``token_template`` override this, e.g.
+    ``X-JFrog-Art-Api: <token>``. A custom header without a template carries the bare token.
+    The header value is built once here instead of on every request. Rejected requests are
+    retried once if the stored token changed in the meantime.
     """
 
     def __init__(self, channel_name: str):
@@ -160,11 +256,45 @@ class TokenAuthHandler(ChannelAuthBase):
             )
 
         super().__init__(channel_name)
+        self.token_header, self._header_value = self._render_header(channel_name, self.token)
+        self._replaced_header: str | None = None
+
+    def _render_header(self, channel_name: str, token: str) -> tuple[str, str]:
+        token_header, token_template = manager.get_token_format(channel_name)
+        token_header = validate_token_header(token_header or DEFAULT_TOKEN_HEADER)
+        if token_template is None:
+            if token_header != DEFAULT_TOKEN_HEADER:
+                token_template = "{token}"
+            elif self.is_anaconda_dot_org:
+                token_template = "token {token}"
+            else:
+                token_template = "Bearer {token}"
+        return token_header, render_token_template(token_template, token)
+
+    def reload_credentials(self) -> bool:
+        manager.cache_clear(Channel(self.channel_name).canonical_name)
+        try:
+            _, token = manager.get_secret(self.channel_name)
+            if token is None:
+                return False
+            token_header, header_value = self._render_header(self.channel_name, token)
+        except CondaAuthError:
+            return False
 
-    def __call__(self, r):
-        if self.is_anaconda_dot_org:
-            r.headers["Authorization"] = f"token {self.token}"
-        else:
-            r.headers["Authorization"] = f"Bearer {self.token}"
+        if (token_header, header_value) == (self.token_header, self._header_value):
+            return False
+
+        if token_header != self.token_header:
+            self._replaced_header = self.token_header
+        self.token = token
+        self.token_header, self._header_value = token_header, header_value
+        return True
 
-        return r
+    def apply_credentials(self, r) -> None:
+        if self._replaced_header is not None:
+            r.headers.pop(self._replaced_header, None)
+        r.headers[self.token_header] = self._header_value
+
+    def __call__(self, r):
+        r.headers[self.token_header] = self._header_value
+        return self.register_retry(r)
@@ -0,0 +1,327 @@
+"""
+Matching of channels against the channel names configured in ``channel_settings``
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from fnmatch import translate
+from functools import lru_cache
+from os.path import normcase
+from typing import NamedTuple
+
+from conda.common.url import urlparse as conda_urlparse
+from conda.models.channel import Channel
+
+GLOB_CHARACTERS = frozenset("*?[")
+"""
+Characters that make ``fnmatch`` treat a configured channel as a pattern
+"""
+
+GLOB_SYNTAX_CHARACTERS = GLOB_CHARACTERS | {"]"}
+"""
+Characters that end the literal text at the end of a host pattern
+"""
+
+MATCHER_CACHE_SIZE = 4096
+"""
+Number of parsed channel URLs and compiled channel patterns kept in memory
+"""
+
+Matcher = Callable[[str], object]
+
+
+class ChannelPattern(NamedTuple):
+    """
+    A configured channel compiled for matching against channel URLs.
+    """
+
+    scheme: str | None
+    host: str | None
+    """Host the pattern is limited to, or ``None`` when the host itself is a pattern."""
+    host_suffix: str
+    """Literal text a host pattern ends with, e.g. ``.example.com`` for ``*.example.com``."""
+    url: str | None
+    """The channel URL to match exactly, when the pattern has no wildcards at all."""
+    match: Matcher
+
+
+class ParsedChannelUrl(NamedTuple):
+    """
+    The parts of a channel base URL used for matching.
+    """
+
+    scheme: str | None
+    host: str
+    url: str
+
+
+@lru_cache(maxsize=MATCHER_CACHE_SIZE)
+def compile_channel_pattern(configured_channel: str) -> ChannelPattern:
+    """
+    Compile a configured channel the same way conda's ``fnmatch`` based auth handler lookup
+    interprets it.
+    """
+    parsed_setting = conda_urlparse(configured_channel)
+    host = normcase(parsed_setting.netloc or "")
+    pattern = host + normcase(parsed_setting.path or "")
+
+    is_literal_host = not GLOB_CHARACTERS.intersection(host)
+    suffix_start = len(host)
+    while suffix_start and host[suffix_start - 1] not in GLOB_SYNTAX_CHARACTERS:
+        suffix_start -= 1
+
+    return ChannelPattern(
+        scheme=parsed_setting.scheme,
+        # Patterns with a literal host can only match channels on that exact host
+        host=host if is_literal_host else None,
+        host_suffix="" if is_literal_host else host[suffix_start:],
+        url=None if GLOB_CHARACTERS.intersection(pattern) else pattern,
+        match=re.compile(translate(pattern)).match,
+    )
+
+
+@lru_cache(maxsize=MATCHER_CACHE_SIZE)
+def parse_channel_url(url: str) -> ParsedChannelUrl:
+    """
+    Parse a channel base URL for matching against compiled patterns.
+    """
+    parsed_channel = conda_urlparse(url)
+    host = normcase(parsed_channel.netloc or "")
+
+    return ParsedChannelUrl(
+        scheme=parsed_channel.scheme,
+        host=host,
+        url=host + normcase(parsed_channel.path or ""),
+    )
+
+
+def channel_matches(configured_channel: str, channel: Channel) -> bool:
+    """
+    Match configured channel names the same way conda selects auth handlers.
+    """
+    if configured_channel == channel.canonical_name:
+        return True
+
+    if channel.base_url is None:
+        return False
+
+    pattern = compile_channel_pattern(configured_channel)
+    parsed_channel = parse_channel_url(channel.base_url)
+    if pattern.scheme != parsed_channel.scheme:
+        return False
+
+    return pattern.match(parsed_channel.url) is not None
+
+
+class ChannelMatcher:
+    """
+    Match a channel against many configured channel names at once.
+
+    Configured channels are added with increasing positions. Exact names and URLs are kept
+    in dicts and patterns are grouped by scheme and host, so a lookup only tries the
+    patterns that can apply to the channel's host. Patterns with a wildcard host are
+    grouped by the literal text their host ends with, and only tried on channels whose
+    host ends with it.
+
+    This is stricter than ``fnmatch``, where ``*`` also matches ``/``: there,
+    ``https://*.example.com/*`` matches ``https://evil.com/a.example.com/``, because the
+    host suffix is found in the path. Credentials are never sent to such channels.
+    """
+
+    def __init__(self) -> None:
+        self._exact: dict[str, list[int]] = {}
+        self._urls: dict[tuple[str | None, str], list[int]] = {}
+        self._patterns: dict[tuple[str | None, str], list[tuple[int, Matcher]]] = {}
+        self._wildcard_hosts: dict[tuple[str | None, str], list[tuple[int, Matcher]]] = {}
+        self._suffix_lengths: list[int] = []
+
+    def add(self, configured_channel: str, position: int) -> None:
+        """
+        Register a configured channel at ``position``.
+        """
+        self._exact.setdefault(configured_channel, []).append(position)
+        pattern = compile_channel_pattern(configured_channel)
+        if pattern.url is not None:
+            self._urls.setdefault((pattern.scheme, pattern.url), []).append(position)
+        elif pattern.host is not None:
+            self._patterns.setdefault((pattern.scheme, pattern.host), []).append(
+                (position, pattern.match)
+            )
+        else:
+            self._wildcard_hosts.setdefault((pattern.scheme, pattern.host_suffix), []).append(
+                (position, pattern.match)
+            )
+            if len(pattern.host_suffix) not in self._suffix_lengths:
+                self._suffix_lengths.append(len(pattern.host_suffix))
+
+    def _parse(self, channel: Channel) -> ParsedChannelUrl | None:
+        """
+        Parse the URL of ``channel`` if any URL or pattern was added.
+        """
+        if not (self._urls or self._patterns or self._wildcard_hosts):
+            return None
+
+        base_url = channel.base_url
+        return None if base_url is None else parse_channel_url(base_url)
+
+    def _candidates(self, parsed_channel: ParsedChannelUrl) -> Iterator[list[tuple[int, Matcher]]]:
+        """
+        Yield the pattern groups that can match ``parsed_channel``.
+        """
+        scheme, host = parsed_channel.scheme, parsed_channel.host
+        if patterns := self._patterns.get((scheme, host)):
+            yield patterns
+
+        # One lookup per distinct suffix length, however many patterns share it
+        for length in self._suffix_lengths:
+            if length > len(host):
+                continue
+            if patterns := self._wildcard_hosts.get((scheme, host[len(host) - length :])):
+                yield patterns
+
+    def find_last(self, channel: Channel) -> int | None:
+        """
+        Return the highest position that matches ``channel``.
+        """
+        exact = self._exact.get(channel.canonical_name)
+        best = exact[-1] if exact else -1
+
+        parsed_channel = self._parse(channel)
+        if parsed_channel is None:
+            return best if best >= 0 else None
+
+        urls = self._urls.get((parsed_channel.scheme, parsed_channel.url))
+        if urls and urls[-1] > best:
+            best = urls[-1]
+
+        for patterns in self._candidates(parsed_channel):
+            for position, match in reversed(patterns):
+                if position <= best:
+                    break
+                if match(parsed_channel.url):
+                    best = position
+                    break
+
+        return best if best >= 0 else None
+
+    def find_all(self, channel: Channel, *, names: Iterable[str] = ()) -> list[int]:
+        """
+        Return every position that matches ``channel`` or one of ``names`` exactly, in order.
+        """
+        positions = set(self._exact.get(channel.canonical_name, ()))
+        for name in names:
+            positions.update(self._exact.get(name, ()))
+
+        parsed_channel = self._parse(channel)
+        if parsed_channel is not None:
+            positions.update(self._urls.get((parsed_channel.scheme, parsed_channel.url), ()))
+            for patterns in self._candidates(parsed_channel):
+                positions.update(
+                    position for position, match in patterns if match(parsed_channel.url)
+                )
+
+        return sorted(positions)
+
+
+class ChannelSettingsIndex:
+    """
+    Index of ``channel_settings`` entries answering which entries apply to a channel.
+
+    Only entries with an ``auth`` value (equal to ``auth_type`` when given) and a channel
+    name are indexed. With ``include_auth_targets``, entries also match through their
+    ``auth_target``.
+    """
+
+    def __init__(
+        self,
+        channel_settings: Sequence[Mapping[str, object]],
+        auth_type: str | None = None,
+        *,
+        include_auth_targets: bool = False,
+    ) -> None:
+        self.source = channel_settings
+        self._source_size = len(channel_settings)
+        self.settings: list[Mapping[str, object]] = []
+        self._matcher = ChannelMatcher()
+
+        for settings in channel_settings:
+            if not isinstance(settings, Mapping) or not settings.get("auth"):
+                continue
+            if auth_type is not None and settings.get("auth") != auth_type:
+                continue
+            configured_channel = settings.get("channel")
+            if not configured_channel or not isinstance(configured_channel, str):
+                continue
+
+            position = len(self.settings)
+            self.settings.append(settings)
+            self._matcher.add(configured_channel, position)
+            if include_auth_targets:
+                auth_target = get_auth_target(settings)
+                if auth_target != configured_channel:
+                    self._matcher.add(auth_target, position)
+
+    def is_current(self, channel_settings: Sequence[Mapping[str, object]]) -> bool:
+        """
+        Return whether this index was built from ``channel_settings``.
+        """
+        return channel_settings is self.source and len(channel_settings) == self._source_size
+
+    def find(self, channel: Channel) -> Mapping[str, object] | None:
+        """
+        Return the last configured entry that matches ``channel``.
+        """
+        position = self._matcher.find_last(channel)
+        return None if position is None else self.settings[position]
+
+    def find_all(
+        self,
+        channel: Channel,
+        *,
+        names: Iterable[str] = (),
+    ) -> list[Mapping[str, object]]:
+        """
+        Return the configured entries that match ``channel`` or one of ``names``, in order.
+        """
+        return [
+            self.settings[position] for position in self._matcher.find_all(channel, names=names)
+        ]
+
+
+_indexes: dict[tuple[str | None, bool], ChannelSettingsIndex] = {}
+
+
+def get_channel_settings_index(
+    channel_settings: Sequence[Mapping[str, object]],
+    auth_type: str | None = None,
+    *,
+    include_auth_targets: bool = False,
+) -> ChannelSettingsIndex:
+    """
+    Return an index for ``channel_settings``, reusing the last one built from the same
+    settings with the same options.
+    """
+    key = (auth_type, include_auth_targets)
+    index = _indexes.get(key)
+    if index is None or not index.is_current(channel_settings):
+        index = ChannelSettingsIndex(
+            channel_settings,
+            auth_type,
+            include_auth_targets=include_auth_targets,
+        )
+        _indexes[key] = index
+
+    return index
+
+
+def get_auth_target(settings: Mapping[str, object]) -> str:
+    """
+    Return the credential target of a configured entry, defaulting to its channel.
+    """
+    auth_target = settings.get("auth_target")
+    if isinstance(auth_target, str):
+        return auth_target
+
+    return str(settings.get("channel"))
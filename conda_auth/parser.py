@@ -40,7 +40,15 @@ def configure_parser(parser: argparse.ArgumentParser) -> None:
         help="Log in to a channel",
         description="Log in to a channel by storing the credentials or tokens associated with it",
     )
-    login_parser.add_argument("channel")
+    login_parser.add_argument("channel", nargs="?")
+    login_parser.add_argument(
+        "--from-file",
+        metavar="PATH",
+        help=(
+            "Log in to every channel listed in a YAML or JSON manifest file at once."
+            " Use '-' to read a JSON manifest from standard input"
+        ),
+    )
     auth_options = login_parser.add_mutually_exclusive_group()
     auth_options.add_argument(
         "-b",
@@ -66,7 +74,21 @@ def configure_parser(parser: argparse.ArgumentParser) -> None:
         help="Log out of a channel",
         description="Log out of a channel by removing any credentials or tokens associated with it",
     )
-    logout_parser.add_argument("channel")
+    logout_parser.add_argument("channel", nargs="?")
+    logout_options = logout_parser.add_mutually_exclusive_group()
+    logout_options.add_argument(
+        "--all",
+        action="store_true",
+        help="Log out of every channel logged in through the user condarc",
+    )
+    logout_options.add_argument(
+        "--match",
+        metavar="PATTERN",
+        help=(
+            "Log out of every channel in the user condarc matching PATTERN,"
+            " e.g. 'https://repo.example.com/*'"
+        ),
+    )
     add_parser_json(logout_parser)
 
     status_parser = subparsers.add_parser(
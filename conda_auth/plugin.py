@@ -3,15 +3,32 @@ A place to register plugin hooks
 """
 
 from conda.plugins import hookimpl
-from conda.plugins.types import CondaAuthHandler, CondaSubcommand
+from conda.plugins.types import (
+    CondaAuthHandler,
+    CondaPreCommand,
+    CondaSetting,
+    CondaSubcommand,
+)
+
+
+def auth(args):
+    """
+    Run the auth subcommand, importing the CLI only when it is actually used.
+    """
+    from .cli import auth
+
+    return auth(args)
 
 
 @hookimpl
 def conda_subcommands():
     """
     Registers subcommands
+
+    Conda configures the parsers of all subcommands on every command, so only the parser
+    is imported here.
     """
-    from .cli import auth, configure_parser
+    from .parser import configure_parser
 
     yield CondaSubcommand(
         name="auth",
@@ -25,13 +42,129 @@ def conda_subcommands():
 def conda_auth_handlers():
     """
     Registers auth handlers
+
+    The registered classes only import the actual handlers when conda constructs one.
+    """
+    from .constants import HTTP_BASIC_AUTH_NAME, OAUTH_NAME, TOKEN_NAME
+    from .handlers.lazy import LazyBasicAuthHandler, LazyOAuthHandler, LazyTokenAuthHandler
+
+    yield CondaAuthHandler(name=HTTP_BASIC_AUTH_NAME, handler=LazyBasicAuthHandler)
+    yield CondaAuthHandler(name=TOKEN_NAME, handler=LazyTokenAuthHandler)
+    yield CondaAuthHandler(name=OAUTH_NAME, handler=LazyOAuthHandler)
+
+
+@hookimpl
+def conda_settings():
     """
-    from .handlers import (
-        HTTP_BASIC_AUTH_NAME,
-        TOKEN_NAME,
-        BasicAuthHandler,
-        TokenAuthHandler,
+    Registers settings
+    """
+    from conda.common.configuration import PrimitiveParameter
+
+    from .constants import (
+        CREDENTIAL_CACHE_TTL_SETTING,
+        CREDENTIAL_ENV_PREFIX_SETTING,
+        CREDENTIAL_FILE_SETTING,
+        CREDENTIAL_KEYRING_COMPACT_SETTING,
+        CREDENTIAL_MISS_TTL_SETTING,
+        CREDENTIAL_PREFETCH_SETTING,
+        CREDENTIAL_SECRETS_DIR_SETTING,
+        CREDENTIAL_STORAGE_AUTO,
+        CREDENTIAL_STORAGE_SETTING,
+        DEFAULT_CREDENTIAL_MISS_TTL,
+    )
+
+    yield CondaSetting(
+        name=CREDENTIAL_CACHE_TTL_SETTING,
+        description=(
+            "Number of seconds stored credentials are kept in an encrypted local cache in"
+            " front of the credential storage backend. Set to 0 to disable the cache."
+        ),
+        parameter=PrimitiveParameter(0, element_type=int),
+    )
+    yield CondaSetting(
+        name=CREDENTIAL_MISS_TTL_SETTING,
+        description=(
+            "Number of seconds a channel without stored credentials is remembered, so it is"
+            " not looked up in the credential storage backend again. Set to 0 to disable."
+        ),
+        parameter=PrimitiveParameter(DEFAULT_CREDENTIAL_MISS_TTL, element_type=int),
+    )
+    yield CondaSetting(
+        name=CREDENTIAL_PREFETCH_SETTING,
+        description=(
+            "Look up the credentials of all configured auth channels concurrently before"
+            " conda starts fetching repodata."
+        ),
+        parameter=PrimitiveParameter(False, element_type=bool),
     )
+    yield CondaSetting(
+        name=CREDENTIAL_STORAGE_SETTING,
+        description=(
+            "Where credentials are stored: 'keyring', 'file', or 'auto' to use the keyring"
+            " and fall back to the credential file when no keyring backend is available."
+        ),
+        parameter=PrimitiveParameter(CREDENTIAL_STORAGE_AUTO, element_type=str),
+    )
+    yield CondaSetting(
+        name=CREDENTIAL_KEYRING_COMPACT_SETTING,
+        description=(
+            "Store keyring credentials in a shorter encoding. Older conda auth releases"
+            " cannot read it, so only enable this when every release sharing the keyring can."
+        ),
+        parameter=PrimitiveParameter(False, element_type=bool),
+    )
+    yield CondaSetting(
+        name=CREDENTIAL_FILE_SETTING,
+        description=(
+            "Location of the file credentials are stored in when the keyring is not used."
+            " Defaults to credentials.json in the conda-auth user data directory."
+        ),
+        parameter=PrimitiveParameter(None, element_type=(str, type(None))),
+    )
+    yield CondaSetting(
+        name=CREDENTIAL_ENV_PREFIX_SETTING,
+        description=(
+            "Prefix of environment variables providing credentials, e.g. CONDA_AUTH_. They are"
+            " used before stored credentials and named after the channel, e.g."
+            " CONDA_AUTH_HTTPS_REPO_EXAMPLE_COM_PRIVATE."
+        ),
+        parameter=PrimitiveParameter(None, element_type=(str, type(None))),
+    )
+    yield CondaSetting(
+        name=CREDENTIAL_SECRETS_DIR_SETTING,
+        description=(
+            "Directory of files providing credentials, named like the environment variables"
+            " without their prefix. They are used before stored credentials."
+        ),
+        parameter=PrimitiveParameter(None, element_type=(str, type(None))),
+    )
+
+
+def prefetch_credentials(command: str) -> None:
+    """
+    Prefetch the credentials of all configured auth channels when enabled.
+    """
+    from .constants import CREDENTIAL_PREFETCH_SETTING
+    from .settings import get_plugin_setting
 
-    yield CondaAuthHandler(name=HTTP_BASIC_AUTH_NAME, handler=BasicAuthHandler)
-    yield CondaAuthHandler(name=TOKEN_NAME, handler=TokenAuthHandler)
+    if not get_plugin_setting(CREDENTIAL_PREFETCH_SETTING, False):
+        return
+
+    from .handlers import basic_auth_manager, oauth_manager, token_auth_manager
+    from .handlers.prefetch import prefetch_secrets
+
+    prefetch_secrets((basic_auth_manager, token_auth_manager, oauth_manager))
+
+
+@hookimpl
+def conda_pre_commands():
+    """
+    Registers pre-commands
+    """
+    from .constants import PREFETCH_COMMANDS
+
+    yield CondaPreCommand(
+        name="conda-auth-prefetch",
+        action=prefetch_credentials,
+        run_for=set(PREFETCH_COMMANDS),
+    )
@@ -0,0 +1,46 @@
+"""
+Helpers for reading the settings registered by ``conda_auth.plugin.conda_settings``
+"""
+
+from __future__ import annotations
+
+from typing import TypeVar, overload
+
+import conda.base.context
+from conda.base.context import context as global_context
+
+T = TypeVar("T")
+
+
+@overload
+def get_plugin_setting(
+    name: str,
+    default: None,
+    context: conda.base.context.Context | None = None,
+) -> str | None: ...
+
+
+@overload
+def get_plugin_setting(
+    name: str,
+    default: T,
+    context: conda.base.context.Context | None = None,
+) -> T: ...
+
+
+def get_plugin_setting(
+    name: str,
+    default: object,
+    context: conda.base.context.Context | None = None,
+) -> object:
+    """
+    Return the value of a plugin setting, falling back to ``default`` when it is not set.
+
+    Settings without a default, such as paths, are registered as optional strings.
+    """
+    plugins = getattr(context or global_context, "plugins", None)
+    value = getattr(plugins, name, None)
+    if value is None:
+        return default
+
+    return value
@@ -1,25 +1,183 @@
+"""
+Credential storage backends
+
+``keyring`` is only imported once the keyring is actually used, so credentials resolved
+from the environment never pay for it.
+"""
+
 from __future__ import annotations
 
-from keyring import get_keyring
-from keyring.errors import NoKeyringError
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from logging import getLogger
+from pathlib import Path
+from typing import TYPE_CHECKING, TypeVar
 
+from ..constants import (
+    CREDENTIAL_CACHE_TTL_SETTING,
+    CREDENTIAL_ENV_PREFIX_SETTING,
+    CREDENTIAL_FILE_SETTING,
+    CREDENTIAL_KEYRING_COMPACT_SETTING,
+    CREDENTIAL_MISS_TTL_SETTING,
+    CREDENTIAL_SECRETS_DIR_SETTING,
+    CREDENTIAL_STORAGE_AUTO,
+    CREDENTIAL_STORAGE_FILE,
+    CREDENTIAL_STORAGE_SETTING,
+    CREDENTIAL_STORAGE_TYPES,
+    DEFAULT_CREDENTIAL_MISS_TTL,
+)
 from ..credentials import CredentialRecord
 from ..exceptions import CondaAuthError
-from .base import Storage
-from .keyring import KeyringStorage
+from ..settings import get_plugin_setting
+from .base import Storage, find_backend
+from .cache import CACHE_FILE_NAME, CredentialCacheStorage
+from .credential_file import CREDENTIAL_FILE_NAME, FileStorage
+from .environment import EnvironmentStorage
+from .files import get_cache_dir, get_data_dir
+from .memory import MemoryStorage
+from .misses import MISS_CACHE_FILE_NAME, MissCacheStorage
+from .state import (
+    clear_backend_state,
+    get_backend_stamp,
+    get_backend_state_path,
+    read_backend_state,
+    write_backend_state,
+)
+from .tiered import TieredStorage
+
+if TYPE_CHECKING:
+    from keyring.backend import KeyringBackend
+
+    from .keyring import KeyringStorage
+
+__all__ = [
+    "CredentialCacheStorage",
+    "EnvironmentStorage",
+    "FileStorage",
+    "KeyringStorage",
+    "LazyStorage",
+    "MemoryStorage",
+    "MissCacheStorage",
+    "Storage",
+    "TieredStorage",
+    "find_backend",
+    "find_keyring_storage",
+    "get_credential_file_path",
+    "get_credential_storage",
+    "get_storage_backend",
+    "storage",
+]
+
+log = getLogger(__name__)
+
+T = TypeVar("T")
+
+plaintext_fallback_warnings: set[Path] = set()
+"""
+Credential files the user was already warned about falling back to
+"""
+
+
+def __getattr__(name: str) -> object:
+    if name == "KeyringStorage":
+        from .keyring import KeyringStorage
+
+        return KeyringStorage
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_keyring() -> KeyringBackend:
+    """
+    Return the active keyring backend.
+    """
+    from keyring import get_keyring
+
+    return get_keyring()
+
+
+def is_no_keyring_error(exc: BaseException) -> bool:
+    """
+    Return whether ``exc`` is a ``NoKeyringError``, without importing ``keyring`` for it.
+    """
+    # A NoKeyringError can only have been raised once keyring was imported
+    errors = sys.modules.get("keyring.errors")
+    return errors is not None and isinstance(exc, errors.NoKeyringError)
+
+
+def find_keyring_storage(backend: object) -> KeyringStorage | None:
+    """
+    Return the keyring storage in a chain of wrapped storages, if there is one.
+    """
+    from .keyring import KeyringStorage
+
+    return find_backend(backend, KeyringStorage)
+
+
+def warn_plaintext_fallback(path: Path) -> None:
+    """
+    Tell the user, once per process, that credentials are stored unencrypted in ``path``.
+    """
+    if path in plaintext_fallback_warnings:
+        return
+
+    plaintext_fallback_warnings.add(path)
+    log.warning(
+        "No keyring backend is available, so credentials are stored unencrypted in %s. Install"
+        " a keyring backend or set 'auth_credential_storage: file' to silence this warning.",
+        path,
+    )
+
+
+def get_credential_file_path() -> Path:
+    """
+    Return the location of the credential file used when the keyring is not.
+    """
+    path = get_plugin_setting(CREDENTIAL_FILE_SETTING, None)
+    if path:
+        return Path(path).expanduser()
+
+    return get_data_dir() / CREDENTIAL_FILE_NAME
 
 
 def get_storage_backend() -> Storage:
     """
     Determine the correct storage backend to use, raise CondaAuthError if none found.
 
-    TODO: Add future support for another storage backend when keyring cannot be used.
+    Credentials are stored in the keyring, unless the ``auth_credential_storage`` setting
+    selects the credential file, or is left at "auto" and no keyring backend is available.
+    The keyring is only probed when its backend differs from the one recorded by the last
+    successful probe.
     """
+    storage_type = get_plugin_setting(CREDENTIAL_STORAGE_SETTING, CREDENTIAL_STORAGE_AUTO)
+    if storage_type not in CREDENTIAL_STORAGE_TYPES:
+        raise CondaAuthError(
+            f"Unknown credential storage {storage_type!r}, expected one of: "
+            + ", ".join(CREDENTIAL_STORAGE_TYPES)
+        )
+
+    if storage_type == CREDENTIAL_STORAGE_FILE:
+        return FileStorage(get_credential_file_path())
+
+    from keyring.errors import NoKeyringError
+
+    from .keyring import KeyringStorage
+
+    state_path = get_backend_state_path()
     try:
         keyring_tester = get_keyring()
-        # Retrieve a dummy password to try to trigger NoKeyringError
-        keyring_tester.get_password("conda_auth", "test")
+        stamp = get_backend_stamp(keyring_tester)
+        if read_backend_state(state_path) != stamp:
+            # Retrieve a dummy password to try to trigger NoKeyringError
+            keyring_tester.get_password("conda_auth", "test")
+            write_backend_state(state_path, stamp)
     except NoKeyringError:
+        clear_backend_state(state_path)
+        if storage_type == CREDENTIAL_STORAGE_AUTO:
+            path = get_credential_file_path()
+            warn_plaintext_fallback(path)
+            return FileStorage(path)
+
         raise CondaAuthError(
             "Unable to find a credential storage backend, which means this operating system"
             " is likely unsupported. One way to overcome this is by installing a third party"
@@ -27,7 +185,44 @@ def get_storage_backend() -> Storage:
             "https://pypi.org/project/keyring"
         )
 
-    return KeyringStorage()
+    keyring_storage = KeyringStorage(
+        compact=get_plugin_setting(CREDENTIAL_KEYRING_COMPACT_SETTING, False)
+    )
+    backend: Storage = keyring_storage
+    cache_ttl = get_plugin_setting(CREDENTIAL_CACHE_TTL_SETTING, 0)
+    if cache_ttl > 0:
+        backend = CredentialCacheStorage(
+            backend,
+            get_cache_dir() / CACHE_FILE_NAME,
+            ttl=cache_ttl,
+            get_key=keyring_storage.get_cache_key,
+        )
+
+    miss_ttl = get_plugin_setting(CREDENTIAL_MISS_TTL_SETTING, DEFAULT_CREDENTIAL_MISS_TTL)
+    if miss_ttl > 0:
+        backend = MissCacheStorage(backend, get_cache_dir() / MISS_CACHE_FILE_NAME, ttl=miss_ttl)
+
+    return backend
+
+
+def get_credential_storage() -> Storage:
+    """
+    Return the storage conda-auth reads credentials from.
+
+    When the ``auth_credential_env_prefix`` or ``auth_credential_secrets_dir`` settings are
+    set, credentials found in the environment are used before the storage backend, which is
+    then only resolved for the remaining targets.
+    """
+    prefix = get_plugin_setting(CREDENTIAL_ENV_PREFIX_SETTING, None)
+    directory = get_plugin_setting(CREDENTIAL_SECRETS_DIR_SETTING, None)
+    if not prefix and not directory:
+        return get_storage_backend()
+
+    return EnvironmentStorage(
+        LazyStorage(),
+        prefix=prefix or None,
+        directory=Path(directory).expanduser() if directory else None,
+    )
 
 
 class LazyStorage(Storage):
@@ -35,24 +230,58 @@ class LazyStorage(Storage):
     Resolve credential storage only when credentials are accessed.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, get_backend: Callable[[], Storage] | None = None) -> None:
         self._storage: Storage | None = None
+        self._get_backend = get_backend or get_storage_backend
 
     @property
     def backend(self) -> Storage:
         if self._storage is None:
-            self._storage = get_storage_backend()
+            self._storage = self._get_backend()
 
         return self._storage
 
+    def iter_backends(self) -> Iterator[Storage]:
+        yield self
+        yield from self.backend.iter_backends()
+
     def set_credential(self, record: CredentialRecord) -> None:
-        return self.backend.set_credential(record)
+        return self._call_backend(lambda backend: backend.set_credential(record))
 
     def get_credential(self, target: str) -> CredentialRecord | None:
-        return self.backend.get_credential(target)
+        return self._call_backend(lambda backend: backend.get_credential(target))
 
     def delete_credential(self, target: str) -> None:
-        return self.backend.delete_credential(target)
+        return self._call_backend(lambda backend: backend.delete_credential(target))
+
+    def get_credentials(self, targets: Iterable[str]) -> dict[str, CredentialRecord | None]:
+        targets = list(targets)
+        return self._call_backend(lambda backend: backend.get_credentials(targets))
+
+    def set_credentials(self, records: Iterable[CredentialRecord]) -> None:
+        records = list(records)
+        return self._call_backend(lambda backend: backend.set_credentials(records))
+
+    def delete_credentials(self, targets: Iterable[str]) -> None:
+        targets = list(targets)
+        return self._call_backend(lambda backend: backend.delete_credentials(targets))
+
+    def iter_credentials(self) -> Iterator[CredentialRecord]:
+        return iter(self._call_backend(lambda backend: list(backend.iter_credentials())))
+
+    def _call_backend(self, call: Callable[[Storage], T]) -> T:
+        """
+        Run ``call`` against the backend, probing again if the recorded backend went away.
+        """
+        try:
+            return call(self.backend)
+        except Exception as exc:
+            if not is_no_keyring_error(exc):
+                raise
+
+            clear_backend_state(get_backend_state_path())
+            self._storage = None
+            return call(self.backend)
 
 
-storage = LazyStorage()
+storage = LazyStorage(get_credential_storage)
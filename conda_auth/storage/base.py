@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from typing import TypeVar
 
 from ..credentials import CredentialRecord
 
+S = TypeVar("S", bound="Storage")
+
 
 class Storage(ABC):
     """ABC class for all credential storage backends"""
@@ -25,3 +29,56 @@ class Storage(ABC):
         """
         Delete a structured credential record for a target.
         """
+
+    def get_credentials(self, targets: Iterable[str]) -> dict[str, CredentialRecord | None]:
+        """
+        Return the structured credential records for several targets, keyed by target.
+
+        Backends that can read several records at once should override this.
+        """
+        return {target: self.get_credential(target) for target in targets}
+
+    def set_credentials(self, records: Iterable[CredentialRecord]) -> None:
+        """
+        Store several structured credential records.
+
+        Backends that can write several records at once should override this.
+        """
+        for record in records:
+            self.set_credential(record)
+
+    def delete_credentials(self, targets: Iterable[str]) -> None:
+        """
+        Delete the structured credential records for several targets.
+
+        Backends that can delete several records at once should override this.
+        """
+        for target in targets:
+            self.delete_credential(target)
+
+    def iter_credentials(self) -> Iterator[CredentialRecord]:
+        """
+        Yield every structured credential record in this storage.
+
+        Backends that cannot list their records raise ``NotImplementedError``.
+        """
+        raise NotImplementedError(f"{type(self).__name__} cannot list stored credentials")
+
+    def iter_backends(self) -> Iterator[Storage]:
+        """
+        Yield this storage and every storage it wraps.
+        """
+        yield self
+
+
+def find_backend(storage: object, backend_type: type[S]) -> S | None:
+    """
+    Return the first storage of ``backend_type`` in a chain of wrapped storages.
+    """
+    if not isinstance(storage, Storage):
+        return None
+
+    return next(
+        (backend for backend in storage.iter_backends() if isinstance(backend, backend_type)),
+        None,
+    )
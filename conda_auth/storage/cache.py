@@ -0,0 +1,305 @@
+"""
+Encrypted on-disk credential cache that sits in front of another storage backend
+"""
+
+from __future__ import annotations
+
+import hmac
+import json
+import os
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import suppress
+from hashlib import sha256
+from json import JSONDecodeError
+from logging import getLogger
+from pathlib import Path
+from typing import Any
+
+from ..credentials import CredentialRecord
+from .base import Storage
+from .files import FileLockError, file_lock, read_private_file, write_private_file
+
+log = getLogger(__name__)
+
+CACHE_FILE_NAME = "credentials.cache"
+
+CACHE_FORMAT_MAGIC = b"CAC1"
+
+CACHE_FORMAT_VERSION = 1
+
+NONCE_SIZE = 16
+
+DIGEST_SIZE = sha256().digest_size
+
+
+def _derive_key(key: bytes, purpose: bytes) -> bytes:
+    return hmac.new(key, purpose, sha256).digest()
+
+
+def _keystream(key: bytes, nonce: bytes, length: int) -> bytes:
+    blocks = (
+        hmac.new(key, nonce + counter.to_bytes(8, "big"), sha256).digest()
+        for counter in range((length + DIGEST_SIZE - 1) // DIGEST_SIZE)
+    )
+    return b"".join(blocks)[:length]
+
+
+def _xor(data: bytes, stream: bytes) -> bytes:
+    return (int.from_bytes(data, "big") ^ int.from_bytes(stream, "big")).to_bytes(len(data), "big")
+
+
+def encrypt_payload(key: bytes, plaintext: bytes) -> bytes:
+    """
+    Encrypt and authenticate ``plaintext`` with ``key``.
+
+    Uses HMAC-SHA256 in counter mode as the keystream and HMAC-SHA256 over the ciphertext
+    as the authentication tag, so no third party cryptography package is required.
+    """
+    nonce = os.urandom(NONCE_SIZE)
+    ciphertext = _xor(plaintext, _keystream(_derive_key(key, b"encrypt"), nonce, len(plaintext)))
+    tag = hmac.new(
+        _derive_key(key, b"authenticate"), CACHE_FORMAT_MAGIC + nonce + ciphertext, sha256
+    ).digest()
+    return CACHE_FORMAT_MAGIC + nonce + ciphertext + tag
+
+
+def decrypt_payload(key: bytes, payload: bytes) -> bytes | None:
+    """
+    Return the plaintext for a payload created by ``encrypt_payload``.
+
+    Returns ``None`` when the payload is malformed, was tampered with or was encrypted
+    with a different key.
+    """
+    header_size = len(CACHE_FORMAT_MAGIC) + NONCE_SIZE
+    if len(payload) < header_size + DIGEST_SIZE or not payload.startswith(CACHE_FORMAT_MAGIC):
+        return None
+
+    nonce = payload[len(CACHE_FORMAT_MAGIC) : header_size]
+    ciphertext = payload[header_size:-DIGEST_SIZE]
+    expected_tag = hmac.new(
+        _derive_key(key, b"authenticate"), CACHE_FORMAT_MAGIC + nonce + ciphertext, sha256
+    ).digest()
+    if not hmac.compare_digest(payload[-DIGEST_SIZE:], expected_tag):
+        return None
+
+    return _xor(ciphertext, _keystream(_derive_key(key, b"encrypt"), nonce, len(ciphertext)))
+
+
+class CredentialCacheStorage(Storage):
+    """
+    Storage implementation that keeps an encrypted local copy of records read from
+    another backend.
+
+    Cached records are keyed by target and expire after ``ttl`` seconds or at the
+    record's own ``expires_at``, whichever comes first. Writes and deletes go through to
+    the wrapped backend before the cache file is updated.
+    """
+
+    def __init__(
+        self,
+        backend: Storage,
+        path: Path,
+        *,
+        ttl: int,
+        get_key: Callable[[], bytes],
+    ) -> None:
+        self.backend = backend
+        self.path = Path(path)
+        self.ttl = ttl
+        self._get_key = get_key
+        self._key: bytes | None = None
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._entries_stamp: tuple[int, int] | None = None
+
+    def iter_backends(self) -> Iterator[Storage]:
+        yield self
+        yield from self.backend.iter_backends()
+
+    def set_credential(self, record: CredentialRecord) -> None:
+        self.backend.set_credential(record)
+        self._update_entry(record.target, record)
+
+    def get_credential(self, target: str) -> CredentialRecord | None:
+        entry = self._read_entries().get(target)
+        if entry is not None and entry["expires"] > time.time():
+            return CredentialRecord.from_dict(entry["record"])
+
+        record = self.backend.get_credential(target)
+        if record is not None or entry is not None:
+            self._update_entry(target, record)
+
+        return record
+
+    def get_credentials(self, targets: Iterable[str]) -> dict[str, CredentialRecord | None]:
+        """
+        Serve cached records and read all the others from the wrapped backend in one batch.
+        """
+        now = time.time()
+        entries = self._read_entries()
+        records: dict[str, CredentialRecord | None] = {}
+        missing = []
+        for target in dict.fromkeys(targets):
+            entry = entries.get(target)
+            if entry is not None and entry["expires"] > now:
+                records[target] = CredentialRecord.from_dict(entry["record"])
+            else:
+                records[target] = None
+                missing.append(target)
+
+        if missing:
+            fetched = self.backend.get_credentials(missing)
+            records.update(fetched)
+            self._update_entries(
+                {
+                    target: record
+                    for target, record in fetched.items()
+                    if record is not None or target in entries
+                }
+            )
+
+        return records
+
+    def set_credentials(self, records: Iterable[CredentialRecord]) -> None:
+        records = list(records)
+        try:
+            self.backend.set_credentials(records)
+        except BaseException:
+            # Some of the records may have been written, so none of them can be served
+            self._update_entries(dict.fromkeys(record.target for record in records))
+            raise
+
+        self._update_entries({record.target: record for record in records})
+
+    def iter_credentials(self) -> Iterator[CredentialRecord]:
+        return self.backend.iter_credentials()
+
+    def delete_credential(self, target: str) -> None:
+        self.backend.delete_credential(target)
+        self._update_entry(target, None)
+
+    def delete_credentials(self, targets: Iterable[str]) -> None:
+        targets = list(targets)
+        try:
+            self.backend.delete_credentials(targets)
+        finally:
+            self._update_entries(dict.fromkeys(targets))
+
+    def clear(self) -> None:
+        """
+        Remove the cache file.
+        """
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        self._entries = {}
+        self._entries_stamp = None
+
+    def get_lock_path(self) -> Path:
+        """
+        Return the lock file that coordinates updates of the cache file.
+        """
+        return self.path.with_name(f".{self.path.name}.lock")
+
+    @property
+    def key(self) -> bytes:
+        if self._key is None:
+            self._key = self._get_key()
+
+        return self._key
+
+    def _read_entries(self) -> dict[str, dict[str, Any]]:
+        """
+        Return the cache entries, re-reading the cache file only when it changed on disk.
+        """
+        try:
+            stat = self.path.stat()
+        except OSError:
+            self._entries = {}
+            self._entries_stamp = None
+            return self._entries
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._entries_stamp:
+            return self._entries
+
+        self._entries = self._decode_entries(read_private_file(self.path))
+        self._entries_stamp = stamp
+        return self._entries
+
+    def _decode_entries(self, payload: bytes | None) -> dict[str, dict[str, Any]]:
+        if payload is None:
+            return {}
+
+        plaintext = decrypt_payload(self.key, payload)
+        if plaintext is None:
+            return {}
+
+        try:
+            data = json.loads(plaintext)
+        except (JSONDecodeError, UnicodeDecodeError):
+            return {}
+
+        if not isinstance(data, dict) or data.get("version") != CACHE_FORMAT_VERSION:
+            return {}
+
+        entries = data.get("entries")
+        if not isinstance(entries, dict):
+            return {}
+
+        return {
+            target: entry
+            for target, entry in entries.items()
+            if isinstance(entry, dict)
+            and isinstance(entry.get("expires"), (int, float))
+            and isinstance(entry.get("record"), dict)
+        }
+
+    def _update_entry(self, target: str, record: CredentialRecord | None) -> None:
+        self._update_entries({target: record})
+
+    def _update_entries(self, records: dict[str, CredentialRecord | None]) -> None:
+        """
+        Replace the cache entries for ``records`` in a single write, dropping ``None`` ones.
+        """
+        if not records:
+            return
+
+        try:
+            with file_lock(self.get_lock_path()):
+                # Another process may have written the file since it was last read
+                self._entries_stamp = None
+                now = time.time()
+                entries = {
+                    key: entry
+                    for key, entry in self._read_entries().items()
+                    if key not in records and entry["expires"] > now
+                }
+                for target, record in records.items():
+                    if record is None:
+                        continue
+                    expires = now + self.ttl
+                    if record.expires_at is not None:
+                        expires = min(expires, record.expires_at)
+                    entries[target] = {"expires": expires, "record": record.to_dict()}
+
+                plaintext = json.dumps(
+                    {"version": CACHE_FORMAT_VERSION, "entries": entries}
+                ).encode()
+                try:
+                    write_private_file(self.path, encrypt_payload(self.key, plaintext))
+                except OSError as exc:
+                    log.debug("Unable to write credential cache %s: %s", self.path, exc)
+                    return
+
+                stat = self.path.stat()
+                self._entries = entries
+                self._entries_stamp = (stat.st_mtime_ns, stat.st_size)
+        except FileLockError as exc:
+            # Without the lock, dropping the cache is the only change that cannot go stale
+            log.debug("Unable to update credential cache %s: %s", self.path, exc)
+            self._entries = {}
+            self._entries_stamp = None
+            with suppress(OSError):
+                self.path.unlink()
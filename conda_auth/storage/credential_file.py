@@ -0,0 +1,171 @@
+"""
+Credential storage in a single file only the current user can access, for hosts without a
+usable keyring
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Callable, Iterable, Iterator
+from json import JSONDecodeError
+from pathlib import Path
+
+from ..credentials import CredentialRecord
+from ..exceptions import CondaAuthError
+from .base import Storage
+from .files import FileLockError, file_lock, write_private_file
+
+CREDENTIAL_FILE_NAME = "credentials.json"
+
+CREDENTIAL_FILE_VERSION = 1
+
+
+def check_private_file(path: Path, stat: os.stat_result) -> None:
+    """
+    Refuse a credential file that other users could read or replace.
+    """
+    if os.name == "nt":
+        return
+
+    if stat.st_uid != os.getuid() or stat.st_mode & 0o077:
+        raise CondaAuthError(
+            f"Refusing to read credentials from {path}, because it can be accessed by other"
+            f" users. Make it private with 'chmod 600 {path}'."
+        )
+
+
+class FileStorage(Storage):
+    """
+    Storage implementation keeping every credential record in one private JSON file.
+
+    The file is read in one go whenever it changed on disk, and its records are indexed by
+    target in memory. Changes are written to a new file that replaces the old one, while
+    holding a lock shared by all conda processes, so concurrent updates are not lost.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._records: dict[str, CredentialRecord] = {}
+        self._records_stamp: tuple[int, int, int] | None = None
+
+    def set_credential(self, record: CredentialRecord) -> None:
+        self.set_credentials((record,))
+
+    def get_credential(self, target: str) -> CredentialRecord | None:
+        return self._read_records().get(target)
+
+    def delete_credential(self, target: str) -> None:
+        self.delete_credentials((target,))
+
+    def get_credentials(self, targets: Iterable[str]) -> dict[str, CredentialRecord | None]:
+        records = self._read_records()
+        return {target: records.get(target) for target in targets}
+
+    def set_credentials(self, records: Iterable[CredentialRecord]) -> None:
+        updates = {record.target: record for record in records}
+        if updates:
+            self._update_records(lambda records: records.update(updates))
+
+    def delete_credentials(self, targets: Iterable[str]) -> None:
+        targets = set(targets)
+
+        def delete(records: dict[str, CredentialRecord]) -> None:
+            for target in targets.intersection(records):
+                del records[target]
+
+        if targets.intersection(self._read_records()):
+            self._update_records(delete)
+
+    def iter_credentials(self) -> Iterator[CredentialRecord]:
+        return iter(list(self._read_records().values()))
+
+    def get_lock_path(self) -> Path:
+        """
+        Return the lock file that coordinates updates of the credential file.
+        """
+        return self.path.with_name(f".{self.path.name}.lock")
+
+    def _read_records(self) -> dict[str, CredentialRecord]:
+        """
+        Return the stored records by target, reading the file only when it changed on disk.
+        """
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            self._records = {}
+            self._records_stamp = None
+            return self._records
+        except OSError as exc:
+            raise CondaAuthError(f"Unable to read credentials from {self.path}: {exc}")
+
+        # Every write replaces the file, so a new inode also means new contents
+        stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        if stamp == self._records_stamp:
+            return self._records
+
+        check_private_file(self.path, stat)
+        try:
+            payload = self.path.read_bytes()
+        except OSError as exc:
+            raise CondaAuthError(f"Unable to read credentials from {self.path}: {exc}")
+
+        self._records = self._decode_records(payload)
+        self._records_stamp = stamp
+        return self._records
+
+    def _decode_records(self, payload: bytes) -> dict[str, CredentialRecord]:
+        try:
+            data = json.loads(payload)
+        except (JSONDecodeError, UnicodeDecodeError) as exc:
+            raise CondaAuthError(f"Unable to read credentials from {self.path}: {exc}")
+
+        if not isinstance(data, dict) or not isinstance(data.get("credentials"), list):
+            raise CondaAuthError(f"Credential file {self.path} is invalid")
+
+        version = data.get("version")
+        if version != CREDENTIAL_FILE_VERSION:
+            raise CondaAuthError(
+                f"Credential file {self.path} has unsupported version {version!r}"
+            )
+
+        records = {}
+        for item in data["credentials"]:
+            if not isinstance(item, dict):
+                raise CondaAuthError(f"Credential file {self.path} is invalid")
+            try:
+                record = CredentialRecord.from_dict(item)
+            except KeyError as exc:
+                raise CondaAuthError(
+                    f"Credential file {self.path} has a record without {exc.args[0]!r}"
+                )
+            records[record.target] = record
+
+        return records
+
+    def _update_records(self, change: Callable[[dict[str, CredentialRecord]], None]) -> None:
+        """
+        Apply ``change`` to the records on disk and write them back.
+        """
+        try:
+            with file_lock(self.get_lock_path()):
+                # Another process may have written the file since it was last read
+                self._records_stamp = None
+                records = dict(self._read_records())
+                change(records)
+                payload = json.dumps(
+                    {
+                        "version": CREDENTIAL_FILE_VERSION,
+                        "credentials": [record.to_dict() for record in records.values()],
+                    }
+                ).encode()
+                try:
+                    write_private_file(self.path, payload)
+                    stat = self.path.stat()
+                except OSError as exc:
+                    raise CondaAuthError(f"Unable to write credentials to {self.path}: {exc}")
+        except FileLockError as exc:
+            raise CondaAuthError(f"Unable to write credentials to {self.path}: {exc}")
+
+        self._records = records
+        self._records_stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
@@ -0,0 +1,143 @@
+"""
+Compact encoding of credential records for storage backends that limit or charge for the
+size of a secret, such as most keyrings
+
+A payload is ``COMPACT_PAYLOAD_PREFIX``, the format version and the set fields of the
+record. Each field is a one character tag, the length of its value in characters, a colon
+and the value itself, e.g. ``~1a5:tokenk6:secret``. ``expires_at`` is written in decimal
+and every scope is a field of its own.
+
+Keyrings store text, so the layout is text as well: binary data would have to be wrapped
+in base64, making long tokens a third larger than they are. JSON payloads written by
+earlier versions never start with ``COMPACT_PAYLOAD_PREFIX``.
+"""
+
+from __future__ import annotations
+
+from ..credentials import CredentialRecord
+
+COMPACT_PAYLOAD_PREFIX = "~"
+COMPACT_FORMAT_VERSION = "1"
+
+# Tags are part of the format: new fields get new tags, existing tags are never reused
+FIELD_TAGS = {
+    "target": "t",
+    "auth_type": "a",
+    "username": "u",
+    "password": "p",
+    "token": "k",
+    "token_header": "h",
+    "token_template": "f",
+    "access_token": "A",
+    "refresh_token": "R",
+    "expires_at": "e",
+    "token_endpoint": "E",
+    "revocation_endpoint": "V",
+    "client_id": "c",
+    "issuer_url": "i",
+    "scopes": "s",
+}
+
+FIELDS_BY_TAG = {tag: name for name, tag in FIELD_TAGS.items()}
+
+STRING_FIELDS = tuple(name for name in FIELD_TAGS if name not in ("expires_at", "scopes"))
+
+HEADER = COMPACT_PAYLOAD_PREFIX + COMPACT_FORMAT_VERSION
+
+
+def is_compact_payload(payload: str) -> bool:
+    return payload.startswith(COMPACT_PAYLOAD_PREFIX)
+
+
+def encode_record(record: CredentialRecord, *, include_target: bool = True) -> str:
+    """
+    Return the compact form of ``record``.
+
+    Backends that store the target in the key of the secret pass ``include_target=False``
+    and give it back to ``decode_record``.
+    """
+    parts = [HEADER]
+
+    for name in STRING_FIELDS:
+        value = getattr(record, name)
+        if value is not None and (include_target or name != "target"):
+            parts.append(f"{FIELD_TAGS[name]}{len(value)}:{value}")
+
+    if record.expires_at is not None:
+        value = str(record.expires_at)
+        parts.append(f"{FIELD_TAGS['expires_at']}{len(value)}:{value}")
+
+    tag = FIELD_TAGS["scopes"]
+    parts.extend(f"{tag}{len(scope)}:{scope}" for scope in record.scopes)
+
+    return "".join(parts)
+
+
+def decode_record(payload: str, target: str | None = None) -> CredentialRecord:
+    """
+    Read a record written by ``encode_record``.
+
+    ``target`` is used when the record was encoded without one. Raises ``ValueError``
+    for payloads that are truncated or were written by a newer format version. The
+    messages never include the payload, which holds secrets.
+    """
+    if not payload.startswith(HEADER):
+        raise ValueError("unsupported compact record version")
+
+    fields: dict[str, str] = {}
+    expires_at: int | None = None
+    scopes: list[str] = []
+    size = len(payload)
+    position = len(HEADER)
+
+    while position < size:
+        tag = payload[position]
+        separator = payload.find(":", position + 1)
+        length = payload[position + 1 : separator]
+        if separator < 0 or not length.isdecimal():
+            raise ValueError("truncated compact record")
+
+        start = separator + 1
+        position = start + int(length)
+        if position > size:
+            raise ValueError("truncated compact record")
+
+        name = FIELDS_BY_TAG.get(tag)
+        if name is None:
+            raise ValueError(f"unknown compact record field tag {tag!r}")
+
+        value = payload[start:position]
+        if name == "scopes":
+            scopes.append(value)
+        elif name == "expires_at":
+            if not value.lstrip("-").isdecimal():
+                raise ValueError("invalid expiration time in compact record")
+            expires_at = int(value)
+        else:
+            fields[name] = value
+
+    target = fields.get("target", target)
+    if target is None:
+        raise ValueError("compact record has no target")
+    auth_type = fields.get("auth_type")
+    if auth_type is None:
+        raise ValueError("compact record has no auth type")
+
+    get = fields.get
+    return CredentialRecord(
+        target=target,
+        auth_type=auth_type,
+        username=get("username"),
+        password=get("password"),
+        token=get("token"),
+        token_header=get("token_header"),
+        token_template=get("token_template"),
+        access_token=get("access_token"),
+        refresh_token=get("refresh_token"),
+        expires_at=expires_at,
+        token_endpoint=get("token_endpoint"),
+        revocation_endpoint=get("revocation_endpoint"),
+        client_id=get("client_id"),
+        issuer_url=get("issuer_url"),
+        scopes=tuple(scopes),
+    )
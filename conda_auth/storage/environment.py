@@ -0,0 +1,149 @@
+"""
+Read-only credentials provided through environment variables or a directory of secret
+files, e.g. by a CI system or a Kubernetes secret mount
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from collections.abc import Iterable, Iterator, Mapping
+from json import JSONDecodeError
+from pathlib import Path
+
+from ..constants import TOKEN_NAME
+from ..credentials import CredentialRecord
+from ..exceptions import CondaAuthError
+from .base import Storage
+from .files import read_private_file
+
+SECRET_NAME_SEPARATOR = re.compile(r"[^A-Za-z0-9]+")
+
+
+def get_secret_name(target: str) -> str:
+    """
+    Return the name a credential for ``target`` is looked up by, e.g.
+    ``HTTPS_REPO_EXAMPLE_COM_PRIVATE`` for ``https://repo.example.com/private``.
+    """
+    return SECRET_NAME_SEPARATOR.sub("_", target).strip("_").upper()
+
+
+def parse_secret(target: str, value: str, source: str) -> CredentialRecord:
+    """
+    Turn a secret value into a credential record for ``target``.
+
+    A JSON object is read like a stored credential record; anything else is a token.
+    """
+    value = value.strip()
+    if not value.startswith("{"):
+        return CredentialRecord(target=target, auth_type=TOKEN_NAME, token=value)
+
+    try:
+        data = json.loads(value)
+    except JSONDecodeError as exc:
+        # The message of the exception does not include the secret itself
+        raise CondaAuthError(f"Unable to read credential from {source}: {exc.msg}")
+
+    if not isinstance(data, dict) or not isinstance(data.get("auth_type"), str):
+        raise CondaAuthError(f"Credential in {source} must be a JSON object with an 'auth_type'")
+
+    return CredentialRecord.from_dict({**data, "target": target})
+
+
+class EnvironmentStorage(Storage):
+    """
+    Storage implementation resolving credentials from environment variables and secret
+    files before asking another backend.
+
+    The credential for a target is read from the ``prefix`` environment variable or the
+    file in ``directory`` named after ``get_secret_name(target)``, in that order. These
+    sources are never written to: storing and deleting credentials goes to ``backend``.
+    """
+
+    def __init__(
+        self,
+        backend: Storage | None = None,
+        *,
+        prefix: str | None = None,
+        directory: Path | None = None,
+        environ: Mapping[str, str] | None = None,
+    ) -> None:
+        self.backend = backend
+        self.prefix = prefix
+        self.directory = None if directory is None else Path(directory)
+        self.environ = os.environ if environ is None else environ
+
+    def iter_backends(self) -> Iterator[Storage]:
+        yield self
+        if self.backend is not None:
+            yield from self.backend.iter_backends()
+
+    def get_credential(self, target: str) -> CredentialRecord | None:
+        record = self.get_environment_credential(target)
+        if record is None and self.backend is not None:
+            return self.backend.get_credential(target)
+
+        return record
+
+    def get_credentials(self, targets: Iterable[str]) -> dict[str, CredentialRecord | None]:
+        records = {target: self.get_environment_credential(target) for target in targets}
+        lookups = [target for target, record in records.items() if record is None]
+        if lookups and self.backend is not None:
+            records.update(self.backend.get_credentials(lookups))
+
+        return records
+
+    def set_credential(self, record: CredentialRecord) -> None:
+        self._get_writable_backend().set_credential(record)
+
+    def set_credentials(self, records: Iterable[CredentialRecord]) -> None:
+        self._get_writable_backend().set_credentials(records)
+
+    def delete_credential(self, target: str) -> None:
+        self._get_writable_backend().delete_credential(target)
+
+    def delete_credentials(self, targets: Iterable[str]) -> None:
+        self._get_writable_backend().delete_credentials(targets)
+
+    def iter_credentials(self) -> Iterator[CredentialRecord]:
+        # Secret names cannot be turned back into targets, so only the backend is listed
+        if self.backend is None:
+            return super().iter_credentials()
+
+        return self.backend.iter_credentials()
+
+    def get_environment_credential(self, target: str) -> CredentialRecord | None:
+        """
+        Return the credential for ``target`` from the environment, if it provides one.
+        """
+        name = get_secret_name(target)
+        if not name:
+            return None
+
+        if self.prefix is not None:
+            variable = f"{self.prefix}{name}"
+            value = self.environ.get(variable)
+            if value:
+                return parse_secret(target, value, f"environment variable {variable}")
+
+        if self.directory is not None:
+            path = self.directory / name
+            payload = read_private_file(path)
+            if payload:
+                try:
+                    value = payload.decode()
+                except UnicodeDecodeError:
+                    raise CondaAuthError(f"Unable to read credential from {path}: not UTF-8")
+                return parse_secret(target, value, str(path))
+
+        return None
+
+    def _get_writable_backend(self) -> Storage:
+        if self.backend is None:
+            raise CondaAuthError(
+                "Credentials provided through environment variables or secret files cannot be"
+                " changed"
+            )
+
+        return self.backend
@@ -0,0 +1,163 @@
+"""
+Helpers for the private files kept by the storage backends
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+from collections.abc import Generator
+from contextlib import contextmanager, suppress
+from hashlib import sha256
+from logging import getLogger
+from pathlib import Path
+from typing import BinaryIO
+
+from platformdirs import user_cache_dir, user_data_dir
+
+from ..constants import PLUGIN_NAME
+
+log = getLogger(__name__)
+
+LOCK_DIR_NAME = "locks"
+
+FILE_LOCK_TIMEOUT: float = 60
+"""
+Seconds to wait for another process to release a lock file, e.g. during a token refresh
+"""
+
+FILE_LOCK_MAX_POLL_INTERVAL: float = 0.05
+"""
+Longest pause between two attempts to take a lock file held by another process
+"""
+
+
+class FileLockError(OSError):
+    """
+    Raised when a lock file cannot be created or is held by another process for too long.
+    """
+
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def try_lock_file(lock_file: BinaryIO) -> bool:
+        lock_file.seek(0)
+        try:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    def unlock_file(lock_file: BinaryIO) -> None:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def try_lock_file(lock_file: BinaryIO) -> bool:
+        try:
+            fcntl.lockf(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except (BlockingIOError, PermissionError):
+            return False
+        return True
+
+    def unlock_file(lock_file: BinaryIO) -> None:
+        fcntl.lockf(lock_file, fcntl.LOCK_UN)
+
+
+def get_cache_dir() -> Path:
+    """
+    Return the per-user directory for conda-auth cache files.
+    """
+    return Path(user_cache_dir(PLUGIN_NAME, appauthor=False))
+
+
+def get_data_dir() -> Path:
+    """
+    Return the per-user directory for conda-auth files that must not be thrown away.
+    """
+    return Path(user_data_dir(PLUGIN_NAME, appauthor=False))
+
+
+def read_private_file(path: Path) -> bytes | None:
+    """
+    Return the contents of a private file, or ``None`` when it cannot be read.
+    """
+    try:
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def write_private_file(path: Path, data: bytes) -> None:
+    """
+    Atomically replace ``path`` with ``data``, readable only by the current user.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # mkstemp creates the file with 0600 permissions
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(temp_path)
+        raise
+
+
+def get_credential_lock_path(target: str) -> Path:
+    """
+    Return the lock file that coordinates updates of ``target`` between processes.
+    """
+    return get_cache_dir() / LOCK_DIR_NAME / f"{sha256(target.encode()).hexdigest()}.lock"
+
+
+@contextmanager
+def credential_lock(target: str) -> Generator[None, None, None]:
+    """
+    Hold an exclusive lock on ``target`` across conda processes.
+    """
+    with file_lock(get_credential_lock_path(target)):
+        yield
+
+
+@contextmanager
+def file_lock(path: Path, *, timeout: float = FILE_LOCK_TIMEOUT) -> Generator[None, None, None]:
+    """
+    Hold an exclusive lock on the lock file at ``path`` across conda processes.
+
+    Waits up to ``timeout`` seconds for other processes to release the lock. The body never
+    runs without the lock: ``FileLockError`` is raised instead when the lock file cannot be
+    created or the wait times out.
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(path, "a+b")
+    except OSError as exc:
+        raise FileLockError(f"Unable to create lock file {path}: {exc}") from exc
+
+    with lock_file:
+        deadline = time.monotonic() + timeout
+        interval = 0.001
+        try:
+            while not try_lock_file(lock_file):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise FileLockError(f"Timed out after {timeout:g}s waiting for lock {path}")
+                # Start with short pauses, the lock is usually only held for a file write
+                time.sleep(min(interval, remaining))
+                interval = min(interval * 2, FILE_LOCK_MAX_POLL_INTERVAL)
+        except FileLockError:
+            raise
+        except OSError as exc:
+            raise FileLockError(f"Unable to lock {path}: {exc}") from exc
+
+        try:
+            yield
+        finally:
+            unlock_file(lock_file)
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
 import json
+import secrets
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256
 from json import JSONDecodeError
 
 import keyring
@@ -12,21 +16,36 @@ from ..credentials import (
 )
 from ..exceptions import CondaAuthError
 from .base import Storage
+from .encoding import decode_record, encode_record, is_compact_payload
 
 KEYRING_CREDENTIAL_SERVICE_PREFIX = f"{PLUGIN_NAME}::credential"
 KEYRING_CREDENTIAL_USERNAME = "credential"
+KEYRING_CACHE_KEY_SERVICE = f"{PLUGIN_NAME}::cache-key"
+KEYRING_MAX_PARALLEL_LOOKUPS = 8
 
 
 class KeyringStorage(Storage):
     """
     Storage implementation for keyring library
+
+    Records are stored as JSON, which every release can read. With ``compact`` they are
+    stored in the shorter compact encoding without their target, which is already part of
+    the service name. Both formats are read either way.
     """
 
+    def __init__(self, *, compact: bool = False) -> None:
+        self.compact = compact
+
     def set_credential(self, record: CredentialRecord) -> None:
+        if self.compact:
+            payload = encode_record(record, include_target=False)
+        else:
+            payload = json.dumps(record.to_dict())
+
         keyring.set_password(
             f"{KEYRING_CREDENTIAL_SERVICE_PREFIX}::{record.target}",
             KEYRING_CREDENTIAL_USERNAME,
-            json.dumps(record.to_dict()),
+            payload,
         )
 
     def get_credential(self, target: str) -> CredentialRecord | None:
@@ -37,6 +56,12 @@ class KeyringStorage(Storage):
         if payload is None:
             return None
 
+        if is_compact_payload(payload):
+            try:
+                return decode_record(payload, target)
+            except ValueError as exc:
+                raise CondaAuthError(f"Unable to read stored credential for {target!r}: {exc}")
+
         try:
             data = json.loads(payload)
         except (JSONDecodeError, TypeError) as exc:
@@ -47,6 +72,20 @@ class KeyringStorage(Storage):
 
         return CredentialRecord.from_dict(data)
 
+    def get_credentials(self, targets: Iterable[str]) -> dict[str, CredentialRecord | None]:
+        """
+        Look up several records in parallel; each keyring lookup is a separate round trip.
+        """
+        targets = list(dict.fromkeys(targets))
+        if len(targets) < 2:
+            return super().get_credentials(targets)
+
+        with ThreadPoolExecutor(
+            max_workers=min(len(targets), KEYRING_MAX_PARALLEL_LOOKUPS),
+            thread_name_prefix=PLUGIN_NAME,
+        ) as executor:
+            return dict(zip(targets, executor.map(self.get_credential, targets)))
+
     def delete_credential(self, target: str) -> None:
         try:
             keyring.delete_password(
@@ -56,6 +95,17 @@ class KeyringStorage(Storage):
         except PasswordDeleteError:
             pass
 
+    def get_cache_key(self) -> bytes:
+        """
+        Return the key protecting the local credential cache, creating it on first use.
+        """
+        payload = keyring.get_password(KEYRING_CACHE_KEY_SERVICE, KEYRING_CREDENTIAL_USERNAME)
+        if payload is None:
+            payload = secrets.token_urlsafe(32)
+            keyring.set_password(KEYRING_CACHE_KEY_SERVICE, KEYRING_CREDENTIAL_USERNAME, payload)
+
+        return sha256(payload.encode()).digest()
+
     def legacy_service_name(self, auth_type: str, target: str) -> str:
         """
         Return the keyring service name used before structured records.
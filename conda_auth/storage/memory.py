@@ -0,0 +1,63 @@
+"""
+Credential storage kept in the memory of the current process
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable, Iterator
+
+from ..credentials import CredentialRecord
+from .base import Storage
+
+
+class MemoryStorage(Storage):
+    """
+    Storage implementation keeping credential records in a dict.
+
+    Records are forgotten after ``ttl`` seconds when it is set, so a long-running process
+    eventually sees credentials changed by other processes.
+    """
+
+    def __init__(self, *, ttl: float | None = None) -> None:
+        self.ttl = ttl
+        self._records: dict[str, tuple[CredentialRecord, float | None]] = {}
+
+    def set_credential(self, record: CredentialRecord) -> None:
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        self._records[record.target] = (record, expires)
+
+    def get_credential(self, target: str) -> CredentialRecord | None:
+        entry = self._records.get(target)
+        if entry is None:
+            return None
+
+        record, expires = entry
+        if expires is not None and expires <= time.monotonic():
+            self._records.pop(target, None)
+            return None
+
+        return record
+
+    def delete_credential(self, target: str) -> None:
+        self._records.pop(target, None)
+
+    def set_credentials(self, records: Iterable[CredentialRecord]) -> None:
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        self._records.update((record.target, (record, expires)) for record in records)
+
+    def iter_credentials(self) -> Iterator[CredentialRecord]:
+        now = time.monotonic()
+        return iter(
+            [
+                record
+                for record, expires in self._records.values()
+                if expires is None or expires > now
+            ]
+        )
+
+    def clear(self) -> None:
+        """
+        Forget all records.
+        """
+        self._records.clear()
@@ -0,0 +1,199 @@
+"""
+Short-lived record of targets without a stored credential, kept in front of another backend
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import suppress
+from hashlib import sha256
+from json import JSONDecodeError
+from logging import getLogger
+from pathlib import Path
+
+from ..credentials import CredentialRecord
+from .base import Storage
+from .files import FileLockError, file_lock, read_private_file, write_private_file
+
+log = getLogger(__name__)
+
+MISS_CACHE_FILE_NAME = "misses.json"
+
+
+def _miss_key(target: str) -> str:
+    # Only hashes are written to disk, so the file does not list channel names
+    return sha256(target.encode()).hexdigest()
+
+
+class MissCacheStorage(Storage):
+    """
+    Storage implementation that remembers which targets another backend has no record for.
+
+    A miss is remembered for ``ttl`` seconds in a file shared by all conda processes, so
+    channels configured without a stored credential do not pay for a backend lookup every
+    time. Storing a credential for a target forgets its miss immediately.
+    """
+
+    def __init__(self, backend: Storage, path: Path, *, ttl: int) -> None:
+        self.backend = backend
+        self.path = Path(path)
+        self.ttl = ttl
+        self._entries: dict[str, float] = {}
+        self._entries_stamp: tuple[int, int] | None = None
+
+    def iter_backends(self) -> Iterator[Storage]:
+        yield self
+        yield from self.backend.iter_backends()
+
+    def set_credential(self, record: CredentialRecord) -> None:
+        self.backend.set_credential(record)
+        self._update_entries(forget=(record.target,))
+
+    def get_credential(self, target: str) -> CredentialRecord | None:
+        if self._is_miss(target):
+            return None
+
+        record = self.backend.get_credential(target)
+        if record is None:
+            self._update_entries(remember=(target,))
+
+        return record
+
+    def get_credentials(self, targets: Iterable[str]) -> dict[str, CredentialRecord | None]:
+        records: dict[str, CredentialRecord | None] = dict.fromkeys(targets)
+        lookups = [target for target in records if not self._is_miss(target)]
+        if lookups:
+            fetched = self.backend.get_credentials(lookups)
+            records.update(fetched)
+            self._update_entries(
+                remember=[target for target, record in fetched.items() if record is None]
+            )
+
+        return records
+
+    def set_credentials(self, records: Iterable[CredentialRecord]) -> None:
+        records = list(records)
+        try:
+            self.backend.set_credentials(records)
+        finally:
+            self._update_entries(forget=[record.target for record in records])
+
+    def iter_credentials(self) -> Iterator[CredentialRecord]:
+        return self.backend.iter_credentials()
+
+    def delete_credential(self, target: str) -> None:
+        self.backend.delete_credential(target)
+        self._update_entries(remember=(target,))
+
+    def delete_credentials(self, targets: Iterable[str]) -> None:
+        targets = list(targets)
+        self.backend.delete_credentials(targets)
+        self._update_entries(remember=targets)
+
+    def clear(self) -> None:
+        """
+        Forget all misses.
+        """
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        self._entries = {}
+        self._entries_stamp = None
+
+    def get_lock_path(self) -> Path:
+        """
+        Return the lock file that coordinates updates of the miss file.
+        """
+        return self.path.with_name(f".{self.path.name}.lock")
+
+    def _is_miss(self, target: str) -> bool:
+        expires = self._read_entries().get(_miss_key(target))
+        return expires is not None and expires > time.time()
+
+    def _read_entries(self) -> dict[str, float]:
+        """
+        Return the remembered misses, re-reading the file only when it changed on disk.
+        """
+        try:
+            stat = self.path.stat()
+        except OSError:
+            if self._entries_stamp is not None:
+                self._entries = {}
+                self._entries_stamp = None
+            return self._entries
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._entries_stamp:
+            return self._entries
+
+        self._entries = self._decode_entries(read_private_file(self.path))
+        self._entries_stamp = stamp
+        return self._entries
+
+    def _decode_entries(self, payload: bytes | None) -> dict[str, float]:
+        if payload is None:
+            return {}
+
+        try:
+            data = json.loads(payload)
+        except (JSONDecodeError, UnicodeDecodeError):
+            return {}
+
+        if not isinstance(data, dict):
+            return {}
+
+        return {
+            key: expires
+            for key, expires in data.items()
+            if isinstance(key, str) and isinstance(expires, (int, float))
+        }
+
+    def _update_entries(
+        self,
+        *,
+        remember: Iterable[str] = (),
+        forget: Iterable[str] = (),
+    ) -> None:
+        remember = {_miss_key(target) for target in remember}
+        forget = {_miss_key(target) for target in forget}
+        if not remember and not forget.intersection(self._read_entries()):
+            return
+
+        try:
+            with file_lock(self.get_lock_path()):
+                # Another process may have written the file since it was last read
+                self._entries_stamp = None
+                entries = self._merge_entries(self._read_entries(), remember, forget)
+
+                try:
+                    write_private_file(self.path, json.dumps(entries).encode())
+                except OSError as exc:
+                    # Misses are still remembered for the rest of this process
+                    log.debug("Unable to write credential miss cache %s: %s", self.path, exc)
+                    self._entries = entries
+                    return
+
+                stat = self.path.stat()
+                self._entries = entries
+                self._entries_stamp = (stat.st_mtime_ns, stat.st_size)
+        except FileLockError as exc:
+            # Misses are still remembered for the rest of this process. The file is dropped,
+            # so other processes cannot keep a miss for a target that was just stored
+            log.debug("Unable to update credential miss cache %s: %s", self.path, exc)
+            self._entries = self._merge_entries(self._entries, remember, forget)
+            self._entries_stamp = None
+            with suppress(OSError):
+                self.path.unlink()
+
+    def _merge_entries(
+        self, entries: dict[str, float], remember: set[str], forget: set[str]
+    ) -> dict[str, float]:
+        now = time.time()
+        merged = {
+            key: expires for key, expires in entries.items() if key not in forget and expires > now
+        }
+        merged.update(dict.fromkeys(remember, now + self.ttl))
+        return merged
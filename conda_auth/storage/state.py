@@ -0,0 +1,116 @@
+"""
+Small state files recording work that does not need to be repeated by later processes
+"""
+
+from __future__ import annotations
+
+import json
+from json import JSONDecodeError
+from pathlib import Path
+from typing import Any
+
+from .files import get_cache_dir, read_private_file, write_private_file
+
+BACKEND_STATE_FILE_NAME = "backend.json"
+
+LEGACY_MIGRATION_FILE_NAME = "legacy-migrations.json"
+
+
+def get_backend_state_path() -> Path:
+    """
+    Return the path of the file recording the last successfully probed keyring backend.
+    """
+    return get_cache_dir() / BACKEND_STATE_FILE_NAME
+
+
+def get_backend_stamp(backend: object) -> dict[str, Any]:
+    """
+    Identify a keyring backend by its class name and priority.
+    """
+    backend_type = type(backend)
+    try:
+        priority = getattr(backend, "priority", None)
+    except Exception:
+        priority = None
+
+    return {
+        "backend": f"{backend_type.__module__}.{backend_type.__qualname__}",
+        "priority": priority if isinstance(priority, (int, float)) else None,
+    }
+
+
+def read_backend_state(path: Path) -> dict[str, Any] | None:
+    """
+    Return the recorded backend stamp, or ``None`` when nothing usable is recorded.
+    """
+    payload = read_private_file(path)
+    if payload is None:
+        return None
+
+    try:
+        state = json.loads(payload)
+    except (JSONDecodeError, UnicodeDecodeError):
+        return None
+
+    return state if isinstance(state, dict) else None
+
+
+def write_backend_state(path: Path, stamp: dict[str, Any]) -> None:
+    """
+    Record a backend stamp; failing to do so only means the next process probes again.
+    """
+    try:
+        write_private_file(path, json.dumps(stamp).encode())
+    except OSError:
+        pass
+
+
+def clear_backend_state(path: Path) -> None:
+    """
+    Forget the recorded backend so the next access probes the keyring again.
+    """
+    try:
+        path.unlink()
+    except OSError:
+        pass
+
+
+def get_legacy_migration_path() -> Path:
+    """
+    Return the path of the file recording which legacy keyring entries were migrated.
+    """
+    return get_cache_dir() / LEGACY_MIGRATION_FILE_NAME
+
+
+def read_legacy_migrations(path: Path) -> set[str]:
+    """
+    Return the keys of the legacy credential lookups that are done.
+    """
+    payload = read_private_file(path)
+    if payload is None:
+        return set()
+
+    try:
+        keys = json.loads(payload)
+    except (JSONDecodeError, UnicodeDecodeError):
+        return set()
+
+    if not isinstance(keys, list):
+        return set()
+
+    return {key for key in keys if isinstance(key, str)}
+
+
+def mark_legacy_migration_done(path: Path, key: str) -> None:
+    """
+    Record that the legacy credential lookup for ``key`` is done; failing to do so only
+    means the next process looks again.
+    """
+    keys = read_legacy_migrations(path)
+    if key in keys:
+        return
+
+    try:
+        write_private_file(path, json.dumps(sorted(keys | {key})).encode())
+    except OSError:
+        pass
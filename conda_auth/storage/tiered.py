@@ -0,0 +1,230 @@
+"""
+Several storage backends stacked from fastest to slowest
+"""
+
+from __future__ import annotations
+
+import time
+import weakref
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from typing import Literal
+
+from ..credentials import CredentialRecord
+from ..exceptions import CondaAuthError
+from .base import Storage
+
+WRITE_THROUGH = "write-through"
+"""Write every change to all tiers immediately."""
+
+WRITE_BACK = "write-back"
+"""Write changes to the first tier, and to the other tiers on ``TieredStorage.flush``."""
+
+WritePolicy = Literal["write-through", "write-back"]
+
+
+def write_back(
+    tiers: Sequence[Storage], dirty: dict[str, CredentialRecord], deleted: set[str]
+) -> None:
+    """
+    Write held back changes to every tier below the first, source of truth first.
+    """
+    for tier in reversed(tiers[1:]):
+        if dirty:
+            tier.set_credentials(list(dirty.values()))
+        if deleted:
+            tier.delete_credentials(list(deleted))
+    dirty.clear()
+    deleted.clear()
+
+
+@dataclass
+class TierStats:
+    """
+    Number and duration of the calls ``TieredStorage`` made to one of its tiers.
+    """
+
+    reads: int = 0
+    """Number of targets looked up."""
+
+    hits: int = 0
+    """Number of targets the tier had a record for."""
+
+    writes: int = 0
+    """Number of records stored or deleted."""
+
+    read_seconds: float = 0.0
+    """Time spent looking up records."""
+
+    write_seconds: float = 0.0
+    """Time spent storing and deleting records, including promotions."""
+
+    @property
+    def misses(self) -> int:
+        return self.reads - self.hits
+
+    @property
+    def mean_read_seconds(self) -> float:
+        """Average time per target looked up."""
+        return self.read_seconds / self.reads if self.reads else 0.0
+
+
+class TieredStorage(Storage):
+    """
+    Storage implementation that looks records up in several tiers, fastest first.
+
+    The last tier is the source of truth, e.g. ``[MemoryStorage(), file, keyring]``.
+    A record found in a lower tier is promoted to the tiers above it when ``promote`` is
+    set, so the next read is served by the fastest tier.
+
+    With the ``write-through`` policy, changes are written to every tier, source of
+    truth first. With ``write-back``, they only reach the first tier until ``flush`` or
+    ``close`` is called, or the storage is used as a context manager. Changes that are
+    still held back when the storage is garbage collected or the process exits are
+    written then.
+    """
+
+    def __init__(
+        self,
+        tiers: Sequence[Storage],
+        *,
+        promote: bool = True,
+        write_policy: WritePolicy = WRITE_THROUGH,
+    ) -> None:
+        if not tiers:
+            raise CondaAuthError("Tiered storage needs at least one tier")
+        if write_policy not in (WRITE_THROUGH, WRITE_BACK):
+            raise CondaAuthError(f"Unknown write policy {write_policy!r}")
+
+        self.tiers = tuple(tiers)
+        self.promote = promote
+        self.write_policy = write_policy
+        self.stats = [TierStats() for _ in self.tiers]
+        self._dirty: dict[str, CredentialRecord] = {}
+        self._deleted: set[str] = set()
+        self._finalizer: weakref.finalize | None = None
+
+        if write_policy == WRITE_BACK:
+            # The callback must not reference self, or the storage would never be collected
+            self._finalizer = weakref.finalize(
+                self, write_back, self.tiers, self._dirty, self._deleted
+            )
+
+    def __enter__(self) -> TieredStorage:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def iter_backends(self) -> Iterator[Storage]:
+        yield self
+        for tier in self.tiers:
+            yield from tier.iter_backends()
+
+    def get_credential(self, target: str) -> CredentialRecord | None:
+        return self.get_credentials((target,))[target]
+
+    def get_credentials(self, targets: Iterable[str]) -> dict[str, CredentialRecord | None]:
+        records: dict[str, CredentialRecord | None] = dict.fromkeys(targets)
+        # Changes held back by write-back are newer than anything the tiers hold, and
+        # targets looked up in the tiers are never dirty, so promotions cannot replace them
+        lookups = []
+        for target in records:
+            if target in self._dirty:
+                records[target] = self._dirty[target]
+            elif target not in self._deleted:
+                lookups.append(target)
+
+        for index, tier in enumerate(self.tiers):
+            if not lookups:
+                break
+
+            stats = self.stats[index]
+            start = time.perf_counter()
+            found = tier.get_credentials(lookups)
+            stats.read_seconds += time.perf_counter() - start
+            stats.reads += len(lookups)
+
+            hits = {target: record for target, record in found.items() if record is not None}
+            stats.hits += len(hits)
+            if hits and self.promote and index > 0:
+                self._write(range(index), list(hits.values()))
+
+            records.update(hits)
+            lookups = [target for target in lookups if target not in hits]
+
+        return records
+
+    def set_credential(self, record: CredentialRecord) -> None:
+        self.set_credentials((record,))
+
+    def set_credentials(self, records: Iterable[CredentialRecord]) -> None:
+        records = list(records)
+        if not records:
+            return
+
+        if self.write_policy == WRITE_BACK:
+            self._write(range(1), records)
+            for record in records:
+                self._deleted.discard(record.target)
+                self._dirty[record.target] = record
+            return
+
+        self._write(reversed(range(len(self.tiers))), records)
+
+    def delete_credential(self, target: str) -> None:
+        self.delete_credentials((target,))
+
+    def delete_credentials(self, targets: Iterable[str]) -> None:
+        targets = list(targets)
+        if not targets:
+            return
+
+        if self.write_policy == WRITE_BACK:
+            # Cached copies go now; the source of truth keeps the records until the flush
+            self._delete(range(len(self.tiers) - 1), targets)
+            for target in targets:
+                self._dirty.pop(target, None)
+                self._deleted.add(target)
+            return
+
+        self._delete(reversed(range(len(self.tiers))), targets)
+
+    def iter_credentials(self) -> Iterator[CredentialRecord]:
+        self.flush()
+        return self.tiers[-1].iter_credentials()
+
+    def flush(self) -> None:
+        """
+        Write the changes held back by the ``write-back`` policy to the lower tiers.
+        """
+        lower_tiers = range(len(self.tiers) - 1, 0, -1)
+        if self._dirty:
+            self._write(lower_tiers, list(self._dirty.values()))
+            self._dirty.clear()
+        if self._deleted:
+            self._delete(lower_tiers, list(self._deleted))
+            self._deleted.clear()
+
+    def close(self) -> None:
+        """
+        Flush held back changes and stop writing them when the process exits.
+        """
+        self.flush()
+        if self._finalizer is not None:
+            self._finalizer.detach()
+            self._finalizer = None
+
+    def _write(self, indexes: Iterable[int], records: list[CredentialRecord]) -> None:
+        for index in indexes:
+            start = time.perf_counter()
+            self.tiers[index].set_credentials(records)
+            self.stats[index].write_seconds += time.perf_counter() - start
+            self.stats[index].writes += len(records)
+
+    def _delete(self, indexes: Iterable[int], targets: list[str]) -> None:
+        for index in indexes:
+            start = time.perf_counter()
+            self.tiers[index].delete_credentials(targets)
+            self.stats[index].write_seconds += time.perf_counter() - start
+            self.stats[index].writes += len(targets)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import timeit
+import tracemalloc
+from collections.abc import Callable, Sized
+from dataclasses import dataclass, field
+
+import keyring
+import pytest
+from keyring.backend import KeyringBackend
+
+BENCHMARK_RESULTS = pytest.StashKey[list["BenchmarkResult | MemoryResult"]]()
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    name: str
+    number: int
+    repeat: int
+    best: float
+    """Time for a single call in the fastest run, in seconds."""
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: {self.best * 1e6:.2f} us per call"
+            f" ({self.number} calls, best of {self.repeat} runs)"
+        )
+
+
+@dataclass(frozen=True)
+class MemoryResult:
+    name: str
+    size: float
+    """Memory held per item, in bytes."""
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.size:.0f} bytes per item"
+
+
+@dataclass
+class Benchmark:
+    """
+    Times callables with ``timeit`` and collects the results for the terminal summary.
+    """
+
+    results: list[BenchmarkResult | MemoryResult] = field(default_factory=list)
+
+    def __call__(
+        self,
+        name: str,
+        func: Callable[[], object],
+        *,
+        number: int = 1000,
+        repeat: int = 5,
+    ) -> BenchmarkResult:
+        timings = timeit.repeat(func, number=number, repeat=repeat)
+        result = BenchmarkResult(
+            name=name, number=number, repeat=repeat, best=min(timings) / number
+        )
+        self.results.append(result)
+        return result
+
+    def record(self, name: str, seconds: float, *, repeat: int = 1) -> BenchmarkResult:
+        """
+        Add the best of ``repeat`` measurements taken outside of ``timeit``, e.g. in a
+        subprocess.
+        """
+        result = BenchmarkResult(name=name, number=1, repeat=repeat, best=seconds)
+        self.results.append(result)
+        return result
+
+    def memory(self, name: str, func: Callable[[], Sized]) -> MemoryResult:
+        """
+        Measure the memory still held by the collection ``func`` returns, per item.
+        """
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            items = func()
+            size = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+
+        result = MemoryResult(name=name, size=size / len(items))
+        self.results.append(result)
+        return result
+
+
+class MemoryKeyring(KeyringBackend):
+    """
+    Keyring backend keeping passwords in a dict, so benchmarks do not depend on the system
+    keyring and its latency.
+    """
+
+    priority = 1  # type: ignore[assignment]
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.passwords: dict[tuple[str, str], str] = {}
+
+    def get_password(self, service: str, username: str) -> str | None:
+        return self.passwords.get((service, username))
+
+    def set_password(self, service: str, username: str, password: str) -> None:
+        self.passwords[(service, username)] = password
+
+    def delete_password(self, service: str, username: str) -> None:
+        self.passwords.pop((service, username), None)
+
+
+@pytest.fixture
+def memory_keyring():
+    """
+    Installs an empty ``MemoryKeyring`` as the keyring backend for the duration of a test.
+    """
+    previous = keyring.get_keyring()
+    backend = MemoryKeyring()
+    keyring.set_keyring(backend)
+    yield backend
+    keyring.set_keyring(previous)
+
+
+@pytest.fixture
+def bench(request) -> Benchmark:
+    results = request.config.stash.setdefault(BENCHMARK_RESULTS, [])
+    return Benchmark(results=results)
+
+
+def pytest_terminal_summary(terminalreporter, config) -> None:
+    results = config.stash.get(BENCHMARK_RESULTS, [])
+    if not results:
+        return
+
+    terminalreporter.section("conda-auth benchmarks")
+    for result in results:
+        terminalreporter.write_line(str(result))
@@ -0,0 +1,210 @@
+"""
+What conda-auth adds to starting conda and to its first use of stored credentials
+
+Credentials live in ``MemoryKeyring`` so runs are offline and deterministic.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+import subprocess
+import sys
+from typing import TypedDict
+
+import pytest
+
+from conda_auth.cli import auth
+from conda_auth.constants import HTTP_BASIC_AUTH_NAME, TOKEN_NAME
+from conda_auth.credentials import CredentialRecord
+from conda_auth.handlers import (
+    BasicAuthHandler,
+    TokenAuthHandler,
+    basic_auth_manager,
+    token_auth_manager,
+)
+from conda_auth.handlers.lazy import LazyBasicAuthHandler, LazyTokenAuthHandler
+from conda_auth.storage import LazyStorage
+from conda_auth.storage.files import get_cache_dir
+from conda_auth.storage.keyring import KeyringStorage
+from conda_auth.storage.state import get_backend_state_path
+
+pytestmark = pytest.mark.benchmark
+
+DISCOVERY_RUNS = 5
+
+STATUS_CHANNEL_COUNTS = (10, 100, 1000)
+
+BASIC_AUTH_CHANNEL = "https://repo.example.com/basic"
+
+TOKEN_CHANNEL = "https://repo.example.com/token"
+
+# Registers the plugin module the way conda does and runs every hook conda runs on start-up,
+# including configuring the subcommand parser. Prints the elapsed time and whether the
+# credential storage was imported.
+DISCOVER_PLUGIN = """
+import argparse
+import json
+import sys
+import time
+
+import conda.cli.helpers
+from conda.plugins.manager import CondaPluginManager
+
+start = time.perf_counter()
+import conda_auth.plugin
+
+manager = CondaPluginManager()
+manager.register(conda_auth.plugin)
+for subcommand in manager.get_hook_results("subcommands"):
+    subcommand.configure_parser(argparse.ArgumentParser())
+manager.get_hook_results("auth_handlers")
+manager.get_hook_results("settings")
+manager.get_hook_results("pre_commands")
+elapsed = time.perf_counter() - start
+
+print(json.dumps({"elapsed": elapsed, "keyring": "keyring" in sys.modules}))
+"""
+
+
+class DiscoveryRun(TypedDict):
+    elapsed: float
+    keyring: bool
+
+
+def discover_plugin() -> DiscoveryRun:
+    result = subprocess.run(
+        [sys.executable, "-c", DISCOVER_PLUGIN],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def store_records(*records: CredentialRecord) -> None:
+    storage = KeyringStorage()
+    for record in records:
+        storage.set_credential(record)
+
+
+def test_plugin_discovery(bench):
+    runs = [discover_plugin() for _ in range(DISCOVERY_RUNS)]
+
+    assert not any(run["keyring"] for run in runs)
+
+    bench.record("plugin discovery", min(run["elapsed"] for run in runs), repeat=DISCOVERY_RUNS)
+
+
+def test_lazy_storage_first_access(bench, memory_keyring):
+    target = BASIC_AUTH_CHANNEL
+    store_records(
+        CredentialRecord(
+            target=target, auth_type=HTTP_BASIC_AUTH_NAME, username="user", password="secret"
+        )
+    )
+
+    def first_access_without_state():
+        shutil.rmtree(get_cache_dir(), ignore_errors=True)
+        return LazyStorage().get_credential(target)
+
+    def first_access():
+        return LazyStorage().get_credential(target)
+
+    assert first_access_without_state().password == "secret"
+    assert get_backend_state_path().exists()
+    assert first_access().password == "secret"
+
+    probed = bench(
+        "LazyStorage first access, probing the keyring", first_access_without_state, number=200
+    )
+    recorded = bench("LazyStorage first access, backend recorded", first_access, number=200)
+
+    assert recorded.best < probed.best
+
+
+@pytest.mark.parametrize(
+    "handler_class, lazy_handler_class, manager, record",
+    (
+        (
+            BasicAuthHandler,
+            LazyBasicAuthHandler,
+            basic_auth_manager,
+            CredentialRecord(
+                target=BASIC_AUTH_CHANNEL,
+                auth_type=HTTP_BASIC_AUTH_NAME,
+                username="user",
+                password="secret",
+            ),
+        ),
+        (
+            TokenAuthHandler,
+            LazyTokenAuthHandler,
+            token_auth_manager,
+            CredentialRecord(target=TOKEN_CHANNEL, auth_type=TOKEN_NAME, token="secret"),
+        ),
+    ),
+    ids=("basic", "token"),
+)
+def test_handler_construction(
+    bench,
+    memory_keyring,
+    mocker,
+    context_factory,
+    handler_class,
+    lazy_handler_class,
+    manager,
+    record,
+):
+    channel = record.target
+    store_records(record)
+    mocker.patch.object(
+        manager,
+        "_context",
+        context_factory(channel_settings=[{"channel": channel, "auth": record.auth_type}]),
+    )
+
+    def construct_first():
+        manager.cache_clear()
+        return handler_class(channel)
+
+    def construct_first_lazy():
+        manager.cache_clear()
+        return lazy_handler_class(channel)
+
+    assert isinstance(construct_first_lazy(), handler_class)
+
+    name = record.auth_type
+    first = bench(f"{name} handler construction, uncached", construct_first, number=200)
+    bench(f"{name} lazy handler construction, uncached", construct_first_lazy, number=200)
+    cached = bench(f"{name} handler construction, cached", lambda: handler_class(channel))
+
+    assert cached.best < first.best
+
+
+@pytest.mark.parametrize("channel_count", STATUS_CHANNEL_COUNTS)
+def test_status(bench, memory_keyring, mocker, context_factory, runner, channel_count):
+    channels = [f"https://repo.example.com/channel-{index}" for index in range(channel_count)]
+    store_records(
+        *(
+            CredentialRecord(target=channel, auth_type=TOKEN_NAME, token="secret")
+            for channel in channels
+        )
+    )
+    mocker.patch(
+        "conda_auth.cli.status.context",
+        context_factory(
+            channel_settings=[{"channel": channel, "auth": TOKEN_NAME} for channel in channels]
+        ),
+    )
+
+    result = runner.invoke(auth, ["status", "--json"])
+
+    assert result.exit_code == 0
+    assert len(json.loads(result.stdout)["credentials"]) == channel_count
+
+    bench(
+        f"conda auth status, {channel_count} channels",
+        lambda: runner.invoke(auth, ["status", "--json"]),
+        number=max(1, 1000 // channel_count),
+    )
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+
+import pytest
+
+from conda_auth.cli.config import AUTH_CHANNEL_SETTING_KEYS, ChannelSettingsEditor
+
+pytestmark = pytest.mark.benchmark
+
+ENTRY_COUNT = 5000
+
+CHANGE_COUNT = 40
+
+
+def make_channel_settings(count: int) -> list[dict[str, object]]:
+    return [
+        {"channel": f"https://repo.example.com/channel-{index}", "auth": "token"}
+        for index in range(count)
+    ]
+
+
+def upsert_per_channel(channel_settings: list, channel: str, auth_type: str) -> list:
+    """
+    The single channel update ``login`` used before ``ChannelSettingsEditor`` existed.
+    """
+    updated_settings: dict[str, object] = {"channel": channel}
+    last_channel_index = next(
+        (
+            index
+            for index, settings in reversed(list(enumerate(channel_settings)))
+            if isinstance(settings, Mapping) and settings.get("channel") == channel
+        ),
+        None,
+    )
+    if last_channel_index is not None:
+        updated_settings.update(
+            {
+                key: value
+                for key, value in channel_settings[last_channel_index].items()
+                if key not in AUTH_CHANNEL_SETTING_KEYS
+            }
+        )
+    updated_settings["auth"] = auth_type
+    updated_settings["auth_target"] = channel
+
+    if last_channel_index is None:
+        return [*channel_settings, updated_settings]
+
+    return [
+        updated_settings if index == last_channel_index else settings
+        for index, settings in enumerate(channel_settings)
+    ]
+
+
+def remove_per_channel(channel_settings: list, channel: str) -> list:
+    """
+    The single channel removal ``logout`` used before ``ChannelSettingsEditor`` existed.
+    """
+    updated_channel_settings = []
+    for settings in channel_settings:
+        if not isinstance(settings, Mapping) or settings.get("channel") != channel:
+            updated_channel_settings.append(settings)
+            continue
+        updated_settings = {
+            key: value for key, value in settings.items() if key not in AUTH_CHANNEL_SETTING_KEYS
+        }
+        if updated_settings != {"channel": channel}:
+            updated_channel_settings.append(updated_settings)
+    return updated_channel_settings
+
+
+def test_channel_settings_editor(bench):
+    channel_settings = make_channel_settings(ENTRY_COUNT)
+    upserts = [f"https://repo.example.com/channel-{index * 97}" for index in range(CHANGE_COUNT)]
+    removals = [
+        f"https://repo.example.com/channel-{index * 89 + 1}" for index in range(CHANGE_COUNT)
+    ]
+
+    def edit_once():
+        editor = ChannelSettingsEditor(channel_settings)
+        for channel in upserts:
+            editor.upsert(channel, "http-basic")
+        for channel in removals:
+            editor.remove(channel)
+        return editor.apply()
+
+    def edit_per_channel():
+        updated = channel_settings
+        for channel in upserts:
+            updated = upsert_per_channel(updated, channel, "http-basic")
+        for channel in removals:
+            updated = remove_per_channel(updated, channel)
+        return updated
+
+    assert edit_once() == edit_per_channel()
+
+    single_pass = bench(
+        f"editor, {CHANGE_COUNT * 2} changes to {ENTRY_COUNT} entries", edit_once, number=10
+    )
+    per_channel = bench(
+        f"per channel, {CHANGE_COUNT * 2} changes to {ENTRY_COUNT} entries",
+        edit_per_channel,
+        number=2,
+    )
+
+    assert single_pass.best * 10 < per_channel.best
+
+
+def test_channel_settings_editor_single_change(bench):
+    channel_settings = make_channel_settings(ENTRY_COUNT)
+    channel = f"https://repo.example.com/channel-{ENTRY_COUNT // 2}"
+
+    def edit_once():
+        editor = ChannelSettingsEditor(channel_settings)
+        editor.upsert(channel, "http-basic")
+        return editor.apply()
+
+    assert edit_once() == upsert_per_channel(channel_settings, channel, "http-basic")
+
+    single_pass = bench(f"editor, 1 change to {ENTRY_COUNT} entries", edit_once, number=50)
+    per_channel = bench(
+        f"per channel, 1 change to {ENTRY_COUNT} entries",
+        lambda: upsert_per_channel(channel_settings, channel, "http-basic"),
+        number=50,
+    )
+
+    assert single_pass.best < per_channel.best * 2
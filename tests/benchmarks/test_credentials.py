@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from dataclasses import field, fields, make_dataclass
+
+import pytest
+
+from conda_auth.constants import OAUTH_NAME, TOKEN_NAME
+from conda_auth.credentials import CredentialRecord
+
+pytestmark = pytest.mark.benchmark
+
+RECORD_COUNT = 10000
+
+# The same fields without slots, as CredentialRecord was defined before
+UnslottedRecord = make_dataclass(
+    "UnslottedRecord",
+    [(item.name, item.type, field(default=item.default)) for item in fields(CredentialRecord)],
+    frozen=True,
+)
+
+OAUTH_DATA = {
+    "target": "https://repo.example.com/private",
+    "auth_type": OAUTH_NAME,
+    "access_token": "access",
+    "refresh_token": "refresh",
+    "expires_at": 1_900_000_000,
+    "token_endpoint": "https://auth.example.com/token",
+    "client_id": "conda",
+    "issuer_url": "https://auth.example.com",
+    "scopes": ("openid", "offline_access"),
+}
+
+
+def test_credential_record_memory(bench):
+    """
+    Measures records for many targets, sharing the field values so only the records
+    themselves are counted.
+    """
+    targets = [f"https://repo.example.com/channel-{index}" for index in range(RECORD_COUNT)]
+
+    slotted = bench.memory(
+        f"{RECORD_COUNT} slotted records",
+        lambda: [
+            CredentialRecord(target=target, auth_type=TOKEN_NAME, token="secret")
+            for target in targets
+        ],
+    )
+    unslotted = bench.memory(
+        f"{RECORD_COUNT} unslotted records",
+        lambda: [
+            UnslottedRecord(target=target, auth_type=TOKEN_NAME, token="secret")
+            for target in targets
+        ],
+    )
+
+    assert slotted.size < unslotted.size
+
+
+@pytest.mark.parametrize(
+    "data",
+    (
+        {"target": "https://repo.example.com/private", "auth_type": TOKEN_NAME, "token": "t"},
+        OAUTH_DATA,
+        {**OAUTH_DATA, "scopes": list(OAUTH_DATA["scopes"])},
+    ),
+    ids=("token", "oauth-typed", "oauth-json"),
+)
+def test_credential_record_throughput(bench, data):
+    record = CredentialRecord.from_dict(data)
+
+    bench(
+        f"{data['auth_type']} record, from_dict ({len(data)} keys)",
+        lambda: CredentialRecord.from_dict(data),
+    )
+    bench(f"{data['auth_type']} record, to_dict", record.to_dict)
+    bench(f"{data['auth_type']} record, to_status_entry", record.to_status_entry)
+
+    assert CredentialRecord.from_dict(record.to_dict()) == record
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import pytest
+from requests.auth import HTTPBasicAuth
+
+from conda_auth.handlers.basic_auth import HTTP_BASIC_AUTH_NAME, BasicAuthHandler
+from conda_auth.handlers.basic_auth import manager as basic_auth_manager
+from conda_auth.handlers.token import TOKEN_NAME, TokenAuthHandler
+from conda_auth.handlers.token import manager as token_auth_manager
+
+pytestmark = pytest.mark.benchmark
+
+CHANNEL = "https://repo.example.com/private"
+
+
+class BearerAuth:
+    """
+    Bearer token auth written the way ``requests`` auth objects build their header.
+    """
+
+    def __init__(self, token: str) -> None:
+        self.token = token
+
+    def __call__(self, r):
+        r.headers["Authorization"] = f"Bearer {self.token}"
+        return r
+
+
+@pytest.fixture
+def handlers(monkeypatch, context_factory):
+    """
+    Handlers constructed from secrets that are already in the manager caches.
+    """
+    for manager, auth_type, secrets in (
+        (basic_auth_manager, HTTP_BASIC_AUTH_NAME, ("user", "password")),
+        (token_auth_manager, TOKEN_NAME, ("token", "secret-token")),
+    ):
+        context = context_factory([{"channel": CHANNEL, "auth": auth_type}])
+        monkeypatch.setattr(manager, "_context", context)
+        manager._cache[CHANNEL] = secrets
+    yield BasicAuthHandler(CHANNEL), TokenAuthHandler(CHANNEL)
+    basic_auth_manager.cache_clear()
+    token_auth_manager.cache_clear()
+
+
+def test_basic_auth_per_request(bench, handlers, request_factory):
+    basic_handler, _ = handlers
+    requests_auth = HTTPBasicAuth("user", "password")
+
+    assert basic_handler(request_factory()).headers == requests_auth(request_factory()).headers
+
+    bench("BasicAuthHandler per request", lambda: basic_handler(request_factory()), number=10_000)
+    bench("HTTPBasicAuth per request", lambda: requests_auth(request_factory()), number=10_000)
+
+
+def test_token_auth_per_request(bench, handlers, request_factory):
+    _, token_handler = handlers
+    requests_auth = BearerAuth("secret-token")
+
+    assert token_handler(request_factory()).headers == requests_auth(request_factory()).headers
+
+    bench("TokenAuthHandler per request", lambda: token_handler(request_factory()), number=10_000)
+    bench("Bearer auth per request", lambda: requests_auth(request_factory()), number=10_000)
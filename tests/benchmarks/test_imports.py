@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import re
+import subprocess
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.benchmark
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+RUN_HOOKS = """
+import argparse
+
+import conda.cli.helpers
+import conda.plugins.types
+import conda_auth.plugin
+
+for subcommand in conda_auth.plugin.conda_subcommands():
+    subcommand.configure_parser(argparse.ArgumentParser())
+list(conda_auth.plugin.conda_auth_handlers())
+list(conda_auth.plugin.conda_settings())
+list(conda_auth.plugin.conda_pre_commands())
+"""
+
+# Handlers reading credentials from the keyring, which they only import once they use it
+CONSTRUCT_HANDLER_MODULES = """
+import conda.plugins.types
+import conda_auth.handlers.basic_auth
+import conda_auth.handlers.oauth
+import conda_auth.handlers.token
+import conda_auth.storage.keyring
+"""
+
+
+def import_times(code: str) -> dict[str, tuple[int, int]]:
+    """
+    Return the nesting depth and cumulative import time in microseconds of every module
+    ``code`` imports.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if match := IMPORT_TIME_LINE.match(line):
+            times[match.group(4)] = (len(match.group(3)), int(match.group(2)))
+    return times
+
+
+def conda_auth_import_time(times: dict[str, tuple[int, int]]) -> int:
+    """
+    Sum the cumulative import times of the ``conda_auth`` modules imported by the script
+    itself, which include everything they import in turn.
+    """
+    return sum(
+        cumulative
+        for name, (depth, cumulative) in times.items()
+        if depth == 1 and name.startswith("conda_auth")
+    )
+
+
+def test_plugin_hooks_import_time(bench):
+    times = import_times(RUN_HOOKS)
+
+    assert "keyring" not in times
+    assert "conda_auth.storage" not in times
+    assert "conda_auth.cli" not in times
+    assert "conda_auth.handlers.base" not in times
+
+    handler_times = import_times(CONSTRUCT_HANDLER_MODULES)
+    hooks = bench.record(
+        "conda_auth imports for plugin hooks", conda_auth_import_time(times) / 1e6
+    )
+    handlers = bench.record(
+        "conda_auth imports for handlers", conda_auth_import_time(handler_times) / 1e6
+    )
+
+    assert "keyring" in handler_times
+    assert hooks.best < handlers.best
+
+
+# Handlers reading credentials from environment variables or secret files
+CONSTRUCT_ENVIRONMENT_HANDLER_MODULES = """
+import conda.plugins.types
+import conda_auth.handlers.basic_auth
+import conda_auth.handlers.token
+import conda_auth.storage.environment
+"""
+
+
+def test_environment_credentials_import_time(bench):
+    times = import_times(CONSTRUCT_ENVIRONMENT_HANDLER_MODULES)
+
+    assert "keyring" not in times
+
+    environment = bench.record(
+        "conda_auth imports for handlers, environment credentials",
+        conda_auth_import_time(times) / 1e6,
+    )
+    keyring = bench.record(
+        "conda_auth imports for handlers, keyring credentials",
+        conda_auth_import_time(import_times(CONSTRUCT_HANDLER_MODULES)) / 1e6,
+    )
+
+    assert environment.best < keyring.best
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from fnmatch import fnmatch
+
+import pytest
+from conda.common.url import urlparse as conda_urlparse
+from conda.models.channel import Channel
+
+from conda_auth.matching import ChannelSettingsIndex
+
+pytestmark = pytest.mark.benchmark
+
+PATTERN_COUNTS = (10, 100, 1000)
+
+
+def make_channel_settings(count: int) -> list[dict[str, object]]:
+    """
+    Mix of exact URLs, host-scoped patterns and wildcard-host patterns.
+    """
+    channel_settings: list[dict[str, object]] = []
+    for index in range(count):
+        if index % 5 == 0:
+            channel = f"https://*.mirror-{index}.example.net/*"
+        elif index % 3 == 0:
+            channel = f"https://repo.example.com/channel-{index}"
+        else:
+            channel = f"https://mirror-{index}.example.com/*"
+        channel_settings.append({"channel": channel, "auth": "token"})
+    return channel_settings
+
+
+def linear_scan(channel_settings, channel: Channel):
+    """
+    The lookup ``AuthManager.get_channel_settings`` used before the index existed.
+    """
+    matched_settings = None
+    for settings in channel_settings:
+        configured_channel = settings["channel"]
+        if configured_channel == channel.canonical_name:
+            matched_settings = settings
+            continue
+        parsed_channel = conda_urlparse(channel.base_url)
+        parsed_setting = conda_urlparse(configured_channel)
+        if parsed_setting.scheme != parsed_channel.scheme:
+            continue
+        if fnmatch(
+            parsed_channel.netloc + parsed_channel.path,
+            parsed_setting.netloc + parsed_setting.path,
+        ):
+            matched_settings = settings
+    return matched_settings
+
+
+@pytest.mark.parametrize("count", PATTERN_COUNTS)
+@pytest.mark.parametrize("host", ("literal", "wildcard"))
+def test_channel_settings_lookup(bench, count, host):
+    channel_settings = make_channel_settings(count)
+    if host == "literal":
+        channel = Channel(f"https://mirror-{count - 1}.example.com/private")
+    else:
+        channel = Channel("https://a.mirror-5.example.net/private")
+    index = ChannelSettingsIndex(channel_settings, "token")
+    number = max(10, 10_000 // count)
+
+    assert index.find(channel) is linear_scan(channel_settings, channel)
+
+    indexed = bench(f"indexed lookup, {host} host, {count} patterns", lambda: index.find(channel))
+    scanned = bench(
+        f"linear scan, {host} host, {count} patterns",
+        lambda: linear_scan(channel_settings, channel),
+        number=number,
+    )
+
+    if count >= 100:
+        assert indexed.best < scanned.best
+
+
+@pytest.mark.parametrize("count", PATTERN_COUNTS)
+def test_channel_settings_find_all(bench, count):
+    channel_settings = make_channel_settings(count)
+    channel = Channel("https://repo.example.com/channel-3")
+    index = ChannelSettingsIndex(channel_settings, include_auth_targets=True)
+
+    assert index.find_all(channel) == [channel_settings[3]]
+
+    bench(f"indexed find_all, {count} patterns", lambda: index.find_all(channel))
+
+
+@pytest.mark.parametrize("count", PATTERN_COUNTS)
+def test_channel_settings_index_build(bench, count):
+    channel_settings = make_channel_settings(count)
+
+    bench(
+        f"index build, {count} patterns",
+        lambda: ChannelSettingsIndex(channel_settings, "token"),
+        number=max(5, 1000 // count),
+    )
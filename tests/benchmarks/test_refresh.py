@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+from integration.auth_server import TokenEndpointServer
+
+from conda_auth.credentials import CredentialRecord
+from conda_auth.handlers.oauth import OAUTH_NAME
+
+pytestmark = pytest.mark.benchmark
+
+PROCESS_COUNTS = (4, 16, 64)
+
+REFRESH_SCRIPT = """
+import json
+import sys
+import time
+from pathlib import Path
+
+from conda_auth.credentials import CredentialRecord
+from conda_auth.handlers import oauth
+from conda_auth.storage.base import Storage
+from conda_auth.storage.files import write_private_file
+
+
+class JsonFileStorage(Storage):
+    def __init__(self, path):
+        self.path = path
+
+    def get_credential(self, target):
+        data = json.loads(self.path.read_text()).get(target)
+        return None if data is None else CredentialRecord.from_dict(data)
+
+    def set_credential(self, record):
+        data = json.loads(self.path.read_text())
+        data[record.target] = record.to_dict()
+        write_private_file(self.path, json.dumps(data).encode())
+
+    def delete_credential(self, target):
+        raise NotImplementedError
+
+
+oauth.storage = JsonFileStorage(Path(sys.argv[1]))
+stale = CredentialRecord.from_dict(json.loads(sys.argv[2]))
+time.sleep(max(0.0, float(sys.argv[3]) - time.time()))
+print(oauth.refresh_credential(stale).access_token)
+"""
+
+
+@pytest.fixture
+def token_endpoint():
+    server = TokenEndpointServer.start(delay=0.2)
+    yield server
+    server.stop()
+
+
+@pytest.mark.parametrize("count", PROCESS_COUNTS)
+def test_concurrent_process_refresh(bench, tmp_path, token_endpoint, count):
+    """
+    Processes refreshing the same expired credential at once hit the token endpoint once.
+    """
+    stale = CredentialRecord(
+        target="https://repo.example.com/private",
+        auth_type=OAUTH_NAME,
+        access_token="access-0",
+        refresh_token="refresh-0",
+        expires_at=int(time.time()) - 1,
+        token_endpoint=token_endpoint.url,
+    )
+    storage_path = tmp_path / "credentials.json"
+    storage_path.write_text(json.dumps({stale.target: stale.to_dict()}))
+    env = {**os.environ, "XDG_CACHE_HOME": str(tmp_path / "cache")}
+    tokens = []
+
+    def refresh_in_processes():
+        # Give every interpreter time to start so the refreshes overlap
+        start_at = str(time.time() + 2)
+        processes = [
+            subprocess.Popen(
+                [
+                    sys.executable,
+                    "-c",
+                    REFRESH_SCRIPT,
+                    str(storage_path),
+                    json.dumps(stale.to_dict()),
+                    start_at,
+                ],
+                env=env,
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+            for _ in range(count)
+        ]
+        tokens.extend(process.communicate(timeout=60)[0].strip() for process in processes)
+
+    bench(f"refresh across {count} processes", refresh_in_processes, number=1, repeat=1)
+
+    assert tokens == ["access-1"] * count
+    assert len(token_endpoint.requests) == 1
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from conda_auth.constants import OAUTH_NAME, TOKEN_NAME
+from conda_auth.credentials import CredentialRecord
+from conda_auth.storage.encoding import decode_record, encode_record
+from conda_auth.storage.keyring import KeyringStorage
+from conda_auth.storage.memory import MemoryStorage
+from conda_auth.storage.tiered import TieredStorage
+
+pytestmark = pytest.mark.benchmark
+
+TARGET_COUNT = 100
+
+
+def test_tiered_storage_hot_reads(bench, memory_keyring):
+    keyring_storage = KeyringStorage()
+    targets = [f"https://repo.example.com/channel-{index}" for index in range(TARGET_COUNT)]
+    keyring_storage.set_credentials(
+        CredentialRecord(target=target, auth_type=TOKEN_NAME, token="secret") for target in targets
+    )
+    storage = TieredStorage([MemoryStorage(), keyring_storage])
+
+    def read_all(storage):
+        return [storage.get_credential(target) for target in targets]
+
+    assert read_all(storage) == read_all(keyring_storage)
+
+    keyring = bench(
+        f"keyring storage, {TARGET_COUNT} reads", lambda: read_all(keyring_storage), number=20
+    )
+    tiered = bench(
+        f"tiered storage, {TARGET_COUNT} hot reads", lambda: read_all(storage), number=20
+    )
+
+    assert storage.stats[0].hits > storage.stats[1].hits
+    assert tiered.best < keyring.best
+
+
+@pytest.mark.parametrize(
+    "record",
+    (
+        CredentialRecord(
+            target="https://repo.example.com/private", auth_type=TOKEN_NAME, token="t" * 40
+        ),
+        CredentialRecord(
+            target="https://repo.example.com/private",
+            auth_type=OAUTH_NAME,
+            access_token="a" * 800,
+            refresh_token="r" * 64,
+            expires_at=1_900_000_000,
+            token_endpoint="https://auth.example.com/oauth/token",
+            revocation_endpoint="https://auth.example.com/oauth/revoke",
+            client_id="conda",
+            issuer_url="https://auth.example.com",
+            scopes=("openid", "offline_access", "channel:read"),
+        ),
+    ),
+    ids=("token", "oauth"),
+)
+def test_record_payload_size_and_decode(bench, record):
+    """
+    Compares the keyring payload formats: JSON as written by earlier versions and the
+    compact encoding.
+    """
+    json_payload = json.dumps(record.to_dict())
+    compact_payload = encode_record(record, include_target=False)
+
+    def decode_json():
+        return CredentialRecord.from_dict(json.loads(json_payload))
+
+    def decode_compact():
+        return decode_record(compact_payload, record.target)
+
+    assert decode_json() == decode_compact() == record
+
+    json_decode = bench(
+        f"{record.auth_type} record, decode JSON ({len(json_payload)} bytes)",
+        decode_json,
+        number=10000,
+    )
+    compact_decode = bench(
+        f"{record.auth_type} record, decode compact ({len(compact_payload)} bytes)",
+        decode_compact,
+        number=10000,
+    )
+
+    assert len(compact_payload) < len(json_payload)
+    assert compact_decode.best < json_decode.best
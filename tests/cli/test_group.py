@@ -4,8 +4,10 @@ from conda_auth.cli import auth, get_auth_manager, prompt_secret, prompt_text
 from conda_auth.exceptions import CondaAuthError
 from conda_auth.handlers import (
     HTTP_BASIC_AUTH_NAME,
+    OAUTH_NAME,
     TOKEN_NAME,
     basic_auth_manager,
+    oauth_manager,
     token_auth_manager,
 )
 
@@ -46,6 +48,7 @@ def test_prompt_secret_uses_getpass(mocker):
     (
         ({"basic": True}, (HTTP_BASIC_AUTH_NAME, basic_auth_manager)),
         ({"token": "token"}, (TOKEN_NAME, token_auth_manager)),
+        ({"auth": OAUTH_NAME}, (OAUTH_NAME, oauth_manager)),
     ),
 )
 def test_get_auth_manager_from_cli_options(kwargs, expected):
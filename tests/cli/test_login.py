@@ -5,6 +5,7 @@ from conda.exceptions import CondaError
 
 from conda_auth.cli import SUCCESSFUL_LOGIN_MESSAGE, auth
 from conda_auth.exceptions import CondaAuthError
+from conda_auth.storage import EnvironmentStorage, get_storage_backend, storage
 
 
 def test_login_basic_auth_no_options(mocker, runner, keyring, condarc):
@@ -341,3 +342,174 @@ def test_login_token_rejects_basic_auth_options(runner, keyring, condarc, option
     assert exc_type is CondaAuthError
     assert exception.message == message
     assert result.output == ""
+
+
+def get_stored_records(keyring_mock):
+    return {
+        key.removeprefix("conda-auth::credential::"): json.loads(payload)
+        for (key, _), payload in keyring_mock.secrets.items()
+        if key.startswith("conda-auth::credential::")
+    }
+
+
+LOGIN_MANIFEST = {
+    "channels": [
+        {"channel": "https://repo.example.com/one", "token": "token-one"},
+        {
+            "channel": "http://example.com/two",
+            "username": "user",
+            "password": "password",
+            "allow_plaintext_http": True,
+        },
+    ]
+}
+
+
+def test_login_from_stdin_manifest(mocker, runner, keyring, condarc):
+    keyring_mock, _ = keyring(None)
+    from_user_condarc = mocker.patch(
+        "conda_auth.cli.ConfigurationFile.from_user_condarc", return_value=condarc
+    )
+
+    result = runner.invoke(
+        auth,
+        ["login", "--from-file", "-", "--json"],
+        input=json.dumps(LOGIN_MANIFEST),
+    )
+
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.stdout) == {"success": True, "message": SUCCESSFUL_LOGIN_MESSAGE}
+    from_user_condarc.assert_called_once()
+    assert condarc.content == {
+        "channel_settings": [
+            {
+                "channel": "https://repo.example.com/one",
+                "auth": "token",
+                "auth_target": "https://repo.example.com/one",
+            },
+            {
+                "channel": "http://example.com/two",
+                "auth": "http-basic",
+                "auth_target": "http://example.com/two",
+                "auth_allow_plaintext_http": True,
+            },
+        ]
+    }
+    records = get_stored_records(keyring_mock)
+    assert records["https://repo.example.com/one"]["token"] == "token-one"
+    assert records["http://example.com/two"]["username"] == "user"
+    assert records["http://example.com/two"]["password"] == "password"
+
+
+def test_login_from_yaml_manifest(tmp_path, runner, keyring, condarc):
+    keyring_mock, _ = keyring(None)
+    manifest = tmp_path / "creds.yaml"
+    manifest.write_text(
+        "channels:\n  - channel: https://repo.example.com/one\n    token: token-one\n"
+    )
+
+    result = runner.invoke(auth, ["login", "--from-file", str(manifest)])
+
+    assert result.exit_code == 0, result.output
+    assert get_stored_records(keyring_mock)["https://repo.example.com/one"]["token"] == "token-one"
+
+
+def test_login_from_manifest_reports_every_invalid_entry(runner, keyring, condarc):
+    keyring_mock, _ = keyring(None)
+    manifest = {
+        "channels": [
+            {"channel": "https://repo.example.com/one", "token": "token-one"},
+            {"channel": "http://example.com/two", "token": "token-two"},
+            {"channel": "https://repo.example.com/three", "username": "user"},
+            {"channel": "https://repo.example.com/one", "token": "token-one"},
+        ]
+    }
+
+    result = runner.invoke(auth, ["login", "--from-file", "-"], input=json.dumps(manifest))
+    exc_type, exception, _ = result.exc_info
+
+    assert exc_type is CondaAuthError
+    assert "entry 0" not in exception.message
+    assert "entry 1: Refusing to use credentials over insecure HTTP channel" in exception.message
+    assert "entry 2: expected 'token' or 'username' and 'password'" in exception.message
+    assert "entry 3: duplicate channel 'https://repo.example.com/one'" in exception.message
+    assert condarc.content == {}
+    keyring_mock.set_password.assert_not_called()
+
+
+def test_login_from_manifest_rolls_back_on_storage_error(runner, keyring, condarc):
+    keyring_mock, _ = keyring(None)
+    previous_record = {"target": "https://repo.example.com/one", "auth_type": "token"}
+    previous_record["token"] = "old-token"
+    keyring_mock.secrets[
+        ("conda-auth::credential::https://repo.example.com/one", "credential")
+    ] = json.dumps(previous_record)
+    previous_settings = [{"channel": "https://repo.example.com/one", "auth": "token"}]
+    condarc.content = {"channel_settings": list(previous_settings)}
+    set_password = keyring_mock.set_password.side_effect
+
+    def fail_second_channel(key_id, username, password):
+        if key_id.endswith("example.com/two"):
+            raise CondaAuthError("Could not save secret")
+        set_password(key_id, username, password)
+
+    keyring_mock.set_password.side_effect = fail_second_channel
+
+    result = runner.invoke(auth, ["login", "--from-file", "-"], input=json.dumps(LOGIN_MANIFEST))
+    exc_type, exception, _ = result.exc_info
+
+    assert exc_type is CondaAuthError
+    assert exception.message == "Could not save secret"
+    assert condarc.content == {"channel_settings": previous_settings}
+    assert get_stored_records(keyring_mock) == {
+        "https://repo.example.com/one": previous_record,
+    }
+
+
+def test_login_from_manifest_rollback_keeps_environment_credentials(
+    monkeypatch, runner, keyring, condarc
+):
+    """
+    Credentials from the environment are not copied into storage by a rollback.
+    """
+    keyring_mock, _ = keyring(None)
+    monkeypatch.setattr(
+        storage,
+        "_storage",
+        EnvironmentStorage(
+            get_storage_backend(),
+            prefix="CI_",
+            environ={"CI_HTTPS_REPO_EXAMPLE_COM_ONE": "environment-token"},
+        ),
+    )
+    set_password = keyring_mock.set_password.side_effect
+
+    def fail_second_channel(key_id, username, password):
+        if key_id.endswith("example.com/two"):
+            raise CondaAuthError("Could not save secret")
+        set_password(key_id, username, password)
+
+    keyring_mock.set_password.side_effect = fail_second_channel
+
+    result = runner.invoke(auth, ["login", "--from-file", "-"], input=json.dumps(LOGIN_MANIFEST))
+
+    assert result.exc_info[0] is CondaAuthError
+    assert get_stored_records(keyring_mock) == {}
+
+
+def test_login_from_manifest_rejects_other_options(runner, keyring, condarc):
+    keyring(None)
+
+    result = runner.invoke(auth, ["login", "tester", "--from-file", "-"], input="{}")
+    exc_type, exception, _ = result.exc_info
+
+    assert exc_type is CondaAuthError
+    assert exception.message == "Option 'from-file' cannot be used with other login options"
+
+
+def test_login_requires_channel(runner, keyring, condarc):
+    result = runner.invoke(auth, ["login", "--token", "token"])
+    exc_type, exception, _ = result.exc_info
+
+    assert exc_type is CondaAuthError
+    assert exception.message == "Missing argument 'channel'."
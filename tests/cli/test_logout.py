@@ -152,3 +152,113 @@ def test_logout_of_non_existing_session(mocker, runner, keyring):
 
     assert exc_type == CondaAuthError
     assert "Unable to find information about logged in session." in exception.message
+
+
+def test_logout_of_oauth_session(mocker, runner, keyring, condarc):
+    """
+    OAuth channels can be logged out of one at a time, like with ``--all``.
+    """
+    channel_name = "https://repo.example.com/oauth"
+    keyring_mock, _ = keyring(None)
+    mock_context = mocker.patch("conda_auth.cli.context")
+    mock_context.channel_settings = [{"channel": channel_name, "auth": "oauth2"}]
+    condarc.content = {"channel_settings": [{"channel": channel_name, "auth": "oauth2"}]}
+
+    result = runner.invoke(auth, ["logout", channel_name])
+
+    assert result.exit_code == 0, result.output
+    assert condarc.content == {"channel_settings": []}
+    assert (
+        f"conda-auth::credential::{channel_name}",
+        "credential",
+    ) in keyring_mock.delete_password_calls
+
+
+LOGGED_IN_CHANNEL_SETTINGS = [
+    {"channel": "https://repo.example.com/one", "auth": "token"},
+    {
+        "channel": "https://repo.example.com/two",
+        "auth": HTTP_BASIC_AUTH_NAME,
+        "username": "user",
+        "ssl_verify": False,
+    },
+    {"channel": "https://other.example.com/three", "auth": "token"},
+    {"channel": "https://other.example.com/four", "auth": "other-plugin"},
+]
+
+
+def test_logout_all(runner, keyring, condarc):
+    keyring_mock, _ = keyring(None)
+    condarc.content = {"channel_settings": list(LOGGED_IN_CHANNEL_SETTINGS)}
+
+    result = runner.invoke(auth, ["logout", "--all"])
+
+    assert result.exit_code == 0, result.output
+    assert SUCCESSFUL_LOGOUT_MESSAGE in result.output
+    assert condarc.content == {
+        "channel_settings": [
+            {"channel": "https://repo.example.com/two", "ssl_verify": False},
+            {"channel": "https://other.example.com/four", "auth": "other-plugin"},
+        ]
+    }
+    assert {key for key, _ in keyring_mock.delete_password_calls if "::credential::" in key} == {
+        "conda-auth::credential::https://repo.example.com/one",
+        "conda-auth::credential::https://repo.example.com/two",
+        "conda-auth::credential::https://other.example.com/three",
+    }
+
+
+def test_logout_match(runner, keyring, condarc):
+    keyring_mock, _ = keyring(None)
+    condarc.content = {"channel_settings": list(LOGGED_IN_CHANNEL_SETTINGS)}
+
+    result = runner.invoke(auth, ["logout", "--match", "https://repo.example.com/*", "--json"])
+
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output) == {"success": True, "message": SUCCESSFUL_LOGOUT_MESSAGE}
+    assert condarc.content == {
+        "channel_settings": [
+            {"channel": "https://repo.example.com/two", "ssl_verify": False},
+            *LOGGED_IN_CHANNEL_SETTINGS[2:],
+        ]
+    }
+    assert [key for key, _ in keyring_mock.delete_password_calls if "::credential::" in key] == [
+        "conda-auth::credential::https://repo.example.com/one",
+        "conda-auth::credential::https://repo.example.com/two",
+    ]
+
+
+def test_logout_match_skips_legacy_deletes_for_migrated_targets(mocker, runner, keyring, condarc):
+    keyring_mock, _ = keyring(None)
+    mocker.patch(
+        "conda_auth.handlers.base.read_legacy_migrations",
+        return_value={"token::https://repo.example.com/one"},
+    )
+    condarc.content = {"channel_settings": list(LOGGED_IN_CHANNEL_SETTINGS)}
+
+    result = runner.invoke(auth, ["logout", "--match", "https://repo.example.com/one"])
+
+    assert result.exit_code == 0, result.output
+    assert keyring_mock.delete_password_calls == [
+        ("conda-auth::credential::https://repo.example.com/one", "credential"),
+    ]
+
+
+def test_logout_match_without_logged_in_channels(runner, keyring, condarc):
+    keyring_mock, _ = keyring(None)
+    condarc.content = {"channel_settings": list(LOGGED_IN_CHANNEL_SETTINGS)}
+
+    result = runner.invoke(auth, ["logout", "--match", "https://missing.example.com/*"])
+    exc_type, exception, _ = result.exc_info
+
+    assert exc_type is CondaAuthError
+    assert exception.message == "Unable to find logged in channels in the user condarc."
+    keyring_mock.delete_password.assert_not_called()
+
+
+def test_logout_all_rejects_channel(runner, keyring, condarc):
+    result = runner.invoke(auth, ["logout", "tester", "--all"])
+    exc_type, exception, _ = result.exc_info
+
+    assert exc_type is CondaAuthError
+    assert exception.message == "Option 'all' / 'match' cannot be used with 'channel'"
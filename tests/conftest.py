@@ -30,6 +30,10 @@ class FakeCondarc:
 @dataclass
 class FakeRequest:
     headers: dict[str, str] = field(default_factory=dict)
+    hooks: dict[str, list] = field(default_factory=lambda: {"response": []})
+
+    def register_hook(self, event, hook):
+        self.hooks[event].append(hook)
 
 
 @dataclass
@@ -133,6 +137,42 @@ class ArgparseRunner:
         )
 
 
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """
+    Keeps the files storage backends write to the user cache directory out of the real one.
+    """
+    path = tmp_path / "cache"
+    monkeypatch.setattr(
+        "conda_auth.storage.files.user_cache_dir",
+        lambda *args, **kwargs: str(path),
+    )
+    return path
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    """
+    Keeps the credential file out of the real user data directory.
+    """
+    path = tmp_path / "data"
+    monkeypatch.setattr(
+        "conda_auth.storage.files.user_data_dir",
+        lambda *args, **kwargs: str(path),
+    )
+    return path
+
+
+@pytest.fixture(autouse=True)
+def reset_storage(monkeypatch):
+    """
+    Makes every test resolve the storage backend again, with the patched keyring.
+    """
+    from conda_auth.storage import storage
+
+    monkeypatch.setattr(storage, "_storage", None)
+
+
 @pytest.fixture
 def keyring(mocker):
     """
@@ -13,6 +13,7 @@ from conda_auth.handlers.base import (
     is_loopback_host,
     validate_secure_channel,
 )
+from conda_auth.handlers.cache import DEFAULT_SECRET_CACHE_SIZE, SecretCache, SecretCacheInfo
 
 
 class StubAuthManager(AuthManager):
@@ -148,3 +149,56 @@ def test_auth_manager_default_legacy_credential_behavior():
 
     assert auth_manager.migrate_legacy_credential_record(channel, None, "tester") is None
     assert auth_manager.legacy_credential_targets(channel, "shared") == ("shared", "tester")
+
+
+class ExpiringAuthManager(StubAuthManager):
+    def _fetch_secret_with_expiry(self, channel, settings):
+        return ("user", "secret"), 1030
+
+
+def test_auth_manager_caches_secrets_until_they_expire(mocker):
+    clock = mocker.patch("conda_auth.handlers.cache.time.time", return_value=1000.0)
+    auth_manager = ExpiringAuthManager()
+    channel = Channel("tester")
+
+    auth_manager.fetch_secret(channel, {})
+
+    assert isinstance(auth_manager._cache, SecretCache)
+    assert auth_manager._cache == {"tester": ("user", "secret")}
+
+    clock.return_value = 1030.0
+
+    assert auth_manager._cache == {}
+
+
+def test_auth_manager_counts_each_secret_lookup_once(mocker):
+    mocker.patch("conda_auth.handlers.cache.time.time", return_value=1000.0)
+    mocker.patch.object(ExpiringAuthManager, "get_channel_settings", return_value={})
+    auth_manager = ExpiringAuthManager()
+    assert isinstance(auth_manager._cache, SecretCache)
+
+    assert auth_manager.get_secret("tester") == ("user", "secret")
+    assert auth_manager._cache.info() == SecretCacheInfo(
+        hits=0, misses=1, maxsize=DEFAULT_SECRET_CACHE_SIZE, currsize=1
+    )
+
+    assert auth_manager.get_secret("tester") == ("user", "secret")
+    auth_manager.fetch_secret(Channel("other"), {})
+
+    assert auth_manager._cache.info() == SecretCacheInfo(
+        hits=1, misses=2, maxsize=DEFAULT_SECRET_CACHE_SIZE, currsize=2
+    )
+
+
+def test_auth_manager_accepts_plain_mapping_cache():
+    cache = {}
+    auth_manager = ExpiringAuthManager(cache=cache)
+
+    auth_manager.fetch_secret(Channel("tester"), {})
+    auth_manager.cache_clear("other")
+
+    assert cache == {"tester": ("user", "secret")}
+
+    auth_manager.cache_clear()
+
+    assert cache == {}
@@ -15,9 +15,11 @@ from conda_auth.handlers.basic_auth import (
     USERNAME_PARAM_NAME,
     BasicAuthHandler,
     BasicAuthManager,
+    get_basic_auth_header,
     manager,
 )
 from conda_auth.handlers.token import TOKEN_NAME
+from conda_auth.storage import storage
 
 
 @pytest.fixture(autouse=True)
@@ -92,6 +94,28 @@ def test_basic_auth_manager_uses_stored_username():
     assert BasicAuthManager().get_username({}, record) == "admin"
 
 
+def test_basic_auth_manager_caches_stored_password_until_it_expires(mocker, keyring):
+    clock = mocker.patch("conda_auth.handlers.cache.time.time", return_value=1000.0)
+    keyring(None)
+    storage.set_credential(
+        CredentialRecord(
+            target="tester",
+            auth_type=HTTP_BASIC_AUTH_NAME,
+            username="user",
+            password="secret",
+            expires_at=1030,
+        )
+    )
+    auth_manager = BasicAuthManager()
+
+    assert auth_manager.fetch_secret(Channel("tester"), {}) == ("user", "secret")
+    assert auth_manager._cache == {"tester": ("user", "secret")}
+
+    clock.return_value = 1030.0
+
+    assert auth_manager._cache == {}
+
+
 @pytest.mark.parametrize(
     "settings",
     (None, {USERNAME_PARAM_NAME: "admin"}),
@@ -255,11 +279,16 @@ def test_basic_auth_handler(mocker, keyring):
     HTTPBasicAuth(username, password)(expected_request)
 
     assert request.headers == expected_request.headers
+    # The legacy entry is migrated to a structured record on first use
     assert keyring_mock.get_password_calls == [
         ("conda-auth::credential::channel", "credential"),
         ("conda-auth::http-basic::channel", username),
+        ("conda-auth::http-basic::channel", username),
     ]
-    keyring_mock.set_password.assert_not_called()
+    assert [call[0] for call in keyring_mock.set_password_calls] == [
+        "conda-auth::credential::channel"
+    ]
+    assert keyring_mock.delete_password_calls == [("conda-auth::http-basic::channel", username)]
 
 
 def test_basic_auth_handler_preserves_existing_authorization(
@@ -332,11 +361,16 @@ def test_basic_auth_handler_cache_reuses_keyring_secret(mocker, keyring):
     BasicAuthHandler(channel_name)
     BasicAuthHandler(channel_name)
 
+    # The legacy entry is migrated to a structured record on first use
     assert keyring_mock.get_password_calls == [
         ("conda-auth::credential::channel", "credential"),
         ("conda-auth::http-basic::channel", username),
+        ("conda-auth::http-basic::channel", username),
     ]
-    keyring_mock.set_password.assert_not_called()
+    assert [call[0] for call in keyring_mock.set_password_calls] == [
+        "conda-auth::credential::channel"
+    ]
+    assert keyring_mock.delete_password_calls == [("conda-auth::http-basic::channel", username)]
 
 
 @pytest.mark.parametrize(
@@ -398,11 +432,18 @@ def test_basic_auth_handler_allows_plaintext_http_when_configured(
     HTTPBasicAuth(username, password)(expected_request)
 
     assert request.headers == expected_request.headers
+    # The legacy entry is migrated to a structured record on first use
     assert keyring_mock.get_password_calls == [
         ("conda-auth::credential::http://example.com/private-channel", "credential"),
         ("conda-auth::http-basic::http://example.com/private-channel", username),
+        ("conda-auth::http-basic::http://example.com/private-channel", username),
+    ]
+    assert [call[0] for call in keyring_mock.set_password_calls] == [
+        "conda-auth::credential::http://example.com/private-channel"
+    ]
+    assert keyring_mock.delete_password_calls == [
+        ("conda-auth::http-basic::http://example.com/private-channel", username)
     ]
-    keyring_mock.set_password.assert_not_called()
 
 
 def test_basic_auth_handler_partial_cache_error():
@@ -523,3 +564,15 @@ def test_basic_auth_manager_get_channel_settings_uses_last_matching_setting():
         "auth": HTTP_BASIC_AUTH_NAME,
         "username": "wildcard",
     }
+
+
+@pytest.mark.parametrize(
+    ("username", "password"),
+    (("username", "password"), ("user", "pässwörd:with:colons"), ("", "")),
+    ids=("ascii", "latin1", "empty"),
+)
+def test_get_basic_auth_header_matches_requests(request_factory, username, password):
+    expected_request = request_factory()
+    HTTPBasicAuth(username, password)(expected_request)
+
+    assert get_basic_auth_header(username, password) == expected_request.headers["Authorization"]
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from conda_auth.handlers.cache import SecretCache, SecretCacheInfo, SingleFlight
+
+
+@pytest.fixture
+def clock(mocker):
+    return mocker.patch("conda_auth.handlers.cache.time.time", return_value=1000.0)
+
+
+def test_secret_cache_behaves_like_a_mapping():
+    cache = SecretCache()
+
+    cache["tester"] = ("user", "secret")
+
+    assert cache == {"tester": ("user", "secret")}
+    assert "tester" in cache
+    assert cache.get("other") is None
+    assert cache.pop("tester") == ("user", "secret")
+    assert cache.pop("tester", None) is None
+    with pytest.raises(KeyError):
+        cache.pop("tester")
+    assert len(cache) == 0
+
+
+def test_secret_cache_evicts_least_recently_used():
+    cache = SecretCache(maxsize=2)
+    cache["one"] = 1
+    cache["two"] = 2
+
+    assert cache["one"] == 1
+
+    cache["three"] = 3
+
+    assert cache == {"one": 1, "three": 3}
+
+
+def test_secret_cache_expires_entries_after_ttl(clock):
+    cache = SecretCache(ttl=60)
+    cache["tester"] = ("user", "secret")
+    clock.return_value = 1059.0
+
+    assert cache.get("tester") == ("user", "secret")
+
+    clock.return_value = 1060.0
+
+    assert cache.get("tester") is None
+    assert "tester" not in cache
+    assert cache == {}
+
+
+def test_secret_cache_expires_entries_with_credential(clock):
+    cache = SecretCache(ttl=60)
+    cache.put("tester", ("token", "secret"), expires_at=1030)
+    cache.put("later", ("token", "secret"), expires_at=2000)
+    clock.return_value = 1030.0
+
+    assert cache.get("tester") is None
+    assert cache.get("later") == ("token", "secret")
+
+    clock.return_value = 1060.0
+
+    assert cache.get("later") is None
+
+
+def test_secret_cache_without_ttl_keeps_entries(clock):
+    cache = SecretCache(ttl=None)
+    cache["tester"] = 1
+    clock.return_value = 10_000_000.0
+
+    assert cache["tester"] == 1
+
+
+def test_secret_cache_counts_hits_and_misses():
+    cache = SecretCache(maxsize=8)
+    cache["tester"] = 1
+
+    cache.get("tester")
+    cache.get("tester")
+    cache.get("other")
+
+    assert cache.info() == SecretCacheInfo(hits=2, misses=1, maxsize=8, currsize=1)
+
+
+def test_secret_cache_peek_is_not_counted(clock):
+    cache = SecretCache(maxsize=2, ttl=10)
+    cache["one"] = 1
+    cache["two"] = 2
+
+    assert cache.peek("one") == 1
+    assert cache.peek("other", "default") == "default"
+
+    cache["three"] = 3
+    clock.return_value = 1010.0
+
+    assert "one" not in cache
+    assert cache.peek("two") is None
+    assert cache.info() == SecretCacheInfo(hits=0, misses=0, maxsize=2, currsize=0)
+
+
+def test_secret_cache_is_thread_safe():
+    cache = SecretCache(maxsize=16)
+    errors = []
+
+    def worker(offset):
+        try:
+            for index in range(500):
+                key = str((offset + index) % 32)
+                cache[key] = index
+                cache.get(key)
+                cache.pop(str(index % 32), None)
+                len(cache)
+        except Exception as exc:  # pragma: no cover - only reached on failure
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(cache) <= 16
+    info = cache.info()
+    assert info.hits + info.misses == 8 * 500
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    single_flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def lookup():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "secret"
+
+    def worker():
+        results.append(single_flight.do("tester", lookup))
+
+    leader = threading.Thread(target=worker)
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    release.set()
+    for thread in (leader, *followers):
+        thread.join()
+
+    assert calls == [1]
+    assert results == ["secret"] * 5
+
+
+def test_single_flight_shares_errors_and_forgets_finished_calls():
+    single_flight = SingleFlight()
+
+    def fail():
+        raise ValueError("lookup failed")
+
+    with pytest.raises(ValueError, match="lookup failed"):
+        single_flight.do("tester", fail)
+
+    assert single_flight.do("tester", lambda: "secret") == "secret"
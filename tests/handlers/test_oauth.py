@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+from conda.models.channel import Channel
+
+from conda_auth.credentials import CredentialRecord
+from conda_auth.exceptions import CondaAuthError
+from conda_auth.handlers.oauth import (
+    OAUTH_NAME,
+    OAUTH_REFRESH_RETRY_DELAY,
+    OAuthHandler,
+    OAuthManager,
+    manager,
+    refresh_credential,
+    request_token_refresh,
+)
+from conda_auth.storage import storage
+from conda_auth.storage.files import FileLockError
+
+CHANNEL = "https://repo.example.com/private"
+
+
+def make_record(
+    access_token="access-0",
+    expires_in=900,
+    refresh_token: str | None = "refresh-0",
+    token_endpoint="https://login.example.com/token",
+):
+    return CredentialRecord(
+        target=CHANNEL,
+        auth_type=OAUTH_NAME,
+        access_token=access_token,
+        refresh_token=refresh_token,
+        expires_at=int(time.time() + expires_in),
+        token_endpoint=token_endpoint,
+    )
+
+
+def get_stored_access_token():
+    record = storage.get_credential(CHANNEL)
+    assert record is not None
+    return record.access_token
+
+
+class RefreshRecorder(threading.Event):
+    """
+    Set once a refresh happened, with every refreshed record in ``calls``.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+
+@pytest.fixture
+def oauth_manager(keyring, context_factory):
+    keyring(None)
+    oauth_manager = OAuthManager(context_factory([{"channel": CHANNEL, "auth": OAUTH_NAME}]))
+    yield oauth_manager
+    oauth_manager.cache_clear()
+
+
+@pytest.fixture
+def refreshed(mocker):
+    """
+    Replaces the token endpoint request and records every refresh.
+    """
+    refreshed = RefreshRecorder()
+
+    def refresh(record):
+        refreshed.calls.append(record)
+        refreshed.set()
+        return make_record(access_token=f"access-{len(refreshed.calls)}", expires_in=3600)
+
+    mocker.patch("conda_auth.handlers.oauth.request_token_refresh", side_effect=refresh)
+    return refreshed
+
+
+def test_oauth_handler_sends_bearer_token(monkeypatch, oauth_manager, request_factory):
+    storage.set_credential(make_record())
+    monkeypatch.setattr("conda_auth.handlers.oauth.manager", oauth_manager)
+
+    auth_handler = OAuthHandler(CHANNEL)
+
+    assert auth_handler.token == "access-0"
+    assert auth_handler(request_factory()).headers == {"Authorization": "Bearer access-0"}
+
+
+def test_oauth_handler_without_token(monkeypatch, oauth_manager):
+    monkeypatch.setattr("conda_auth.handlers.oauth.manager", oauth_manager)
+
+    with pytest.raises(CondaAuthError, match="OAuth access token not found"):
+        OAuthHandler(CHANNEL)
+
+
+def test_oauth_manager_refreshes_expired_token_on_load(oauth_manager, refreshed):
+    storage.set_credential(make_record(expires_in=-1))
+
+    token = oauth_manager.get_token(CHANNEL)
+
+    assert token.record.access_token == "access-1"
+    assert get_stored_access_token() == "access-1"
+
+
+def test_oauth_manager_refreshes_in_background(
+    monkeypatch, oauth_manager, refreshed, request_factory
+):
+    """
+    Tokens close to their expiration are refreshed without blocking the handler.
+    """
+    storage.set_credential(make_record(expires_in=1))
+    oauth_manager.refresh_margin = 900
+    monkeypatch.setattr("conda_auth.handlers.oauth.manager", oauth_manager)
+    auth_handler = OAuthHandler(CHANNEL)
+
+    assert refreshed.wait(timeout=5)
+    for _ in range(100):
+        if auth_handler.token == "access-1":
+            break
+        time.sleep(0.01)
+
+    assert auth_handler(request_factory()).headers == {"Authorization": "Bearer access-1"}
+    assert get_stored_access_token() == "access-1"
+    assert oauth_manager.get_secret(CHANNEL) == ("oauth2", "access-1")
+
+
+@pytest.mark.parametrize(
+    "error",
+    (CondaAuthError("token endpoint unavailable"), OSError("keyring is locked")),
+    ids=("token-endpoint", "storage"),
+)
+def test_oauth_manager_retries_failed_background_refresh(mocker, oauth_manager, error):
+    storage.set_credential(make_record())
+    oauth_manager.get_token(CHANNEL)
+    mocker.patch("conda_auth.handlers.oauth.request_token_refresh", side_effect=error)
+    timer = mocker.patch("conda_auth.handlers.oauth.threading.Timer")
+
+    oauth_manager._refresh_in_background(Channel(CHANNEL).canonical_name)
+
+    assert timer.call_args.args[0] == OAUTH_REFRESH_RETRY_DELAY
+
+
+def test_oauth_manager_cache_clear_cancels_refresh(oauth_manager):
+    storage.set_credential(make_record())
+    oauth_manager.get_token(CHANNEL)
+    (timer,) = oauth_manager._timers.values()
+
+    oauth_manager.cache_clear()
+
+    assert timer.finished.is_set()
+    assert oauth_manager._timers == {}
+
+
+def test_refresh_credential_uses_token_stored_by_another_process(mocker, oauth_manager, refreshed):
+    stale = make_record(expires_in=-1)
+    storage.set_credential(make_record(access_token="access-other"))
+    credential_lock = mocker.patch("conda_auth.handlers.oauth.credential_lock")
+
+    assert refresh_credential(stale).access_token == "access-other"
+    assert refreshed.calls == []
+    credential_lock.assert_not_called()
+
+
+def test_refresh_credential_never_refreshes_without_lock(mocker, oauth_manager, refreshed):
+    stale = make_record(expires_in=-1)
+    storage.set_credential(stale)
+    mocker.patch(
+        "conda_auth.handlers.oauth.credential_lock",
+        side_effect=FileLockError("Timed out after 60s waiting for lock"),
+    )
+
+    with pytest.raises(CondaAuthError, match="Timed out after 60s waiting for lock"):
+        refresh_credential(stale)
+    assert refreshed.calls == []
+
+
+def test_refresh_credential_refreshes_stored_token(oauth_manager, refreshed):
+    stale = make_record(expires_in=-1)
+    storage.set_credential(stale)
+
+    assert refresh_credential(stale).access_token == "access-1"
+    assert refreshed.calls == [stale]
+    assert get_stored_access_token() == "access-1"
+
+
+@pytest.mark.parametrize(
+    ("record", "message"),
+    (
+        (make_record(refresh_token=None), "cannot be refreshed"),
+        (make_record(token_endpoint="http://login.example.com/token"), "Use HTTPS or localhost"),
+    ),
+    ids=("no-refresh-token", "plaintext-endpoint"),
+)
+def test_request_token_refresh_rejects_invalid_records(mocker, record, message):
+    session = mocker.patch("conda.gateways.connection.session.CondaSession")
+
+    with pytest.raises(CondaAuthError, match=message):
+        request_token_refresh(record)
+
+    session.assert_not_called()
+
+
+def test_oauth_manager_is_registered():
+    assert manager.get_auth_type() == OAUTH_NAME
+    assert manager.get_auth_class() is OAuthHandler
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import logging
+
+from keyring.errors import KeyringLocked
+
+from conda_auth.credentials import CredentialRecord
+from conda_auth.handlers.basic_auth import BasicAuthManager
+from conda_auth.handlers.prefetch import get_prefetch_requests, prefetch_secrets
+from conda_auth.handlers.token import TokenAuthManager
+from conda_auth.storage import storage
+
+CHANNEL_SETTINGS = [
+    {"channel": "https://repo.example.com/one", "auth": "token"},
+    {"channel": "https://repo.example.com/two", "auth": "token"},
+    {"channel": "https://repo.example.com/*", "auth": "token"},
+    {"channel": "https://repo.example.com/basic", "auth": "http-basic", "username": "user"},
+    {"channel": "https://repo.example.com/missing", "auth": "token"},
+    {"channel": "https://repo.example.com/public"},
+]
+
+
+def test_prefetch_secrets_fills_manager_caches(keyring, context_factory, caplog):
+    """
+    Prefetching resolves every configured channel once and reports the time spent.
+    """
+    keyring_mock, _ = keyring(None)
+    context = context_factory(CHANNEL_SETTINGS)
+    token_manager = TokenAuthManager(context)
+    basic_manager = BasicAuthManager(context)
+    for target in ("one", "two"):
+        storage.set_credential(
+            CredentialRecord(
+                target=f"https://repo.example.com/{target}",
+                auth_type="token",
+                token=f"token-{target}",
+            )
+        )
+    storage.set_credential(
+        CredentialRecord(
+            target="https://repo.example.com/basic",
+            auth_type="http-basic",
+            username="user",
+            password="secret",
+        )
+    )
+
+    with caplog.at_level(logging.INFO, logger="conda"):
+        assert prefetch_secrets((token_manager, basic_manager)) == 3
+
+    assert "Prefetched 3 of 4 channel credentials" in caplog.text
+    keyring_mock.get_password_calls.clear()
+    assert token_manager.get_secret("https://repo.example.com/two") == ("token", "token-two")
+    assert basic_manager.get_secret("https://repo.example.com/basic") == ("user", "secret")
+    assert keyring_mock.get_password_calls == []
+
+
+def test_prefetch_secrets_skips_cached_channels(keyring, context_factory):
+    keyring(None)
+    manager = TokenAuthManager(context_factory(CHANNEL_SETTINGS[:2]))
+    manager._cache["https://repo.example.com/one"] = ("token", "cached")
+
+    requests = get_prefetch_requests((manager,))
+
+    assert [request.channel.canonical_name for request in requests] == [
+        "https://repo.example.com/two"
+    ]
+
+
+def test_prefetch_secrets_ignores_keyring_errors(keyring, context_factory, caplog):
+    """
+    A failing keyring does not stop the command; channels it uses report the error later.
+    """
+    keyring_mock, _ = keyring(None)
+    keyring_mock.get_password_side_effect = KeyringLocked("Keyring is locked")
+    manager = TokenAuthManager(context_factory(CHANNEL_SETTINGS[:2]))
+
+    with caplog.at_level(logging.DEBUG, logger="conda"):
+        assert prefetch_secrets((manager,)) == 0
+
+    assert "Unable to prefetch credentials" in caplog.text
+    assert "Keyring is locked" in caplog.text
+    assert not manager.is_cached("https://repo.example.com/one")
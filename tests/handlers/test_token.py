@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import re
 from unittest.mock import MagicMock
 
 import pytest
+import requests
 from conda.exceptions import CondaError
 from conda.models.channel import Channel
 
@@ -18,6 +20,7 @@ from conda_auth.handlers.token import (
     is_anaconda_dot_org,
     manager,
 )
+from conda_auth.storage import storage
 
 
 @pytest.fixture(autouse=True)
@@ -94,6 +97,22 @@ def test_token_auth_manager_with_token(keyring, channel_name, settings):
     assert manager._cache == {channel.canonical_name: (USERNAME, token)}
 
 
+def test_token_auth_manager_caches_stored_token_until_it_expires(mocker, keyring):
+    clock = mocker.patch("conda_auth.handlers.cache.time.time", return_value=1000.0)
+    keyring(None)
+    storage.set_credential(
+        CredentialRecord(target="tester", auth_type=TOKEN_NAME, token="secret", expires_at=1030)
+    )
+    auth_manager = TokenAuthManager()
+
+    assert auth_manager.fetch_secret(Channel("tester"), {}) == (USERNAME, "secret")
+    assert auth_manager._cache == {"tester": (USERNAME, "secret")}
+
+    clock.return_value = 1030.0
+
+    assert auth_manager._cache == {}
+
+
 def test_token_legacy_operations_require_keyring(mocker):
     mock_storage = mocker.patch("conda_auth.handlers.token.storage")
     mock_storage.backend = object()
@@ -186,11 +205,16 @@ def test_token_auth_handler_with_anaconda_dot_org_token(mocker, keyring):
     request = auth_handler(request)
 
     assert request.headers == {"Authorization": f"token {token}"}
+    # The legacy entry is migrated to a structured record on first use
     assert keyring_mock.get_password_calls == [
         ("conda-auth::credential::channel", "credential"),
         ("conda-auth::token::channel", USERNAME),
+        ("conda-auth::token::channel", USERNAME),
     ]
-    keyring_mock.set_password.assert_not_called()
+    assert [call[0] for call in keyring_mock.set_password_calls] == [
+        "conda-auth::credential::channel"
+    ]
+    assert keyring_mock.delete_password_calls == [("conda-auth::token::channel", USERNAME)]
 
 
 def test_token_auth_handler_with_bearer_token(mocker, keyring):
@@ -216,11 +240,18 @@ def test_token_auth_handler_with_bearer_token(mocker, keyring):
     request = auth_handler(request)
 
     assert request.headers == {"Authorization": f"Bearer {token}"}
+    # The legacy entry is migrated to a structured record on first use
     assert keyring_mock.get_password_calls == [
         ("conda-auth::credential::http://localhost", "credential"),
         ("conda-auth::token::http://localhost", USERNAME),
+        ("conda-auth::token::http://localhost", USERNAME),
+    ]
+    assert [call[0] for call in keyring_mock.set_password_calls] == [
+        "conda-auth::credential::http://localhost"
+    ]
+    assert keyring_mock.delete_password_calls == [
+        ("conda-auth::token::http://localhost", USERNAME)
     ]
-    keyring_mock.set_password.assert_not_called()
 
 
 def test_token_auth_handler_cache_reuses_keyring_secret(mocker, keyring):
@@ -239,11 +270,18 @@ def test_token_auth_handler_cache_reuses_keyring_secret(mocker, keyring):
     TokenAuthHandler(channel_name)
     TokenAuthHandler(channel_name)
 
+    # The legacy entry is migrated to a structured record on first use
     assert keyring_mock.get_password_calls == [
         ("conda-auth::credential::http://localhost", "credential"),
         ("conda-auth::token::http://localhost", USERNAME),
+        ("conda-auth::token::http://localhost", USERNAME),
+    ]
+    assert [call[0] for call in keyring_mock.set_password_calls] == [
+        "conda-auth::credential::http://localhost"
+    ]
+    assert keyring_mock.delete_password_calls == [
+        ("conda-auth::token::http://localhost", USERNAME)
     ]
-    keyring_mock.set_password.assert_not_called()
 
 
 @pytest.mark.parametrize(
@@ -291,11 +329,18 @@ def test_token_auth_handler_allows_plaintext_http_when_configured(
     request = auth_handler(request_factory())
 
     assert request.headers == {"Authorization": f"Bearer {token}"}
+    # The legacy entry is migrated to a structured record on first use
     assert keyring_mock.get_password_calls == [
         ("conda-auth::credential::http://example.com/private-channel", "credential"),
         ("conda-auth::token::http://example.com/private-channel", USERNAME),
+        ("conda-auth::token::http://example.com/private-channel", USERNAME),
+    ]
+    assert [call[0] for call in keyring_mock.set_password_calls] == [
+        "conda-auth::credential::http://example.com/private-channel"
+    ]
+    assert keyring_mock.delete_password_calls == [
+        ("conda-auth::token::http://example.com/private-channel", USERNAME)
     ]
-    keyring_mock.set_password.assert_not_called()
 
 
 def test_token_auth_handler_no_token_available_error():
@@ -350,3 +395,222 @@ def test_token_auth_manager_get_secret_loads_from_channel_settings(keyring):
 
     assert token_manager.get_secret(channel) == (USERNAME, token)
     assert token_manager._cache == {channel: (USERNAME, token)}
+
+
+@pytest.mark.parametrize(
+    ("token_header", "token_template", "expected_headers"),
+    (
+        ("X-JFrog-Art-Api", None, {"X-JFrog-Art-Api": "secret"}),
+        ("X-Auth", "Token {token}", {"X-Auth": "Token secret"}),
+        (None, "Custom {token}", {"Authorization": "Custom secret"}),
+    ),
+    ids=("header", "header-and-template", "template"),
+)
+def test_token_auth_handler_uses_stored_header_and_template(
+    monkeypatch,
+    keyring,
+    context_factory,
+    request_factory,
+    token_header,
+    token_template,
+    expected_headers,
+):
+    channel_name = "https://repo.example.com/private"
+    context = context_factory([{"channel": channel_name, "auth": TOKEN_NAME}])
+    monkeypatch.setattr(manager, "_context", context)
+    keyring(None)
+    storage.set_credential(
+        CredentialRecord(
+            target=channel_name,
+            auth_type=TOKEN_NAME,
+            token="secret",
+            token_header=token_header,
+            token_template=token_template,
+        )
+    )
+
+    auth_handler = TokenAuthHandler(channel_name)
+
+    assert auth_handler(request_factory()).headers == expected_headers
+
+
+@pytest.mark.parametrize(
+    ("token_header", "token_template", "message"),
+    (
+        ("X Auth", None, "Invalid token header"),
+        (None, "Bearer", "must contain '{token}'"),
+        (None, "{token} {user}", "must contain '{token}'"),
+        (None, "{token!r}", "must contain '{token}'"),
+        (None, "Bearer {token", "Invalid token template"),
+        (None, "Bearer {token}\r\nX-Other: 1", "single line"),
+    ),
+    ids=("header", "no-field", "other-field", "conversion", "malformed", "multi-line"),
+)
+def test_token_auth_handler_rejects_invalid_header_and_template(
+    monkeypatch, keyring, context_factory, token_header, token_template, message
+):
+    channel_name = "https://repo.example.com/private"
+    context = context_factory([{"channel": channel_name, "auth": TOKEN_NAME}])
+    monkeypatch.setattr(manager, "_context", context)
+    keyring(None)
+    storage.set_credential(
+        CredentialRecord(
+            target=channel_name,
+            auth_type=TOKEN_NAME,
+            token="secret",
+            token_header=token_header,
+            token_template=token_template,
+        )
+    )
+
+    with pytest.raises(CondaAuthError, match=re.escape(message)):
+        TokenAuthHandler(channel_name)
+
+
+def test_token_auth_handler_reloads_changed_token(
+    monkeypatch, keyring, context_factory, request_factory
+):
+    channel_name = "https://repo.example.com/private"
+    context = context_factory([{"channel": channel_name, "auth": TOKEN_NAME}])
+    monkeypatch.setattr(manager, "_context", context)
+    keyring(None)
+    storage.set_credential(
+        CredentialRecord(target=channel_name, auth_type=TOKEN_NAME, token="old")
+    )
+    auth_handler = TokenAuthHandler(channel_name)
+    request = auth_handler(request_factory())
+
+    assert auth_handler.reload_credentials() is False
+
+    storage.set_credential(
+        CredentialRecord(
+            target=channel_name,
+            auth_type=TOKEN_NAME,
+            token="new",
+            token_header="X-Auth",
+        )
+    )
+    assert auth_handler.reload_credentials() is True
+
+    auth_handler.apply_credentials(request)
+    assert request.headers == {"X-Auth": "new"}
+    assert request.hooks["response"] == [auth_handler.handle_auth_failure]
+
+
+def rejected_response(mocker, auth_handler, url):
+    """
+    Return a 401 response to a request sent with the current credentials of ``auth_handler``.
+    """
+    response = mocker.Mock(status_code=401, raw=None)
+    response.request = auth_handler(requests.Request("GET", url).prepare())
+    response.connection.send.return_value = mocker.Mock(status_code=200, history=[])
+    return response
+
+
+def test_token_auth_handler_retries_every_request_sent_with_old_token(
+    mocker, monkeypatch, keyring, context_factory
+):
+    """
+    Parallel requests rejected after a rotation are all retried, not only the first one.
+    """
+    channel_name = "https://repo.example.com/private"
+    context = context_factory([{"channel": channel_name, "auth": TOKEN_NAME}])
+    monkeypatch.setattr(manager, "_context", context)
+    keyring(None)
+    storage.set_credential(
+        CredentialRecord(target=channel_name, auth_type=TOKEN_NAME, token="old")
+    )
+    auth_handler = TokenAuthHandler(channel_name)
+    responses = [
+        rejected_response(mocker, auth_handler, f"{channel_name}/noarch/{name}")
+        for name in ("repodata.json", "current_repodata.json")
+    ]
+    storage.set_credential(
+        CredentialRecord(target=channel_name, auth_type=TOKEN_NAME, token="new")
+    )
+
+    for response in responses:
+        retry = auth_handler.handle_auth_failure(response)
+
+        assert retry is response.connection.send.return_value
+        (prep,), _ = response.connection.send.call_args
+        assert prep.headers["Authorization"] == "Bearer new"
+
+
+def test_token_auth_handler_does_not_retry_current_token(
+    mocker, monkeypatch, keyring, context_factory
+):
+    channel_name = "https://repo.example.com/private"
+    context = context_factory([{"channel": channel_name, "auth": TOKEN_NAME}])
+    monkeypatch.setattr(manager, "_context", context)
+    keyring(None)
+    storage.set_credential(
+        CredentialRecord(target=channel_name, auth_type=TOKEN_NAME, token="old")
+    )
+    auth_handler = TokenAuthHandler(channel_name)
+    response = rejected_response(mocker, auth_handler, f"{channel_name}/noarch/repodata.json")
+
+    assert auth_handler.handle_auth_failure(response) is response
+    response.connection.send.assert_not_called()
+
+
+def test_token_auth_handler_keeps_response_when_reload_fails(
+    mocker, monkeypatch, keyring, context_factory, caplog
+):
+    """
+    Unexpected errors while reloading are logged instead of escaping the response hook.
+    """
+    channel_name = "https://repo.example.com/private"
+    context = context_factory([{"channel": channel_name, "auth": TOKEN_NAME}])
+    monkeypatch.setattr(manager, "_context", context)
+    keyring(None)
+    storage.set_credential(
+        CredentialRecord(target=channel_name, auth_type=TOKEN_NAME, token="old")
+    )
+    auth_handler = TokenAuthHandler(channel_name)
+    response = rejected_response(mocker, auth_handler, f"{channel_name}/noarch/repodata.json")
+    monkeypatch.setattr(manager, "get_secret", mocker.Mock(side_effect=RuntimeError("boom")))
+
+    assert auth_handler.handle_auth_failure(response) is response
+    assert "Could not reload credentials for https://repo.example.com/private: boom" in (
+        caplog.text
+    )
+    response.connection.send.assert_not_called()
+
+
+def test_token_legacy_migration_runs_once(keyring):
+    """
+    Migrated legacy entries cost a single keyring read afterwards, missing ones none.
+    """
+    keyring_mock, _ = keyring(None)
+    keyring_mock.secrets[("conda-auth::token::migrated", USERNAME)] = "secret"
+
+    for channel_name in ("migrated", "missing"):
+        TokenAuthManager().get_credential_record(Channel(channel_name))
+    keyring_mock.get_password_calls.clear()
+
+    record = TokenAuthManager().get_credential_record(Channel("migrated"))
+    assert record is not None
+    assert record.token == "secret"
+    assert TokenAuthManager().get_credential_record(Channel("missing")) is None
+    assert keyring_mock.get_password_calls == [
+        ("conda-auth::credential::migrated", "credential"),
+    ]
+    assert ("conda-auth::token::migrated", USERNAME) not in keyring_mock.secrets
+
+
+def test_token_legacy_migration_retries_after_failed_write(keyring):
+    keyring_mock, _ = keyring(None)
+    keyring_mock.secrets[("conda-auth::token::tester", USERNAME)] = "secret"
+    keyring_mock.set_password_side_effect = OSError("keyring is locked")
+
+    record = TokenAuthManager().get_credential_record(Channel("tester"))
+    assert record is not None
+    assert record.token == "secret"
+
+    keyring_mock.set_password_side_effect = None
+    keyring_mock.get_password_calls.clear()
+    record = TokenAuthManager().get_credential_record(Channel("tester"))
+    assert record is not None
+    assert record.token == "secret"
+    assert ("conda-auth::token::tester", USERNAME) in keyring_mock.get_password_calls
@@ -4,11 +4,13 @@ import base64
 import json
 import queue
 import threading
+import time
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from typing import Literal
-from urllib.parse import unquote, urlsplit
+from urllib.parse import parse_qsl, unquote, urlsplit
 
 from conda.base.context import context
 
@@ -30,6 +32,43 @@ class RequestRecord:
         return self.headers.get("Authorization")
 
 
+def start_http_server(
+    host: str,
+    handler_class: type[BaseHTTPRequestHandler],
+) -> tuple[ThreadingHTTPServer, threading.Thread]:
+    class Server(ThreadingHTTPServer):
+        allow_reuse_address = True
+        request_queue_size = 64
+
+    started: queue.Queue[ThreadingHTTPServer | BaseException] = queue.Queue(maxsize=1)
+
+    def run() -> None:
+        try:
+            with Server((host, 0), handler_class) as httpd:
+                started.put(httpd)
+                httpd.serve_forever()
+        except BaseException as exc:
+            started.put(exc)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    result = started.get(timeout=5)
+    if isinstance(result, BaseException):
+        raise result
+    return result, thread
+
+
+def stop_http_server(
+    server: ThreadingHTTPServer | None,
+    thread: threading.Thread | None,
+) -> None:
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+    if thread is not None:
+        thread.join(timeout=5)
+
+
 @dataclass
 class AuthenticatedChannelServer:
     root: Path
@@ -144,33 +183,10 @@ class AuthenticatedChannelServer:
             def log_message(self, format: str, *args: object) -> None:
                 return
 
-        class Server(ThreadingHTTPServer):
-            allow_reuse_address = True
-            request_queue_size = 64
-
-        started: queue.Queue[ThreadingHTTPServer | BaseException] = queue.Queue(maxsize=1)
-
-        def run() -> None:
-            try:
-                with Server((self.host, 0), Handler) as httpd:
-                    self._server = httpd
-                    started.put(httpd)
-                    httpd.serve_forever()
-            except BaseException as exc:
-                started.put(exc)
-
-        self._thread = threading.Thread(target=run, daemon=True)
-        self._thread.start()
-        result = started.get(timeout=5)
-        if isinstance(result, BaseException):
-            raise result
+        self._server, self._thread = start_http_server(self.host, Handler)
 
     def stop(self) -> None:
-        if self._server is not None:
-            self._server.shutdown()
-            self._server.server_close()
-        if self._thread is not None:
-            self._thread.join(timeout=5)
+        stop_http_server(self._server, self._thread)
 
     def handle_request(self, handler: BaseHTTPRequestHandler, *, send_body: bool) -> None:
         status_code = 500
@@ -255,3 +271,90 @@ class AuthenticatedChannelServer:
                     status_code=status_code,
                 )
             )
+
+
+@dataclass
+class TokenEndpointServer:
+    """
+    Stand-in OAuth 2.0 token endpoint that answers ``refresh_token`` grants.
+
+    Every refresh issues ``access-<n>`` and rotates the refresh token to ``refresh-<n>``.
+    ``on_issue`` is called with each new access token, e.g. to make a channel server
+    accept it.
+    """
+
+    refresh_token: str = "refresh-0"
+    expires_in: int = 900
+    host: str = "127.0.0.1"
+    status_code: int = 200
+    delay: float = 0
+    on_issue: Callable[[str], None] | None = None
+    requests: list[dict[str, str]] = field(default_factory=list)
+
+    _server: ThreadingHTTPServer | None = field(default=None, init=False)
+    _thread: threading.Thread | None = field(default=None, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    @classmethod
+    def start(cls, **kwargs) -> TokenEndpointServer:
+        server = cls(**kwargs)
+        server.start_server()
+        return server
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("Server is not running")
+        return f"http://{self.host}:{self._server.server_port}/token"
+
+    def start_server(self) -> None:
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                owner.handle_request(self)
+
+            def log_message(self, format: str, *args: object) -> None:
+                return
+
+        self._server, self._thread = start_http_server(self.host, Handler)
+
+    def stop(self) -> None:
+        stop_http_server(self._server, self._thread)
+
+    def handle_request(self, handler: BaseHTTPRequestHandler) -> None:
+        length = int(handler.headers.get("Content-Length", 0))
+        form = dict(parse_qsl(handler.rfile.read(length).decode()))
+        if self.delay:
+            time.sleep(self.delay)
+
+        with self._lock:
+            self.requests.append(form)
+            if (
+                self.status_code != 200
+                or form.get("grant_type") != "refresh_token"
+                or form.get("refresh_token") != self.refresh_token
+            ):
+                status_code = self.status_code if self.status_code != 200 else 400
+                body = json.dumps({"error": "invalid_grant"}).encode()
+            else:
+                count = len(self.requests)
+                access_token = f"access-{count}"
+                self.refresh_token = f"refresh-{count}"
+                if self.on_issue is not None:
+                    self.on_issue(access_token)
+                status_code = 200
+                body = json.dumps(
+                    {
+                        "access_token": access_token,
+                        "token_type": "Bearer",
+                        "expires_in": self.expires_in,
+                        "refresh_token": self.refresh_token,
+                    }
+                ).encode()
+
+        handler.send_response(status_code)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
@@ -9,7 +9,7 @@ from pathlib import Path
 
 import pytest
 
-from .auth_server import AuthenticatedChannelServer, AuthMode
+from .auth_server import AuthenticatedChannelServer, AuthMode, TokenEndpointServer
 
 
 @dataclass
@@ -90,3 +90,18 @@ def channel_server(
 
     for server in reversed(servers):
         server.stop()
+
+
+@pytest.fixture
+def token_endpoint() -> Iterator[Callable[..., TokenEndpointServer]]:
+    servers: list[TokenEndpointServer] = []
+
+    def start(**kwargs) -> TokenEndpointServer:
+        server = TokenEndpointServer.start(**kwargs)
+        servers.append(server)
+        return server
+
+    yield start
+
+    for server in reversed(servers):
+        server.stop()
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from conda_auth.credentials import CredentialRecord
+from conda_auth.handlers.basic_auth import HTTP_BASIC_AUTH_NAME, BasicAuthHandler
+from conda_auth.handlers.basic_auth import manager as basic_auth_manager
+from conda_auth.storage.keyring import KeyringStorage
+
+pytestmark = pytest.mark.integration
+
+THREADS = 32
+
+
+@pytest.fixture
+def clean_basic_auth_manager(monkeypatch):
+    monkeypatch.setattr(basic_auth_manager, "_context", basic_auth_manager._context)
+    basic_auth_manager.cache_clear()
+    yield basic_auth_manager
+    basic_auth_manager.cache_clear()
+
+
+def test_concurrent_handlers_share_one_credential_lookup(
+    channel_server, keyring, context_factory, clean_basic_auth_manager
+):
+    server = channel_server(mode="basic", username="user", password="pass")
+    keyring_mock, _ = keyring(None)
+    KeyringStorage().set_credential(
+        CredentialRecord(
+            target=server.url,
+            auth_type=HTTP_BASIC_AUTH_NAME,
+            username="user",
+            password="pass",
+        )
+    )
+    clean_basic_auth_manager._context = context_factory(
+        [{"channel": server.url, "auth": HTTP_BASIC_AUTH_NAME, "username": "user"}]
+    )
+    keyring_get_password = keyring_mock.get_password.side_effect
+
+    def slow_get_password(key_id, username):
+        # Keep the lookup in flight long enough for every thread to miss the cache
+        time.sleep(0.2)
+        return keyring_get_password(key_id, username)
+
+    keyring_mock.get_password.side_effect = slow_get_password
+    keyring_mock.get_password_calls.clear()
+    barrier = threading.Barrier(THREADS)
+
+    def download() -> int:
+        barrier.wait(timeout=5)
+        handler = BasicAuthHandler(server.url)
+        response = requests.get(server.get_url("noarch/repodata.json"), auth=handler, timeout=5)
+        return response.status_code
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        status_codes = list(executor.map(lambda _: download(), range(THREADS)))
+
+    assert status_codes == [200] * THREADS
+    assert keyring_mock.get_password_calls == [
+        (f"conda-auth::credential::{server.url}", "credential")
+    ]
+    assert all(record.authorization == server.expected_basic_header for record in server.records)
+    assert len(server.records) == THREADS
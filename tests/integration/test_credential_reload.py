@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import pytest
+import requests
+
+from conda_auth.credentials import CredentialRecord
+from conda_auth.handlers.basic_auth import HTTP_BASIC_AUTH_NAME, BasicAuthHandler
+from conda_auth.handlers.basic_auth import manager as basic_auth_manager
+from conda_auth.handlers.retry import AuthRetryInfo, get_auth_retry_info, metrics
+from conda_auth.handlers.token import TOKEN_NAME, TokenAuthHandler
+from conda_auth.handlers.token import manager as token_auth_manager
+from conda_auth.storage import storage
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture(autouse=True)
+def clean_managers(monkeypatch):
+    for manager in (basic_auth_manager, token_auth_manager):
+        monkeypatch.setattr(manager, "_context", manager._context)
+        manager.cache_clear()
+    metrics.reset()
+    yield
+    for manager in (basic_auth_manager, token_auth_manager):
+        manager.cache_clear()
+
+
+def test_token_handler_retries_with_rotated_token(channel_server, keyring, context_factory):
+    """
+    A token rotated while conda is running is picked up after the first rejected request.
+    """
+    server = channel_server(mode="token", token="old-token")
+    keyring(None)
+    storage.set_credential(
+        CredentialRecord(target=server.url, auth_type=TOKEN_NAME, token="old-token")
+    )
+    token_auth_manager._context = context_factory([{"channel": server.url, "auth": TOKEN_NAME}])
+    session = requests.Session()
+    session.auth = TokenAuthHandler(server.url)
+    url = server.get_url("noarch/repodata.json")
+
+    assert session.get(url, timeout=5).status_code == 200
+
+    server.token = "new-token"
+    storage.set_credential(
+        CredentialRecord(target=server.url, auth_type=TOKEN_NAME, token="new-token")
+    )
+    response = session.get(url, timeout=5)
+
+    assert response.status_code == 200
+    assert [record.status_code for record in server.records] == [200, 403, 200]
+    assert server.records[-1].authorization == "Bearer new-token"
+    assert get_auth_retry_info() == AuthRetryInfo(rejected=1, retried=1, recovered=1)
+
+    assert session.get(url, timeout=5).status_code == 200
+    assert get_auth_retry_info() == AuthRetryInfo(rejected=1, retried=1, recovered=1)
+
+
+def test_basic_auth_handler_retries_with_rotated_password(
+    channel_server, keyring, context_factory
+):
+    server = channel_server(mode="basic", username="user", password="old-password")
+    keyring(None)
+    record = CredentialRecord(
+        target=server.url,
+        auth_type=HTTP_BASIC_AUTH_NAME,
+        username="user",
+        password="old-password",
+    )
+    storage.set_credential(record)
+    basic_auth_manager._context = context_factory(
+        [{"channel": server.url, "auth": HTTP_BASIC_AUTH_NAME, "username": "user"}]
+    )
+    handler = BasicAuthHandler(server.url)
+
+    server.password = "new-password"
+    storage.set_credential(replace(record, password="new-password"))
+    response = requests.get(server.get_url("noarch/repodata.json"), auth=handler, timeout=5)
+
+    assert response.status_code == 200
+    assert [record.status_code for record in server.records] == [401, 200]
+    assert server.records[-1].authorization == server.expected_basic_header
+    assert get_auth_retry_info() == AuthRetryInfo(rejected=1, retried=1, recovered=1)
+
+
+def test_handler_does_not_retry_unchanged_credentials(channel_server, keyring, context_factory):
+    server = channel_server(mode="token", token="server-token")
+    keyring(None)
+    storage.set_credential(
+        CredentialRecord(target=server.url, auth_type=TOKEN_NAME, token="stale")
+    )
+    token_auth_manager._context = context_factory([{"channel": server.url, "auth": TOKEN_NAME}])
+
+    response = requests.get(
+        server.get_url("noarch/repodata.json"), auth=TokenAuthHandler(server.url), timeout=5
+    )
+
+    assert response.status_code == 403
+    assert [record.status_code for record in server.records] == [403]
+    assert get_auth_retry_info() == AuthRetryInfo(rejected=1, retried=0, recovered=0)
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+import requests
+
+from conda_auth.credentials import CredentialRecord
+from conda_auth.handlers.oauth import OAUTH_NAME, OAuthHandler, OAuthManager
+from conda_auth.storage.keyring import KeyringStorage
+
+pytestmark = pytest.mark.integration
+
+
+def test_oauth_handler_refreshes_token_before_it_expires(
+    monkeypatch, channel_server, token_endpoint, keyring, context_factory
+):
+    """
+    Downloads keep working across a token expiry while one background refresh runs.
+    """
+    server = channel_server(mode="token", token="access-0")
+    endpoint = token_endpoint(
+        expires_in=3600, on_issue=lambda token: setattr(server, "token", token)
+    )
+    keyring(None)
+    KeyringStorage().set_credential(
+        CredentialRecord(
+            target=server.url,
+            auth_type=OAUTH_NAME,
+            access_token="access-0",
+            refresh_token="refresh-0",
+            expires_at=int(time.time()) + 2,
+            token_endpoint=endpoint.url,
+            client_id="conda",
+        )
+    )
+    oauth_manager = OAuthManager(
+        context_factory([{"channel": server.url, "auth": OAUTH_NAME}]),
+        refresh_margin=60,
+    )
+    monkeypatch.setattr("conda_auth.handlers.oauth.manager", oauth_manager)
+    handler = OAuthHandler(server.url)
+
+    status_codes = []
+    deadline = time.monotonic() + 3
+    while time.monotonic() < deadline:
+        response = requests.get(server.get_url("noarch/repodata.json"), auth=handler, timeout=5)
+        status_codes.append(response.status_code)
+        time.sleep(0.05)
+    oauth_manager.cache_clear()
+
+    assert set(status_codes) == {200}
+    assert endpoint.requests == [
+        {"grant_type": "refresh_token", "refresh_token": "refresh-0", "client_id": "conda"}
+    ]
+    stored = KeyringStorage().get_credential(server.url)
+    assert stored is not None
+    assert (stored.access_token, stored.refresh_token) == ("access-1", "refresh-1")
+    assert server.records[-1].authorization == "Bearer access-1"
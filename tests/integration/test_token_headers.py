@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import pytest
+import requests
+
+from conda_auth.credentials import CredentialRecord
+from conda_auth.handlers.token import TOKEN_NAME, TokenAuthHandler
+from conda_auth.handlers.token import manager as token_auth_manager
+from conda_auth.storage.keyring import KeyringStorage
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def clean_token_auth_manager(monkeypatch):
+    monkeypatch.setattr(token_auth_manager, "_context", token_auth_manager._context)
+    token_auth_manager.cache_clear()
+    yield token_auth_manager
+    token_auth_manager.cache_clear()
+
+
+@pytest.mark.parametrize(
+    ("token_header", "token_template"),
+    (("X-JFrog-Art-Api", "{token}"), ("X-Auth", "Token {token}")),
+)
+def test_token_handler_sends_stored_header(
+    channel_server,
+    keyring,
+    context_factory,
+    clean_token_auth_manager,
+    token_header,
+    token_template,
+):
+    server = channel_server(
+        mode="token",
+        token="secret-token",
+        token_header=token_header,
+        token_template=token_template,
+    )
+    keyring(None)
+    KeyringStorage().set_credential(
+        CredentialRecord(
+            target=server.url,
+            auth_type=TOKEN_NAME,
+            token="secret-token",
+            token_header=token_header,
+            token_template=token_template,
+        )
+    )
+    clean_token_auth_manager._context = context_factory(
+        [{"channel": server.url, "auth": TOKEN_NAME}]
+    )
+
+    response = requests.get(
+        server.get_url("noarch/repodata.json"),
+        auth=TokenAuthHandler(server.url),
+        timeout=5,
+    )
+
+    assert response.status_code == 200
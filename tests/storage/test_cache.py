@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import os
+import sys
+from contextlib import contextmanager
+
+import pytest
+
+from conda_auth.constants import CREDENTIAL_CACHE_TTL_SETTING
+from conda_auth.credentials import CredentialRecord
+from conda_auth.storage import cache as cache_module
+from conda_auth.storage import get_storage_backend
+from conda_auth.storage.base import Storage, find_backend
+from conda_auth.storage.cache import (
+    CredentialCacheStorage,
+    decrypt_payload,
+    encrypt_payload,
+)
+from conda_auth.storage.files import FileLockError
+from conda_auth.storage.keyring import KEYRING_CACHE_KEY_SERVICE, KeyringStorage
+
+KEY = b"k" * 32
+
+
+class MemoryStorage(Storage):
+    def __init__(self):
+        self.records = {}
+        self.get_calls = []
+
+    def set_credential(self, record):
+        self.records[record.target] = record
+
+    def get_credential(self, target):
+        self.get_calls.append(target)
+        return self.records.get(target)
+
+    def delete_credential(self, target):
+        self.records.pop(target, None)
+
+
+@pytest.fixture
+def backend():
+    return MemoryStorage()
+
+
+@pytest.fixture
+def cache_factory(tmp_path, backend):
+    def _cache_factory(ttl=60):
+        return CredentialCacheStorage(
+            backend,
+            tmp_path / "credentials.cache",
+            ttl=ttl,
+            get_key=lambda: KEY,
+        )
+
+    return _cache_factory
+
+
+def test_encrypted_payload_round_trip():
+    payload = encrypt_payload(KEY, b"secret-token" * 10)
+
+    assert b"secret-token" not in payload
+    assert decrypt_payload(KEY, payload) == b"secret-token" * 10
+
+
+@pytest.mark.parametrize(
+    "tamper",
+    (
+        lambda payload: payload[:-1] + bytes([payload[-1] ^ 1]),
+        lambda payload: payload[:30] + bytes([payload[30] ^ 1]) + payload[31:],
+        lambda payload: b"XXXX" + payload[4:],
+        lambda payload: payload[:10],
+    ),
+    ids=("tag", "ciphertext", "magic", "truncated"),
+)
+def test_decrypt_rejects_modified_payload(tamper):
+    payload = encrypt_payload(KEY, b"secret-token" * 10)
+
+    assert decrypt_payload(KEY, tamper(payload)) is None
+
+
+def test_decrypt_rejects_other_key():
+    assert decrypt_payload(b"o" * 32, encrypt_payload(KEY, b"secret")) is None
+
+
+def test_cache_serves_warm_reads_without_backend(backend, cache_factory):
+    record = CredentialRecord(target="tester", auth_type="token", token="secret")
+    backend.set_credential(record)
+
+    assert cache_factory().get_credential("tester") == record
+    # A new instance simulates a new conda process reading the same cache file
+    assert cache_factory().get_credential("tester") == record
+    assert backend.get_calls == ["tester"]
+
+
+def test_cache_reads_misses_from_backend_in_one_batch(mocker, backend, cache_factory):
+    one = CredentialRecord(target="one", auth_type="token", token="one")
+    two = CredentialRecord(target="two", auth_type="token", token="two")
+    backend.set_credential(one)
+    backend.set_credential(two)
+    cache_factory().get_credential("one")
+    get_credentials = mocker.spy(backend, "get_credentials")
+
+    cache = cache_factory()
+    assert cache.get_credentials(["one", "two", "three"]) == {
+        "one": one,
+        "two": two,
+        "three": None,
+    }
+    get_credentials.assert_called_once_with(["two", "three"])
+    assert cache_factory().get_credentials(["one", "two"]) == {"one": one, "two": two}
+    assert backend.get_calls == ["one", "two", "three"]
+
+
+def test_cache_file_is_encrypted_and_private(tmp_path, backend, cache_factory):
+    cache_factory().set_credential(
+        CredentialRecord(target="tester", auth_type="token", token="secret-token")
+    )
+
+    path = tmp_path / "credentials.cache"
+    assert b"secret-token" not in path.read_bytes()
+    if sys.platform != "win32":
+        assert os.stat(path).st_mode & 0o777 == 0o600
+
+
+def test_cache_expires_entries_after_ttl(mocker, backend, cache_factory):
+    record = CredentialRecord(target="tester", auth_type="token", token="secret")
+    backend.set_credential(record)
+    mock_time = mocker.patch("conda_auth.storage.cache.time.time", return_value=1000.0)
+    cache = cache_factory(ttl=60)
+    cache.get_credential("tester")
+
+    mock_time.return_value = 1061.0
+
+    assert cache.get_credential("tester") == record
+    assert backend.get_calls == ["tester", "tester"]
+
+
+def test_cache_expires_entries_with_record(mocker, backend, cache_factory):
+    record = CredentialRecord(target="tester", auth_type="oauth", expires_at=1010)
+    backend.set_credential(record)
+    mock_time = mocker.patch("conda_auth.storage.cache.time.time", return_value=1000.0)
+    cache = cache_factory(ttl=60)
+    cache.get_credential("tester")
+
+    mock_time.return_value = 1011.0
+    cache.get_credential("tester")
+
+    assert backend.get_calls == ["tester", "tester"]
+
+
+def test_cache_writes_through(backend, cache_factory):
+    cache = cache_factory()
+    record = CredentialRecord(target="tester", auth_type="token", token="secret")
+
+    cache.set_credential(record)
+
+    assert backend.records == {"tester": record}
+    assert cache_factory().get_credential("tester") == record
+
+    cache.delete_credential("tester")
+
+    assert backend.records == {}
+    assert cache_factory().get_credential("tester") is None
+
+
+def test_cache_updates_file_under_lock(mocker, tmp_path, cache_factory):
+    held = []
+
+    @contextmanager
+    def file_lock(path):
+        held.append(path)
+        yield
+        held.remove(path)
+
+    def write_private_file(path, payload):
+        lock_paths.append(list(held))
+        write(path, payload)
+
+    lock_paths = []
+    write = cache_module.write_private_file
+    mocker.patch("conda_auth.storage.cache.file_lock", file_lock)
+    mocker.patch("conda_auth.storage.cache.write_private_file", write_private_file)
+
+    cache_factory().set_credential(CredentialRecord(target="tester", auth_type="token"))
+
+    assert lock_paths == [[tmp_path / ".credentials.cache.lock"]]
+
+
+def test_cache_update_keeps_entries_of_other_processes(tmp_path, backend, cache_factory):
+    one = CredentialRecord(target="one", auth_type="token", token="one")
+    two = CredentialRecord(target="two", auth_type="token", token="two")
+    cache = cache_factory()
+    cache.set_credential(one)
+    cache.get_credential("one")
+    cache_factory().set_credential(two)
+    # With a coarse file system clock, the other write can leave a stamp that matches
+    stat = (tmp_path / "credentials.cache").stat()
+    cache._entries_stamp = (stat.st_mtime_ns, stat.st_size)
+
+    cache.delete_credential("one")
+    backend.records.clear()
+
+    assert cache_factory().get_credentials(["one", "two"]) == {"one": None, "two": two}
+
+
+def test_cache_drops_file_when_lock_is_unavailable(mocker, tmp_path, backend, cache_factory):
+    record = CredentialRecord(target="tester", auth_type="token", token="secret")
+    cache = cache_factory()
+    cache.set_credential(record)
+    mocker.patch(
+        "conda_auth.storage.cache.file_lock",
+        side_effect=FileLockError("Timed out after 60s waiting for lock"),
+    )
+
+    cache.delete_credential("tester")
+
+    assert not (tmp_path / "credentials.cache").exists()
+    assert cache_factory().get_credential("tester") is None
+
+
+def test_cache_ignores_unreadable_file(tmp_path, backend, cache_factory):
+    (tmp_path / "credentials.cache").write_bytes(b"garbage")
+    record = CredentialRecord(target="tester", auth_type="token", token="secret")
+    backend.set_credential(record)
+
+    assert cache_factory().get_credential("tester") == record
+
+
+def test_cache_clear_removes_file(tmp_path, cache_factory):
+    cache = cache_factory()
+    cache.set_credential(CredentialRecord(target="tester", auth_type="token", token="secret"))
+
+    cache.clear()
+    cache.clear()
+
+    assert not (tmp_path / "credentials.cache").exists()
+
+
+def test_storage_backend_uses_cache_when_enabled(mocker, keyring):
+    keyring_mock, _ = keyring(None)
+    mocker.patch(
+        "conda_auth.storage.get_plugin_setting",
+        side_effect=lambda name, default: 300 if name == CREDENTIAL_CACHE_TTL_SETTING else default,
+    )
+
+    backend = find_backend(get_storage_backend(), CredentialCacheStorage)
+
+    assert isinstance(backend, CredentialCacheStorage)
+    assert backend.ttl == 300
+    assert find_backend(backend, KeyringStorage) is backend.backend
+    assert len(backend.key) == 32
+    assert [call[0] for call in keyring_mock.set_password_calls] == [KEYRING_CACHE_KEY_SERVICE]
+
+
+def test_storage_backend_skips_cache_by_default(keyring):
+    keyring(None)
+
+    backend = get_storage_backend()
+
+    assert find_backend(backend, CredentialCacheStorage) is None
+    assert find_backend(backend, KeyringStorage) is not None
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import json
+import os
+import stat
+import sys
+
+import pytest
+
+from conda_auth.credentials import CredentialRecord
+from conda_auth.exceptions import CondaAuthError
+from conda_auth.storage.credential_file import CREDENTIAL_FILE_VERSION, FileStorage
+from conda_auth.storage.files import FileLockError
+
+posix_only = pytest.mark.skipif(sys.platform == "win32", reason="POSIX file permissions")
+
+
+def make_record(target, token="token"):
+    return CredentialRecord(target=target, auth_type="token", token=token)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "data" / "credentials.json"
+
+
+def test_file_storage_stores_records(path):
+    storage = FileStorage(path)
+    record = make_record("https://repo.example.com/private")
+
+    storage.set_credential(record)
+
+    assert storage.get_credential(record.target) == record
+    assert FileStorage(path).get_credential(record.target) == record
+    assert json.loads(path.read_text()) == {
+        "version": CREDENTIAL_FILE_VERSION,
+        "credentials": [record.to_dict()],
+    }
+
+
+def test_file_storage_without_file(path):
+    storage = FileStorage(path)
+
+    assert storage.get_credential("missing") is None
+    assert storage.get_credentials(["one", "two"]) == {"one": None, "two": None}
+    assert list(storage.iter_credentials()) == []
+
+    storage.delete_credential("missing")
+
+    assert not path.exists()
+
+
+@posix_only
+def test_file_storage_creates_private_file(path):
+    FileStorage(path).set_credential(make_record("tester"))
+
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+    assert not list(path.parent.glob("*.tmp"))
+
+
+@posix_only
+def test_file_storage_refuses_file_other_users_can_read(path):
+    FileStorage(path).set_credential(make_record("tester"))
+    path.chmod(0o644)
+
+    with pytest.raises(CondaAuthError, match="can be accessed by other users"):
+        FileStorage(path).get_credential("tester")
+
+
+def test_file_storage_updates_and_deletes_records(path):
+    storage = FileStorage(path)
+    storage.set_credentials([make_record("one"), make_record("two"), make_record("three")])
+
+    storage.set_credential(make_record("two", token="updated"))
+    storage.delete_credentials(["one", "missing"])
+
+    assert FileStorage(path).get_credentials(["one", "two", "three"]) == {
+        "one": None,
+        "two": make_record("two", token="updated"),
+        "three": make_record("three"),
+    }
+    assert [record.target for record in storage.iter_credentials()] == ["two", "three"]
+
+
+def test_file_storage_keeps_records_written_by_other_processes(path):
+    storage = FileStorage(path)
+    other = FileStorage(path)
+    storage.get_credential("one")
+    other.get_credential("one")
+
+    storage.set_credential(make_record("one"))
+    other.set_credential(make_record("two"))
+
+    assert storage.get_credentials(["one", "two"]) == {
+        "one": make_record("one"),
+        "two": make_record("two"),
+    }
+
+
+def test_file_storage_reads_file_only_when_changed(path, mocker):
+    storage = FileStorage(path)
+    storage.set_credential(make_record("tester"))
+    read_bytes = mocker.spy(type(path), "read_bytes")
+
+    storage.get_credential("tester")
+    storage.get_credentials(["tester", "other"])
+
+    assert read_bytes.call_count == 0
+
+    FileStorage(path).set_credential(make_record("other"))
+    read_bytes.reset_mock()
+
+    assert storage.get_credential("other") == make_record("other")
+    assert storage.get_credential("tester") == make_record("tester")
+    assert read_bytes.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "payload, message",
+    (
+        ("not json", "Unable to read credentials"),
+        ('["tester"]', "is invalid"),
+        ('{"version": 1, "credentials": ["tester"]}', "is invalid"),
+        ('{"version": 2, "credentials": []}', "unsupported version 2"),
+        ('{"version": 1, "credentials": [{"target": "tester"}]}', "without 'auth_type'"),
+    ),
+)
+def test_file_storage_rejects_invalid_file(path, payload, message):
+    path.parent.mkdir(parents=True)
+    path.write_text(payload)
+    os.chmod(path, 0o600)
+
+    with pytest.raises(CondaAuthError, match=message):
+        FileStorage(path).get_credential("tester")
+
+
+def test_file_storage_reports_write_errors(path, mocker):
+    mocker.patch(
+        "conda_auth.storage.credential_file.write_private_file",
+        side_effect=PermissionError("read-only file system"),
+    )
+
+    with pytest.raises(CondaAuthError, match="Unable to write credentials"):
+        FileStorage(path).set_credential(make_record("tester"))
+
+
+def test_file_storage_never_writes_without_lock(path, mocker):
+    mocker.patch(
+        "conda_auth.storage.credential_file.file_lock",
+        side_effect=FileLockError("Timed out after 60s waiting for lock"),
+    )
+
+    with pytest.raises(CondaAuthError, match="Timed out after 60s waiting for lock"):
+        FileStorage(path).set_credential(make_record("tester"))
+    assert not path.exists()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import pytest
+
+from conda_auth.constants import HTTP_BASIC_AUTH_NAME, OAUTH_NAME, TOKEN_NAME
+from conda_auth.credentials import CredentialRecord
+from conda_auth.storage.encoding import (
+    COMPACT_PAYLOAD_PREFIX,
+    decode_record,
+    encode_record,
+    is_compact_payload,
+)
+
+RECORDS = (
+    CredentialRecord(
+        target="https://repo.example.com/private",
+        auth_type=HTTP_BASIC_AUTH_NAME,
+        username="user",
+        password="pässwörd",
+    ),
+    CredentialRecord(target="tester", auth_type=TOKEN_NAME, token="x" * 300),
+    CredentialRecord(
+        target="https://repo.example.com/oauth",
+        auth_type=OAUTH_NAME,
+        access_token="access",
+        refresh_token="refresh",
+        expires_at=1_900_000_000,
+        token_endpoint="https://auth.example.com/token",
+        revocation_endpoint="https://auth.example.com/revoke",
+        client_id="conda",
+        issuer_url="https://auth.example.com",
+        scopes=("channel:read", "offline_access"),
+    ),
+    CredentialRecord(
+        target="custom",
+        auth_type="custom-auth",
+        token="secret",
+        token_header="X-Api-Key",
+        token_template="Key {token}",
+        expires_at=-1,
+    ),
+)
+
+
+@pytest.mark.parametrize("record", RECORDS, ids=("basic", "long-token", "oauth", "custom"))
+def test_compact_encoding_round_trips(record):
+    payload = encode_record(record, include_target=False)
+
+    assert is_compact_payload(payload)
+    assert decode_record(payload, record.target) == record
+    assert decode_record(encode_record(record)) == record
+
+
+def test_compact_encoding_layout():
+    record = CredentialRecord(
+        target="tester", auth_type="token", token="a:b", expires_at=60, scopes=("x", "yz")
+    )
+
+    assert encode_record(record) == "~1t6:testera5:tokenk3:a:be2:60s1:xs2:yz"
+    assert encode_record(record, include_target=False).startswith(COMPACT_PAYLOAD_PREFIX)
+    assert "tester" not in encode_record(record, include_target=False)
+
+
+def test_decode_record_prefers_stored_target():
+    assert decode_record(encode_record(RECORDS[1]), "other").target == "tester"
+
+
+@pytest.mark.parametrize(
+    "payload, message",
+    (
+        ("", "unsupported compact record version"),
+        ("~2a5:token", "unsupported compact record version"),
+        ("~1a5:tokenk9:secret", "truncated compact record"),
+        ("~1a5:tokenksecret", "truncated compact record"),
+        ("~1a5:tokenk:secret", "truncated compact record"),
+        ("~1a5:tokene5:later", "invalid expiration time"),
+        ("~1a5:tokenz6:secret", "unknown compact record field tag 'z'"),
+        ("~1t6:tester", "no auth type"),
+        ("~1a5:token", "no target"),
+    ),
+)
+def test_decode_record_rejects_invalid_payloads(payload, message):
+    with pytest.raises(ValueError, match=message) as exc_info:
+        decode_record(payload)
+
+    assert "secret" not in str(exc_info.value)
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from conda_auth.constants import HTTP_BASIC_AUTH_NAME, TOKEN_NAME
+from conda_auth.credentials import CredentialRecord
+from conda_auth.exceptions import CondaAuthError
+from conda_auth.storage.base import Storage
+from conda_auth.storage.environment import EnvironmentStorage, get_secret_name
+
+TARGET = "https://repo.example.com/private"
+
+SECRET_NAME = "HTTPS_REPO_EXAMPLE_COM_PRIVATE"
+
+
+class MemoryStorage(Storage):
+    def __init__(self):
+        self.records = {}
+        self.get_calls = []
+
+    def set_credential(self, record):
+        self.records[record.target] = record
+
+    def get_credential(self, target):
+        self.get_calls.append(target)
+        return self.records.get(target)
+
+    def delete_credential(self, target):
+        self.records.pop(target, None)
+
+    def iter_credentials(self):
+        return iter(list(self.records.values()))
+
+
+@pytest.mark.parametrize(
+    "target, name",
+    (
+        (TARGET, SECRET_NAME),
+        ("https://repo.example.com:8443/t/abc-123/", "HTTPS_REPO_EXAMPLE_COM_8443_T_ABC_123"),
+        ("conda-forge", "CONDA_FORGE"),
+    ),
+)
+def test_get_secret_name(target, name):
+    assert get_secret_name(target) == name
+
+
+def test_environment_storage_reads_token_from_environment_variable():
+    storage = EnvironmentStorage(
+        prefix="CONDA_AUTH_", environ={f"CONDA_AUTH_{SECRET_NAME}": "secret\n"}
+    )
+
+    assert storage.get_credential(TARGET) == CredentialRecord(
+        target=TARGET, auth_type=TOKEN_NAME, token="secret"
+    )
+    assert storage.get_credential("https://repo.example.com/other") is None
+
+
+def test_environment_storage_reads_record_from_secret_file(tmp_path):
+    (tmp_path / SECRET_NAME).write_text(
+        json.dumps(
+            {
+                "target": "ignored",
+                "auth_type": HTTP_BASIC_AUTH_NAME,
+                "username": "user",
+                "password": "secret",
+            }
+        )
+    )
+    storage = EnvironmentStorage(directory=tmp_path, environ={})
+
+    assert storage.get_credential(TARGET) == CredentialRecord(
+        target=TARGET, auth_type=HTTP_BASIC_AUTH_NAME, username="user", password="secret"
+    )
+
+
+def test_environment_storage_prefers_environment_variable(tmp_path):
+    (tmp_path / SECRET_NAME).write_text("from-file")
+    storage = EnvironmentStorage(
+        prefix="CI_", directory=tmp_path, environ={f"CI_{SECRET_NAME}": "from-env"}
+    )
+
+    assert storage.get_credential(TARGET) == CredentialRecord(
+        target=TARGET, auth_type=TOKEN_NAME, token="from-env"
+    )
+
+
+def test_environment_storage_falls_back_to_backend():
+    backend = MemoryStorage()
+    backend.set_credential(CredentialRecord(target="stored", auth_type=TOKEN_NAME, token="a"))
+    storage = EnvironmentStorage(backend, prefix="CI_", environ={f"CI_{SECRET_NAME}": "from-env"})
+
+    assert storage.get_credentials([TARGET, "stored", "missing"]) == {
+        TARGET: CredentialRecord(target=TARGET, auth_type=TOKEN_NAME, token="from-env"),
+        "stored": CredentialRecord(target="stored", auth_type=TOKEN_NAME, token="a"),
+        "missing": None,
+    }
+    assert storage.get_credential(TARGET) == CredentialRecord(
+        target=TARGET, auth_type=TOKEN_NAME, token="from-env"
+    )
+    assert backend.get_calls == ["stored", "missing"]
+    assert list(storage.iter_backends()) == [storage, backend]
+
+
+def test_environment_storage_writes_to_backend():
+    backend = MemoryStorage()
+    storage = EnvironmentStorage(backend, prefix="CI_", environ={})
+    record = CredentialRecord(target=TARGET, auth_type=TOKEN_NAME, token="secret")
+
+    storage.set_credential(record)
+
+    assert backend.records == {TARGET: record}
+    assert list(storage.iter_credentials()) == [record]
+
+    storage.delete_credentials([TARGET])
+
+    assert backend.records == {}
+
+
+def test_environment_storage_is_read_only_without_backend():
+    storage = EnvironmentStorage(prefix="CI_", environ={})
+    record = CredentialRecord(target=TARGET, auth_type=TOKEN_NAME, token="secret")
+
+    with pytest.raises(CondaAuthError, match="cannot be changed"):
+        storage.set_credential(record)
+    with pytest.raises(CondaAuthError, match="cannot be changed"):
+        storage.delete_credential(TARGET)
+    with pytest.raises(NotImplementedError):
+        storage.iter_credentials()
+
+
+@pytest.mark.parametrize(
+    "value, message",
+    (
+        ('{"auth_type": "token", "token": "secret"', "Unable to read credential"),
+        ('{"token": "secret"}', "must be a JSON object with an 'auth_type'"),
+    ),
+)
+def test_environment_storage_rejects_invalid_json(value, message):
+    storage = EnvironmentStorage(prefix="CI_", environ={f"CI_{SECRET_NAME}": value})
+
+    with pytest.raises(CondaAuthError, match=message) as exc_info:
+        storage.get_credential(TARGET)
+
+    assert "secret" not in str(exc_info.value)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import time
+
+import pytest
+
+from conda_auth.storage.files import (
+    FileLockError,
+    credential_lock,
+    file_lock,
+    get_credential_lock_path,
+)
+
+HOLD_LOCK_SCRIPT = """
+import sys
+import time
+from pathlib import Path
+
+from conda_auth.storage.files import file_lock
+
+with file_lock(Path(sys.argv[1])):
+    print("locked", flush=True)
+    time.sleep(float(sys.argv[2]))
+"""
+
+
+@pytest.fixture
+def hold_lock(tmp_path):
+    """
+    Holds the lock file at ``path`` in another process for ``seconds``.
+    """
+    processes = []
+
+    def _hold_lock(path, seconds):
+        process = subprocess.Popen(
+            [sys.executable, "-c", HOLD_LOCK_SCRIPT, str(path), str(seconds)],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        processes.append(process)
+        assert process.stdout is not None
+        assert process.stdout.readline().strip() == "locked"
+
+    yield _hold_lock
+
+    for process in processes:
+        process.kill()
+        process.communicate()
+
+
+def test_credential_lock_path_is_private_to_target(cache_dir):
+    path = get_credential_lock_path("https://repo.example.com/private")
+
+    assert path.parent == cache_dir / "locks"
+    assert "repo.example.com" not in path.name
+    assert path != get_credential_lock_path("https://repo.example.com/other")
+
+
+def test_credential_lock_creates_lock_file(cache_dir):
+    with credential_lock("tester"):
+        assert get_credential_lock_path("tester").exists()
+
+
+def test_credential_lock_never_runs_without_lock_file(cache_dir):
+    cache_dir.mkdir(parents=True)
+    (cache_dir / "locks").write_text("not a directory")
+    ran = False
+
+    with pytest.raises(FileLockError, match="Unable to create lock file"):
+        with credential_lock("tester"):
+            ran = True
+
+    assert not ran
+
+
+def test_file_lock_waits_for_other_process(tmp_path, hold_lock):
+    path = tmp_path / "test.lock"
+    hold_lock(path, 0.5)
+    start = time.monotonic()
+
+    with file_lock(path, timeout=10):
+        elapsed = time.monotonic() - start
+
+    assert 0.2 < elapsed < 10
+
+
+def test_file_lock_times_out(tmp_path, hold_lock):
+    path = tmp_path / "test.lock"
+    hold_lock(path, 30)
+
+    with pytest.raises(FileLockError, match="Timed out after 0.2s"):
+        with file_lock(path, timeout=0.2):
+            pytest.fail("the body must not run without the lock")
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from conda_auth.credentials import CredentialRecord
+from conda_auth.storage.memory import MemoryStorage
+
+
+def make_record(target):
+    return CredentialRecord(target=target, auth_type="token", token="secret")
+
+
+def test_memory_storage_stores_records():
+    storage = MemoryStorage()
+
+    storage.set_credentials([make_record("one"), make_record("two")])
+    storage.delete_credential("one")
+
+    assert storage.get_credentials(["one", "two"]) == {"one": None, "two": make_record("two")}
+    assert list(storage.iter_credentials()) == [make_record("two")]
+
+    storage.clear()
+
+    assert storage.get_credential("two") is None
+
+
+def test_memory_storage_forgets_records_after_ttl(mocker):
+    monotonic = mocker.patch("conda_auth.storage.memory.time.monotonic", return_value=100.0)
+    storage = MemoryStorage(ttl=10)
+    storage.set_credential(make_record("tester"))
+
+    monotonic.return_value = 109.0
+
+    assert storage.get_credential("tester") == make_record("tester")
+
+    monotonic.return_value = 110.0
+
+    assert list(storage.iter_credentials()) == []
+    assert storage.get_credential("tester") is None
+
+
+def test_memory_storage_tolerates_concurrent_expiry(mocker):
+    """
+    Another thread may drop an expired record between our lookup and our removal
+    """
+    storage = MemoryStorage(ttl=10)
+    mocker.patch("conda_auth.storage.memory.time.monotonic", return_value=100.0)
+    storage.set_credential(make_record("tester"))
+
+    def expire_elsewhere():
+        storage._records.pop("tester", None)
+        return 110.0
+
+    mocker.patch("conda_auth.storage.memory.time.monotonic", side_effect=expire_elsewhere)
+
+    assert storage.get_credential("tester") is None
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+
+import pytest
+
+from conda_auth.constants import CREDENTIAL_MISS_TTL_SETTING
+from conda_auth.credentials import CredentialRecord
+from conda_auth.storage import get_storage_backend
+from conda_auth.storage import misses as misses_module
+from conda_auth.storage.base import Storage, find_backend
+from conda_auth.storage.keyring import KeyringStorage
+from conda_auth.storage.misses import MissCacheStorage
+
+
+class MemoryStorage(Storage):
+    def __init__(self):
+        self.records = {}
+        self.get_calls = []
+
+    def set_credential(self, record):
+        self.records[record.target] = record
+
+    def get_credential(self, target):
+        self.get_calls.append(target)
+        return self.records.get(target)
+
+    def delete_credential(self, target):
+        self.records.pop(target, None)
+
+
+@pytest.fixture
+def backend():
+    return MemoryStorage()
+
+
+@pytest.fixture
+def misses_factory(tmp_path, backend):
+    def _misses_factory(ttl=30):
+        return MissCacheStorage(backend, tmp_path / "misses.json", ttl=ttl)
+
+    return _misses_factory
+
+
+def test_misses_skip_backend(backend, misses_factory):
+    assert misses_factory().get_credential("tester") is None
+    # A new instance simulates a new conda process reading the same file
+    assert misses_factory().get_credential("tester") is None
+    assert backend.get_calls == ["tester"]
+
+
+def test_misses_do_not_store_channel_names(tmp_path, misses_factory):
+    misses_factory().get_credential("https://repo.example.com/private")
+
+    assert b"repo.example.com" not in (tmp_path / "misses.json").read_bytes()
+
+
+def test_set_credential_forgets_miss(backend, misses_factory):
+    other_process = misses_factory()
+    other_process.get_credential("tester")
+    record = CredentialRecord(target="tester", auth_type="token", token="secret")
+
+    misses_factory().set_credential(record)
+
+    assert other_process.get_credential("tester") == record
+    assert backend.get_calls == ["tester", "tester"]
+
+
+def test_hits_are_not_remembered(backend, misses_factory):
+    record = CredentialRecord(target="tester", auth_type="token", token="secret")
+    backend.set_credential(record)
+    misses = misses_factory()
+
+    assert misses.get_credential("tester") == record
+    assert misses.get_credential("tester") == record
+    assert backend.get_calls == ["tester", "tester"]
+
+
+def test_delete_credential_remembers_miss(backend, misses_factory):
+    misses = misses_factory()
+    misses.set_credential(CredentialRecord(target="tester", auth_type="token", token="secret"))
+
+    misses.delete_credential("tester")
+
+    assert misses_factory().get_credential("tester") is None
+    assert backend.get_calls == []
+
+
+def test_misses_expire_after_ttl(mocker, backend, misses_factory):
+    mock_time = mocker.patch("conda_auth.storage.misses.time.time", return_value=1000.0)
+    misses = misses_factory(ttl=30)
+    misses.get_credential("tester")
+
+    mock_time.return_value = 1031.0
+    misses.get_credential("tester")
+
+    assert backend.get_calls == ["tester", "tester"]
+
+
+def test_batch_reads_skip_misses(mocker, backend, misses_factory):
+    record = CredentialRecord(target="one", auth_type="token", token="one")
+    backend.set_credential(record)
+    misses_factory().get_credential("two")
+    get_credentials = mocker.spy(backend, "get_credentials")
+
+    assert misses_factory().get_credentials(["one", "two", "three"]) == {
+        "one": record,
+        "two": None,
+        "three": None,
+    }
+    get_credentials.assert_called_once_with(["one", "three"])
+    assert misses_factory().get_credential("three") is None
+
+
+def test_misses_update_file_under_lock(mocker, tmp_path, misses_factory):
+    held = []
+
+    @contextmanager
+    def file_lock(path):
+        held.append(path)
+        yield
+        held.remove(path)
+
+    def write_private_file(path, payload):
+        lock_paths.append(list(held))
+        write(path, payload)
+
+    lock_paths = []
+    write = misses_module.write_private_file
+    mocker.patch("conda_auth.storage.misses.file_lock", file_lock)
+    mocker.patch("conda_auth.storage.misses.write_private_file", write_private_file)
+
+    misses_factory().get_credential("tester")
+
+    assert lock_paths == [[tmp_path / ".misses.json.lock"]]
+
+
+def test_misses_update_keeps_entries_of_other_processes(tmp_path, backend, misses_factory):
+    misses = misses_factory()
+    misses.get_credential("one")
+    misses_factory().get_credential("two")
+    # With a coarse file system clock, the other write can leave a stamp that matches
+    stat = (tmp_path / "misses.json").stat()
+    misses._entries_stamp = (stat.st_mtime_ns, stat.st_size)
+
+    misses.get_credential("three")
+    backend.get_calls.clear()
+
+    assert misses_factory().get_credentials(["one", "two", "three"]) == dict.fromkeys(
+        ["one", "two", "three"]
+    )
+    assert backend.get_calls == []
+
+
+def test_misses_are_kept_in_memory_without_writable_file(tmp_path, backend):
+    path = tmp_path / "not-a-directory"
+    path.write_text("")
+    misses = MissCacheStorage(backend, path / "misses.json", ttl=30)
+
+    misses.get_credential("tester")
+    misses.get_credential("tester")
+
+    assert backend.get_calls == ["tester"]
+
+
+def test_misses_ignore_unreadable_file(tmp_path, backend, misses_factory):
+    (tmp_path / "misses.json").write_bytes(b"garbage")
+
+    assert misses_factory().get_credential("tester") is None
+    assert backend.get_calls == ["tester"]
+
+
+def test_clear_forgets_misses(tmp_path, backend, misses_factory):
+    misses = misses_factory()
+    misses.get_credential("tester")
+
+    misses.clear()
+    misses.clear()
+
+    assert not (tmp_path / "misses.json").exists()
+    misses.get_credential("tester")
+    assert backend.get_calls == ["tester", "tester"]
+
+
+def test_storage_backend_remembers_misses_by_default(keyring):
+    keyring(None)
+
+    backend = get_storage_backend()
+
+    assert isinstance(backend, MissCacheStorage)
+    assert find_backend(backend, KeyringStorage) is backend.backend
+
+
+def test_storage_backend_skips_miss_cache_when_disabled(mocker, keyring):
+    keyring(None)
+    mocker.patch(
+        "conda_auth.storage.get_plugin_setting",
+        side_effect=lambda name, default: 0 if name == CREDENTIAL_MISS_TTL_SETTING else default,
+    )
+
+    assert isinstance(get_storage_backend(), KeyringStorage)
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import gc
+
+import pytest
+
+from conda_auth.credentials import CredentialRecord
+from conda_auth.exceptions import CondaAuthError
+from conda_auth.storage.base import find_backend
+from conda_auth.storage.memory import MemoryStorage
+from conda_auth.storage.tiered import WRITE_BACK, TieredStorage
+
+
+class RecordingStorage(MemoryStorage):
+    """
+    Memory storage that records the batches it was asked for.
+    """
+
+    def __init__(self, name, calls):
+        super().__init__()
+        self.name = name
+        self.calls = calls
+
+    def get_credentials(self, targets):
+        targets = list(targets)
+        self.calls.append((self.name, "get", targets))
+        return super().get_credentials(targets)
+
+    def set_credentials(self, records):
+        records = list(records)
+        self.calls.append((self.name, "set", [record.target for record in records]))
+        super().set_credentials(records)
+
+    def delete_credentials(self, targets):
+        targets = list(targets)
+        self.calls.append((self.name, "delete", targets))
+        for target in targets:
+            self.delete_credential(target)
+
+
+def make_record(target, token="secret"):
+    return CredentialRecord(target=target, auth_type="token", token=token)
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def tiers(calls):
+    return [RecordingStorage(name, calls) for name in ("memory", "file", "keyring")]
+
+
+def test_tiered_storage_reads_tiers_in_order(tiers, calls):
+    tiers[1].set_credential(make_record("file"))
+    tiers[2].set_credential(make_record("keyring"))
+    storage = TieredStorage(tiers, promote=False)
+
+    assert storage.get_credentials(["file", "keyring", "missing"]) == {
+        "file": make_record("file"),
+        "keyring": make_record("keyring"),
+        "missing": None,
+    }
+    assert calls == [
+        ("memory", "get", ["file", "keyring", "missing"]),
+        ("file", "get", ["file", "keyring", "missing"]),
+        ("keyring", "get", ["keyring", "missing"]),
+    ]
+
+
+def test_tiered_storage_promotes_records(tiers, calls):
+    tiers[2].set_credential(make_record("tester"))
+    storage = TieredStorage(tiers)
+
+    assert storage.get_credential("tester") == make_record("tester")
+    assert ("memory", "set", ["tester"]) in calls
+    assert ("file", "set", ["tester"]) in calls
+
+    calls.clear()
+
+    assert storage.get_credential("tester") == make_record("tester")
+    assert calls == [("memory", "get", ["tester"])]
+    assert [(stats.reads, stats.hits) for stats in storage.stats] == [(2, 1), (1, 0), (1, 1)]
+    assert storage.stats[0].mean_read_seconds > 0
+    assert storage.stats[1].misses == 1
+
+
+def test_tiered_storage_writes_through_source_of_truth_first(tiers, calls):
+    storage = TieredStorage(tiers)
+
+    storage.set_credential(make_record("tester"))
+    storage.delete_credentials(["tester"])
+
+    assert calls == [
+        ("keyring", "set", ["tester"]),
+        ("file", "set", ["tester"]),
+        ("memory", "set", ["tester"]),
+        ("keyring", "delete", ["tester"]),
+        ("file", "delete", ["tester"]),
+        ("memory", "delete", ["tester"]),
+    ]
+    assert [stats.writes for stats in storage.stats] == [2, 2, 2]
+
+
+def test_tiered_storage_writes_back_on_flush(tiers, calls):
+    storage = TieredStorage(tiers, write_policy=WRITE_BACK)
+
+    storage.set_credential(make_record("tester"))
+
+    assert calls == [("memory", "set", ["tester"])]
+    assert tiers[2].get_credential("tester") is None
+    assert storage.get_credential("tester") == make_record("tester")
+
+    storage.flush()
+
+    assert tiers[2].get_credential("tester") == make_record("tester")
+    assert tiers[1].get_credential("tester") == make_record("tester")
+
+
+def test_tiered_storage_hides_records_deleted_before_flush(tiers):
+    tiers[2].set_credential(make_record("tester"))
+    storage = TieredStorage(tiers, write_policy=WRITE_BACK)
+
+    storage.delete_credential("tester")
+
+    assert tiers[2].get_credential("tester") == make_record("tester")
+    assert storage.get_credential("tester") is None
+    assert list(storage.iter_credentials()) == []
+    assert tiers[2].get_credential("tester") is None
+
+
+def test_tiered_storage_serves_held_back_changes(tiers, calls):
+    tiers[2].set_credential(make_record("stale", token="old"))
+    tiers[2].set_credential(make_record("deleted"))
+    storage = TieredStorage(tiers, write_policy=WRITE_BACK)
+    storage.set_credential(make_record("stale", token="new"))
+    storage.delete_credential("deleted")
+    # The first tier may drop records, e.g. when it is a size-limited cache
+    tiers[0].clear()
+    calls.clear()
+
+    assert storage.get_credentials(["stale", "deleted"]) == {
+        "stale": make_record("stale", token="new"),
+        "deleted": None,
+    }
+    assert calls == []
+
+    storage.flush()
+
+    assert tiers[2].get_credential("stale") == make_record("stale", token="new")
+
+
+def test_tiered_storage_flushes_when_collected(tiers):
+    storage = TieredStorage(tiers, write_policy=WRITE_BACK)
+    storage.set_credential(make_record("tester"))
+
+    del storage
+    gc.collect()
+
+    assert tiers[2].get_credential("tester") == make_record("tester")
+    assert tiers[1].get_credential("tester") == make_record("tester")
+
+
+def test_tiered_storage_close_flushes_once(tiers, calls):
+    with TieredStorage(tiers, write_policy=WRITE_BACK) as storage:
+        storage.set_credential(make_record("tester"))
+        finalizer = storage._finalizer
+
+    assert tiers[2].get_credential("tester") == make_record("tester")
+    assert finalizer is not None
+    assert not finalizer.alive
+    calls.clear()
+
+    del storage
+    gc.collect()
+
+    assert calls == []
+
+
+def test_tiered_storage_lists_backends(tiers):
+    storage = TieredStorage(tiers)
+
+    assert list(storage.iter_backends()) == [storage, *tiers]
+    assert find_backend(storage, RecordingStorage) is tiers[0]
+
+
+@pytest.mark.parametrize(
+    "tiers, kwargs, message",
+    (
+        ((), {}, "at least one tier"),
+        ((MemoryStorage(),), {"write_policy": "write-around"}, "Unknown write policy"),
+    ),
+)
+def test_tiered_storage_rejects_invalid_configuration(tiers, kwargs, message):
+    with pytest.raises(CondaAuthError, match=message):
+        TieredStorage(tiers, **kwargs)
@@ -3,8 +3,10 @@ from conda.cli.condarc import ConfigurationFile
 from conda.common.serialize import yaml
 
 from conda_auth.cli import (
+    ChannelSettingsEditor,
     get_updated_channel_settings,
     remove_channel_settings,
+    remove_matching_channel_settings,
     update_channel_settings,
 )
 from conda_auth.exceptions import CondaAuthError
@@ -161,6 +163,80 @@ def test_remove_channel_settings_reports_when_no_auth_settings_removed():
     assert config.content == {"channel_settings": [{"channel": "tester", "ssl_verify": False}]}
 
 
+def test_remove_matching_channel_settings_returns_removed_entries():
+    config = ConfigurationFile(
+        content={
+            "channel_settings": [
+                {"channel": "one", "auth": "token", "ssl_verify": False},
+                {"channel": "two", "auth": "http-basic", "username": "user"},
+                {"channel": "three", "ssl_verify": False},
+                {"channel": "four", "auth": "token"},
+            ]
+        }
+    )
+
+    removed = remove_matching_channel_settings(
+        config, lambda settings: settings["channel"] != "four"
+    )
+
+    assert removed == [
+        {"channel": "one", "auth": "token", "ssl_verify": False},
+        {"channel": "two", "auth": "http-basic", "username": "user"},
+    ]
+    assert config.content == {
+        "channel_settings": [
+            {"channel": "one", "ssl_verify": False},
+            {"channel": "three", "ssl_verify": False},
+            {"channel": "four", "auth": "token"},
+        ]
+    }
+
+
+def test_channel_settings_editor_applies_changes_in_one_pass():
+    channel_settings = [
+        {"channel": "one", "auth": "token", "ssl_verify": False},
+        "not-a-mapping",
+        {"channel": "two", "auth": "token"},
+        {"channel": "one", "ssl_verify": True},
+        {"channel": "three", "auth": "token", "ssl_verify": False},
+        {"channel": "four", "auth": "token"},
+    ]
+    editor = ChannelSettingsEditor(channel_settings)
+
+    editor.upsert("one", "http-basic", "user")
+    editor.upsert("five", "token")
+    editor.remove("two")
+    editor.remove("five")
+    editor.upsert("two", "token", allow_plaintext_http=True)
+    editor.remove("three")
+    editor.remove_matching(lambda settings: settings["channel"] in ("one", "four"))
+
+    assert editor.apply() == [
+        {"channel": "one", "ssl_verify": False},
+        "not-a-mapping",
+        {
+            "channel": "two",
+            "auth": "token",
+            "auth_target": "two",
+            "auth_allow_plaintext_http": True,
+        },
+        {
+            "channel": "one",
+            "ssl_verify": True,
+            "auth": "http-basic",
+            "auth_target": "one",
+            "username": "user",
+        },
+        {"channel": "three", "ssl_verify": False},
+    ]
+    assert editor.removed == [
+        {"channel": "one", "auth": "token", "ssl_verify": False},
+        {"channel": "three", "auth": "token", "ssl_verify": False},
+        {"channel": "four", "auth": "token"},
+    ]
+    assert channel_settings[0] == {"channel": "one", "auth": "token", "ssl_verify": False}
+
+
 @pytest.mark.parametrize(
     ("settings_func", "args"),
     (
@@ -1,6 +1,8 @@
+from dataclasses import FrozenInstanceError, fields
+
 import pytest
 
-from conda_auth.credentials import CredentialRecord
+from conda_auth.credentials import FIELD_TYPES, CredentialRecord
 
 
 @pytest.mark.parametrize(
@@ -50,3 +52,70 @@ def test_credential_record_from_dict_normalizes_values(
     assert record.scopes == expected_scopes
     assert record.username == expected_username
     assert record.expires_at == expected_expires_at
+
+
+def test_credential_record_field_table_matches_fields():
+    assert tuple(FIELD_TYPES) == tuple(field.name for field in fields(CredentialRecord))
+
+
+def test_credential_record_is_slotted():
+    record = CredentialRecord(target="tester", auth_type="token", token="secret")
+
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        setattr(record, "token", "other")
+
+
+def test_credential_record_from_dict_keeps_typed_values():
+    token = "".join(("sec", "ret"))
+    scopes = ("channel:read",)
+
+    record = CredentialRecord.from_dict(
+        {"target": "tester", "auth_type": "token", "token": token, "scopes": scopes}
+    )
+
+    assert record.token is token
+    assert record.scopes is scopes
+
+
+@pytest.mark.parametrize(
+    "data",
+    (
+        {"target": "tester", "auth_type": "token", "scopes": ("channel:read", 1)},
+        {"target": "tester", "auth_type": "token", "expires_at": True},
+        {"target": "tester", "auth_type": "token", "unknown": "value"},
+    ),
+    ids=("untyped-scope", "bool-expiry", "unknown-key"),
+)
+def test_credential_record_from_dict_converts_other_values(data):
+    record = CredentialRecord.from_dict(data)
+
+    assert all(type(scope) is str for scope in record.scopes)
+    assert not hasattr(record, "unknown")
+
+
+def test_credential_record_to_dict_and_status_entry():
+    record = CredentialRecord(
+        target="tester",
+        auth_type="oauth2",
+        access_token="secret",
+        expires_at=0,
+        issuer_url="https://auth.example.com",
+        scopes=("openid", "offline_access"),
+    )
+
+    assert record.to_dict() == {
+        "target": "tester",
+        "auth_type": "oauth2",
+        "access_token": "secret",
+        "expires_at": 0,
+        "issuer_url": "https://auth.example.com",
+        "scopes": ["openid", "offline_access"],
+    }
+    assert CredentialRecord.from_dict(record.to_dict()) == record
+    assert list(record.to_status_entry().items()) == [
+        ("target", "tester"),
+        ("auth_type", "oauth2"),
+        ("issuer_url", "https://auth.example.com"),
+        ("expires_at", 0),
+    ]
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from fnmatch import fnmatch
+from typing import Any
+
+import pytest
+from conda.common.url import urlparse as conda_urlparse
+from conda.models.channel import Channel
+
+from conda_auth.matching import (
+    ChannelSettingsIndex,
+    channel_matches,
+    get_channel_settings_index,
+)
+
+# Includes entries that are not valid settings, which the index has to skip
+CHANNEL_SETTINGS: list[Any] = [
+    {"channel": "tester", "auth": "token", "name": "named"},
+    {"channel": "https://repo.example.com/private", "auth": "token", "name": "exact-url"},
+    {"channel": "https://repo.example.com/*", "auth": "token", "name": "host-pattern"},
+    {"channel": "https://*.example.com/private*", "auth": "token", "name": "wildcard-host"},
+    {"channel": "http://repo.example.com/*", "auth": "token", "name": "http-pattern"},
+    {"channel": "https://other.example.com/*", "auth": "http-basic", "name": "other-auth"},
+    {"channel": "https://oth?r.example.com/*", "auth": "token", "name": "single-char-host"},
+    {"channel": "*", "auth": "token", "name": "schemeless"},
+    {"channel": 1, "auth": "token", "name": "invalid"},
+    {"channel": "", "auth": "token", "name": "empty"},
+    None,
+]
+
+
+def scan(channel_settings, channel, auth_type):
+    """
+    Reference implementation: scan every entry, the last match wins.
+    """
+    matched = None
+    for settings in channel_settings:
+        if not isinstance(settings, dict) or settings.get("auth") != auth_type:
+            continue
+        configured_channel = settings.get("channel")
+        if not configured_channel or not isinstance(configured_channel, str):
+            continue
+        if configured_channel == channel.canonical_name:
+            matched = settings
+            continue
+        parsed_channel = conda_urlparse(channel.base_url)
+        parsed_setting = conda_urlparse(configured_channel)
+        if parsed_setting.scheme == parsed_channel.scheme and fnmatch(
+            parsed_channel.netloc + parsed_channel.path,
+            parsed_setting.netloc + parsed_setting.path,
+        ):
+            matched = settings
+    return matched
+
+
+@pytest.mark.parametrize(
+    "channel_name",
+    (
+        "tester",
+        "conda-forge",
+        "https://repo.example.com/private",
+        "https://repo.example.com/public",
+        "https://mirror.example.com/private-two",
+        "http://repo.example.com/private",
+        "https://other.example.com/private",
+        "https://other.example.com/public",
+        "https://unrelated.example.org/private",
+    ),
+)
+@pytest.mark.parametrize("auth_type", ("token", "http-basic"))
+@pytest.mark.parametrize("reverse", (False, True), ids=("in-order", "reversed"))
+def test_index_matches_linear_scan(channel_name, auth_type, reverse):
+    channel_settings = CHANNEL_SETTINGS[::-1] if reverse else CHANNEL_SETTINGS
+    channel = Channel(channel_name)
+
+    index = ChannelSettingsIndex(channel_settings, auth_type)
+
+    assert index.find(channel) is scan(channel_settings, channel, auth_type)
+
+
+def test_index_uses_last_matching_setting():
+    channel_settings = [
+        {"channel": "https://repo.example.com/*", "auth": "token", "name": "first"},
+        {"channel": "https://repo.example.com/private", "auth": "token", "name": "exact"},
+        {"channel": "https://*.example.com/*", "auth": "token", "name": "last"},
+    ]
+
+    index = ChannelSettingsIndex(channel_settings)
+
+    assert index.find(Channel("https://repo.example.com/private")) is channel_settings[2]
+    assert index.find(Channel("https://repo.example.com/other")) is channel_settings[2]
+    assert index.find(Channel("https://repo.example.org/private")) is None
+
+
+def test_index_tracks_source_settings():
+    channel_settings = [{"channel": "tester", "auth": "token"}]
+    index = ChannelSettingsIndex(channel_settings)
+
+    assert index.is_current(channel_settings)
+    assert not index.is_current(list(channel_settings))
+
+    channel_settings.append({"channel": "other", "auth": "token"})
+
+    assert not index.is_current(channel_settings)
+
+
+@pytest.mark.parametrize(
+    ("configured_channel", "channel_name", "expected"),
+    (
+        ("tester", "tester", True),
+        ("https://repo.example.com/*", "https://repo.example.com/private", True),
+        ("https://REPO.example.com/*", "https://repo.example.com/private", True),
+        ("https://*.example.com/private", "https://repo.example.com/private", True),
+        ("http://repo.example.com/*", "https://repo.example.com/private", False),
+        ("https://repo.example.com", "https://repo.example.com/private", False),
+        ("*", "https://repo.example.com/private", False),
+    ),
+    ids=(
+        "exact",
+        "pattern",
+        "normalized-host",
+        "host-pattern",
+        "scheme-mismatch",
+        "prefix",
+        "schemeless-glob",
+    ),
+)
+def test_channel_matches(configured_channel, channel_name, expected):
+    assert channel_matches(configured_channel, Channel(channel_name)) is expected
+
+
+def test_index_finds_all_settings_through_auth_targets():
+    channel_settings = [
+        {"channel": "https://repo.example.com/*", "auth": "token", "name": "pattern"},
+        {"channel": "unrelated", "auth": "token", "auth_target": "tester", "name": "target"},
+        {"channel": "other", "auth": "token", "auth_target": "named", "name": "name"},
+        {"channel": "https://repo.example.com/*", "name": "no-auth"},
+    ]
+
+    index = ChannelSettingsIndex(channel_settings, include_auth_targets=True)
+
+    assert [
+        settings["name"]
+        for settings in index.find_all(
+            Channel("https://repo.example.com/tester"), names=("named",)
+        )
+    ] == ["pattern", "name"]
+    assert [settings["name"] for settings in index.find_all(Channel("tester"))] == ["target"]
+    assert ChannelSettingsIndex(channel_settings).find_all(Channel("tester")) == []
+
+
+@pytest.mark.parametrize(
+    ("channel_name", "expected"),
+    (
+        ("https://repo.example.com/private", ["exact-url", "suffix"]),
+        ("https://eu-mirror.example.com/private", ["suffix", "dash"]),
+        ("https://mirror.example.com/private", ["suffix"]),
+        ("https://repo.example.com/other", ["suffix", "no-suffix"]),
+        ("https://example.com/private", []),
+        # fnmatch alone would find the host suffix in the path
+        ("https://evil.example.org/a.example.com/private", []),
+    ),
+)
+def test_index_groups_wildcard_hosts_by_suffix(channel_name, expected):
+    channel_settings = [
+        {"channel": "https://repo.example.com/private", "auth": "token", "name": "exact-url"},
+        {"channel": "https://*.example.com/*", "auth": "token", "name": "suffix"},
+        {"channel": "https://*-mirror.example.com/private", "auth": "token", "name": "dash"},
+        {"channel": "https://repo.example.*/other", "auth": "token", "name": "no-suffix"},
+    ]
+
+    index = ChannelSettingsIndex(channel_settings)
+
+    assert [settings["name"] for settings in index.find_all(Channel(channel_name))] == expected
+
+
+def test_channel_settings_index_is_reused_until_settings_change():
+    channel_settings = [{"channel": "tester", "auth": "token"}]
+
+    index = get_channel_settings_index(channel_settings, "token")
+
+    assert get_channel_settings_index(channel_settings, "token") is index
+    assert get_channel_settings_index(channel_settings, "http-basic") is not index
+    assert get_channel_settings_index(list(channel_settings), "token") is not index
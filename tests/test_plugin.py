@@ -5,11 +5,27 @@ import sys
 
 from conda_auth import plugin
 from conda_auth.cli import configure_parser
+from conda_auth.constants import (
+    CREDENTIAL_CACHE_TTL_SETTING,
+    CREDENTIAL_ENV_PREFIX_SETTING,
+    CREDENTIAL_FILE_SETTING,
+    CREDENTIAL_KEYRING_COMPACT_SETTING,
+    CREDENTIAL_MISS_TTL_SETTING,
+    CREDENTIAL_PREFETCH_SETTING,
+    CREDENTIAL_SECRETS_DIR_SETTING,
+    CREDENTIAL_STORAGE_AUTO,
+    CREDENTIAL_STORAGE_SETTING,
+    DEFAULT_CREDENTIAL_MISS_TTL,
+    PREFETCH_COMMANDS,
+)
 from conda_auth.handlers import (
     HTTP_BASIC_AUTH_NAME,
+    OAUTH_NAME,
     TOKEN_NAME,
     BasicAuthHandler,
+    OAuthHandler,
     TokenAuthHandler,
+    token_auth_manager,
 )
 
 
@@ -24,6 +40,17 @@ def test_conda_subcommands_hook():
     assert objs[0].configure_parser is configure_parser
 
 
+def test_conda_subcommands_hook_action(mocker):
+    """
+    Test to make sure the subcommand action runs the auth CLI.
+    """
+    mock_auth = mocker.patch("conda_auth.cli.auth", return_value=0)
+    (subcommand,) = plugin.conda_subcommands()
+
+    assert subcommand.action(["status"]) == 0
+    mock_auth.assert_called_once_with(["status"])
+
+
 def test_conda_auth_handlers_hook():
     """
     Test to make sure that this hook yields the correct objects.
@@ -31,20 +58,69 @@ def test_conda_auth_handlers_hook():
     objs = list(plugin.conda_auth_handlers())
 
     assert objs[0].name == HTTP_BASIC_AUTH_NAME
-    assert objs[0].handler == BasicAuthHandler
+    assert objs[0].handler.get_handler_class() is BasicAuthHandler
 
     assert objs[1].name == TOKEN_NAME
-    assert objs[1].handler == TokenAuthHandler
+    assert objs[1].handler.get_handler_class() is TokenAuthHandler
+
+    assert objs[2].name == OAUTH_NAME
+    assert objs[2].handler.get_handler_class() is OAuthHandler
+
+
+def test_lazy_auth_handler_constructs_actual_handler(mocker, keyring):
+    context = mocker.MagicMock()
+    context.channel_settings = [{"channel": "tester", "auth": TOKEN_NAME}]
+    mocker.patch.object(token_auth_manager, "_context", context)
+    keyring("token")
+    handler_class = next(
+        obj.handler for obj in plugin.conda_auth_handlers() if obj.name == TOKEN_NAME
+    )
+
+    handler = handler_class("tester")
+
+    assert type(handler) is TokenAuthHandler
+    assert handler.channel_name == "tester"
+
+
+def test_conda_settings_hook():
+    """
+    Test to make sure that this hook yields the correct objects.
+    """
+    objs = list(plugin.conda_settings())
+
+    assert [obj.name for obj in objs] == [
+        CREDENTIAL_CACHE_TTL_SETTING,
+        CREDENTIAL_MISS_TTL_SETTING,
+        CREDENTIAL_PREFETCH_SETTING,
+        CREDENTIAL_STORAGE_SETTING,
+        CREDENTIAL_KEYRING_COMPACT_SETTING,
+        CREDENTIAL_FILE_SETTING,
+        CREDENTIAL_ENV_PREFIX_SETTING,
+        CREDENTIAL_SECRETS_DIR_SETTING,
+    ]
+    assert objs[0].parameter.default.value == 0
+    assert objs[1].parameter.default.value == DEFAULT_CREDENTIAL_MISS_TTL
+    assert objs[2].parameter.default.value is False
+    assert objs[3].parameter.default.value == CREDENTIAL_STORAGE_AUTO
+    assert objs[4].parameter.default.value is False
+    assert objs[5].parameter.default.value is None
+    assert objs[6].parameter.default.value is None
+    assert objs[7].parameter.default.value is None
 
 
 def test_plugin_import_does_not_eagerly_import_runtime_modules():
-    """Importing plugin hooks does not load CLI, storage, or keyring."""
+    """Importing and running plugin hooks does not load CLI, handlers, storage, or keyring."""
     code = """
 import sys
 import conda_auth.plugin
 
+list(conda_auth.plugin.conda_auth_handlers())
+list(conda_auth.plugin.conda_settings())
+list(conda_auth.plugin.conda_pre_commands())
+
 eager_modules = {
     "conda_auth.cli",
+    "conda_auth.handlers.base",
     "conda_auth.storage",
     "keyring",
 }
@@ -61,3 +137,25 @@ if loaded_modules:
     )
 
     assert result.returncode == 0, result.stderr
+
+
+def test_conda_pre_commands_hook():
+    """
+    Test to make sure that this hook yields the correct objects.
+    """
+    objs = list(plugin.conda_pre_commands())
+
+    assert objs[0].action is plugin.prefetch_credentials
+    assert objs[0].run_for == set(PREFETCH_COMMANDS)
+
+
+def test_prefetch_credentials_is_opt_in(mocker):
+    prefetch_secrets = mocker.patch("conda_auth.handlers.prefetch.prefetch_secrets")
+    get_plugin_setting = mocker.patch("conda_auth.settings.get_plugin_setting", return_value=False)
+
+    plugin.prefetch_credentials("install")
+    prefetch_secrets.assert_not_called()
+
+    get_plugin_setting.return_value = True
+    plugin.prefetch_credentials("install")
+    prefetch_secrets.assert_called_once()
@@ -0,0 +1,24 @@
+from conda_auth.settings import get_plugin_setting
+
+
+class FakePlugins:
+    configured = 30
+    unset = None
+
+
+def test_get_plugin_setting_returns_configured_value(context_factory):
+    context = context_factory()
+    context.plugins = FakePlugins()
+
+    assert get_plugin_setting("configured", 0, context) == 30
+
+
+def test_get_plugin_setting_falls_back_to_default(context_factory):
+    context = context_factory()
+
+    assert get_plugin_setting("configured", 0, context) == 0
+
+    context.plugins = FakePlugins()
+
+    assert get_plugin_setting("unset", 0, context) == 0
+    assert get_plugin_setting("unknown", 0, context) == 0
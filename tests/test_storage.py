@@ -1,26 +1,86 @@
+import json
 import os
 import subprocess
 import sys
+import threading
+from dataclasses import dataclass
 
 import pytest
 from keyring.errors import NoKeyringError, PasswordDeleteError
 
+from conda_auth import storage as storage_module
+from conda_auth.constants import (
+    CREDENTIAL_ENV_PREFIX_SETTING,
+    CREDENTIAL_FILE_SETTING,
+    CREDENTIAL_KEYRING_COMPACT_SETTING,
+    CREDENTIAL_MISS_TTL_SETTING,
+    CREDENTIAL_SECRETS_DIR_SETTING,
+    CREDENTIAL_STORAGE_FILE,
+    CREDENTIAL_STORAGE_KEYRING,
+    CREDENTIAL_STORAGE_SETTING,
+)
 from conda_auth.credentials import CredentialRecord
 from conda_auth.exceptions import CondaAuthError
-from conda_auth.storage import get_storage_backend
+from conda_auth.storage import (
+    EnvironmentStorage,
+    FileStorage,
+    LazyStorage,
+    MissCacheStorage,
+    get_credential_storage,
+    get_storage_backend,
+)
+from conda_auth.storage.credential_file import CREDENTIAL_FILE_NAME
+from conda_auth.storage.encoding import encode_record
 from conda_auth.storage.keyring import (
     KEYRING_CREDENTIAL_SERVICE_PREFIX,
     KEYRING_CREDENTIAL_USERNAME,
+    KEYRING_MAX_PARALLEL_LOOKUPS,
     KeyringStorage,
 )
+from conda_auth.storage.state import (
+    get_backend_stamp,
+    get_backend_state_path,
+    read_backend_state,
+)
+
+
+@dataclass
+class OtherKeyring:
+    priority = 1
+    side_effect: BaseException | None = None
+    get_password_calls: int = 0
+
+    def get_password(self, service, username):
+        self.get_password_calls += 1
+        if self.side_effect is not None:
+            raise self.side_effect
+        return None
+
+
+@pytest.fixture
+def storage_setting(mocker):
+    """
+    Sets the ``auth_credential_storage`` plugin setting.
+    """
+
+    def _storage_setting(value):
+        mocker.patch(
+            "conda_auth.storage.get_plugin_setting",
+            side_effect=lambda name, default: (
+                value if name == CREDENTIAL_STORAGE_SETTING else default
+            ),
+        )
 
+    return _storage_setting
 
-def test_no_available_storage_backend(keyring):
+
+def test_no_available_storage_backend(keyring, storage_setting):
     """
     Test to make sure we've covered the lines where an exception is raise
     if no storage backend can be found.
     """
     _, get_keyring_mock = keyring(None)
+    storage_setting(CREDENTIAL_STORAGE_KEYRING)
 
     get_keyring_mock.side_effect = NoKeyringError()
 
@@ -28,6 +88,193 @@ def test_no_available_storage_backend(keyring):
         get_storage_backend()
 
 
+def test_no_available_keyring_falls_back_to_credential_file(keyring, data_dir):
+    _, get_keyring_mock = keyring(None)
+    get_keyring_mock.side_effect = NoKeyringError()
+
+    backend = get_storage_backend()
+
+    assert isinstance(backend, FileStorage)
+    assert backend.path == data_dir / CREDENTIAL_FILE_NAME
+
+
+def test_credential_file_fallback_warns_once(monkeypatch, keyring, data_dir, caplog):
+    _, get_keyring_mock = keyring(None)
+    get_keyring_mock.side_effect = NoKeyringError()
+    monkeypatch.setattr(storage_module, "plaintext_fallback_warnings", set())
+
+    get_storage_backend()
+    get_storage_backend()
+
+    warnings = [record for record in caplog.records if record.levelname == "WARNING"]
+    assert len(warnings) == 1
+    assert f"credentials are stored unencrypted in {data_dir / CREDENTIAL_FILE_NAME}" in (
+        warnings[0].getMessage()
+    )
+
+
+def test_file_storage_setting_skips_keyring(keyring, storage_setting, data_dir):
+    _, get_keyring_mock = keyring(None)
+    storage_setting(CREDENTIAL_STORAGE_FILE)
+
+    backend = get_storage_backend()
+
+    assert isinstance(backend, FileStorage)
+    assert backend.path == data_dir / CREDENTIAL_FILE_NAME
+    get_keyring_mock.assert_not_called()
+
+
+def test_credential_file_setting(mocker, tmp_path):
+    mocker.patch(
+        "conda_auth.storage.get_plugin_setting",
+        side_effect=lambda name, default: {
+            CREDENTIAL_STORAGE_SETTING: CREDENTIAL_STORAGE_FILE,
+            CREDENTIAL_FILE_SETTING: str(tmp_path / "secrets.json"),
+        }.get(name, default),
+    )
+
+    backend = get_storage_backend()
+
+    assert isinstance(backend, FileStorage)
+    assert backend.path == tmp_path / "secrets.json"
+
+
+def test_credential_storage_without_environment_settings(keyring):
+    keyring(None)
+
+    assert isinstance(get_credential_storage(), MissCacheStorage)
+
+
+def test_credential_storage_reads_environment_first(mocker, monkeypatch, tmp_path):
+    mocker.patch(
+        "conda_auth.storage.get_plugin_setting",
+        side_effect=lambda name, default: {
+            CREDENTIAL_ENV_PREFIX_SETTING: "CI_",
+            CREDENTIAL_SECRETS_DIR_SETTING: str(tmp_path),
+        }.get(name, default),
+    )
+    get_storage_backend = mocker.patch("conda_auth.storage.get_storage_backend")
+    monkeypatch.setenv("CI_TESTER", "secret")
+
+    storage = get_credential_storage()
+
+    assert isinstance(storage, EnvironmentStorage)
+    assert (storage.prefix, storage.directory) == ("CI_", tmp_path)
+    record = storage.get_credential("tester")
+    assert record is not None
+    assert record.token == "secret"
+    get_storage_backend.assert_not_called()
+
+    storage.get_credential("other")
+
+    get_storage_backend.return_value.get_credential.assert_called_once_with("other")
+
+
+def test_environment_credentials_do_not_import_keyring():
+    code = """
+import sys
+
+import conda_auth.handlers.basic_auth
+import conda_auth.handlers.token
+from conda_auth.storage import EnvironmentStorage, LazyStorage
+
+storage = EnvironmentStorage(LazyStorage(), prefix="CI_", environ={"CI_TESTER": "secret"})
+assert storage.get_credential("tester").token == "secret"
+
+if "keyring" in sys.modules:
+    raise SystemExit("keyring was imported")
+"""
+
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    assert result.returncode == 0, result.stderr or result.stdout
+
+
+def test_unknown_storage_setting(keyring, storage_setting):
+    keyring(None)
+    storage_setting("vault")
+
+    with pytest.raises(CondaAuthError, match="Unknown credential storage 'vault'"):
+        get_storage_backend()
+
+
+def test_storage_backend_probe_is_recorded(keyring):
+    """
+    The keyring probe only runs while no matching backend has been recorded.
+    """
+    _, get_keyring_mock = keyring(None)
+    keyring_tester = get_keyring_mock.return_value
+
+    get_storage_backend()
+    get_storage_backend()
+
+    assert keyring_tester.get_password.call_count == 1
+    assert read_backend_state(get_backend_state_path()) == get_backend_stamp(keyring_tester)
+
+
+def test_storage_backend_probes_again_when_backend_changes(keyring):
+    _, get_keyring_mock = keyring(None)
+    get_storage_backend()
+    other_keyring = OtherKeyring()
+    get_keyring_mock.return_value = other_keyring
+
+    get_storage_backend()
+
+    assert other_keyring.get_password_calls == 1
+    assert read_backend_state(get_backend_state_path()) == {
+        "backend": f"{OtherKeyring.__module__}.OtherKeyring",
+        "priority": 1,
+    }
+
+
+def test_no_available_storage_backend_clears_recorded_state(keyring):
+    _, get_keyring_mock = keyring(None)
+    get_storage_backend()
+    get_keyring_mock.return_value = OtherKeyring(side_effect=NoKeyringError())
+
+    assert isinstance(get_storage_backend(), FileStorage)
+    assert read_backend_state(get_backend_state_path()) is None
+
+
+def test_lazy_storage_probes_again_when_keyring_goes_away(keyring):
+    """
+    A stale recorded backend is detected by the real keyring call and probed again.
+    """
+    keyring_mock, get_keyring_mock = keyring(None)
+    lazy_storage = LazyStorage()
+    lazy_storage.get_credential("tester")
+    keyring_mock.get_password_side_effect = NoKeyringError()
+    get_keyring_mock.return_value.get_password.side_effect = NoKeyringError()
+
+    assert lazy_storage.get_credential("other") is None
+    assert isinstance(lazy_storage.backend, FileStorage)
+    assert read_backend_state(get_backend_state_path()) is None
+
+
+def test_lazy_storage_retries_once_after_probing_again(keyring):
+    keyring_mock, get_keyring_mock = keyring(None)
+    lazy_storage = LazyStorage()
+    lazy_storage.get_credential("tester")
+    calls = []
+
+    def get_password(key_id, username):
+        calls.append(key_id)
+        if len(calls) == 1:
+            raise NoKeyringError()
+        return None
+
+    keyring_mock.get_password.side_effect = get_password
+
+    assert lazy_storage.get_credential("other") is None
+    assert len(calls) == 2
+    assert get_keyring_mock.return_value.get_password.call_count == 2
+
+
 def test_plugin_import_does_not_require_storage_backend():
     """
     Importing the conda plugin must not fail when credentials are not needed.
@@ -62,12 +309,69 @@ def test_keyring_storage_stores_structured_record(keyring):
     backend.set_credential(record)
 
     assert backend.get_credential("tester") == record
+    assert (
+        json.loads(
+            keyring_mock.secrets[
+                (
+                    f"{KEYRING_CREDENTIAL_SERVICE_PREFIX}::tester",
+                    KEYRING_CREDENTIAL_USERNAME,
+                )
+            ]
+        )
+        == record.to_dict()
+    )
+
+
+def test_keyring_storage_stores_compact_record(keyring):
+    """
+    Compact records are only written when enabled, but are always read.
+    """
+    keyring_mock, _ = keyring(None)
+    record = CredentialRecord(target="tester", auth_type="token", token="secret-token")
+
+    KeyringStorage(compact=True).set_credential(record)
+
     assert keyring_mock.secrets[
         (
             f"{KEYRING_CREDENTIAL_SERVICE_PREFIX}::tester",
             KEYRING_CREDENTIAL_USERNAME,
         )
-    ]
+    ] == encode_record(record, include_target=False)
+    assert KeyringStorage().get_credential("tester") == record
+
+
+@pytest.mark.parametrize("compact", (False, True))
+def test_keyring_compact_setting(mocker, keyring, compact):
+    keyring(None)
+    mocker.patch(
+        "conda_auth.storage.get_plugin_setting",
+        side_effect=lambda name, default: {
+            CREDENTIAL_KEYRING_COMPACT_SETTING: compact,
+            CREDENTIAL_MISS_TTL_SETTING: 0,
+        }.get(name, default),
+    )
+
+    backend = get_storage_backend()
+
+    assert isinstance(backend, KeyringStorage)
+    assert backend.compact is compact
+
+
+def test_keyring_storage_reads_json_record(keyring):
+    """
+    Records stored as JSON by earlier versions are still read.
+    """
+    keyring_mock, _ = keyring(None)
+    keyring_mock.secrets[
+        (
+            f"{KEYRING_CREDENTIAL_SERVICE_PREFIX}::tester",
+            KEYRING_CREDENTIAL_USERNAME,
+        )
+    ] = json.dumps({"target": "tester", "auth_type": "token", "token": "secret"})
+
+    assert KeyringStorage().get_credential("tester") == CredentialRecord(
+        target="tester", auth_type="token", token="secret"
+    )
 
 
 @pytest.mark.parametrize(
@@ -75,8 +379,10 @@ def test_keyring_storage_stores_structured_record(keyring):
     (
         ("{", "Unable to read stored credential"),
         ("[]", "Stored credential for 'tester' is invalid"),
+        ("~1u4:user", "Unable to read stored credential for 'tester': compact record has no auth"),
+        ("~1k9:secret", "Unable to read stored credential for 'tester': truncated"),
     ),
-    ids=("malformed-json", "non-object-json"),
+    ids=("malformed-json", "non-object-json", "incomplete-compact", "malformed-compact"),
 )
 def test_keyring_storage_rejects_invalid_records(keyring, payload, message):
     keyring_mock, _ = keyring(None)
@@ -165,3 +471,50 @@ def test_keyring_storage_delete_preserves_other_records(keyring):
         auth_type="token",
         token="two",
     )
+
+
+def test_keyring_storage_reads_several_records_in_parallel(keyring):
+    """
+    Batch reads look up each target on its own worker and keep the requested order.
+    """
+    keyring_mock, _ = keyring(None)
+    backend = KeyringStorage()
+    records = [
+        CredentialRecord(target=f"target-{index}", auth_type="token", token=f"secret-{index}")
+        for index in range(20)
+    ]
+    for record in records:
+        backend.set_credential(record)
+
+    lookup_threads = set()
+    get_password = keyring_mock.get_password.side_effect
+
+    def record_thread(key_id, username):
+        lookup_threads.add(threading.current_thread().name)
+        return get_password(key_id, username)
+
+    keyring_mock.get_password.side_effect = record_thread
+
+    result = backend.get_credentials([*(record.target for record in records), "missing"])
+
+    assert list(result) == [*(record.target for record in records), "missing"]
+    assert list(result.values()) == [*records, None]
+    assert lookup_threads
+    assert threading.current_thread().name not in lookup_threads
+    assert len(lookup_threads) <= KEYRING_MAX_PARALLEL_LOOKUPS
+
+
+def test_keyring_storage_cannot_list_records(keyring):
+    keyring(None)
+
+    with pytest.raises(NotImplementedError):
+        list(KeyringStorage().iter_credentials())
+
+
+def test_lazy_storage_reads_several_records(keyring):
+    keyring(None)
+    storage = LazyStorage()
+    record = CredentialRecord(target="one", auth_type="token", token="one")
+    storage.set_credential(record)
+
+    assert storage.get_credentials(["one", "two"]) == {"one": record, "two": None}